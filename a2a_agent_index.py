@@ -0,0 +1,196 @@
+"""Agent search index - Incremental inverted index over agent cards with BM25 ranking."""
+
+import heapq
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from a2a.server.agent_execution import AgentExecutor, RequestContext
+from a2a.server.events import EventQueue
+from a2a.types import AgentCard
+from a2a.utils import new_agent_text_message
+
+
+# Where a term appears on the card decides how much one occurrence counts.
+FIELD_WEIGHTS = {
+    'name': 3.0,
+    'skill_name': 2.0,
+    'tags': 2.0,
+    'description': 1.0,
+    'examples': 0.5,
+}
+BM25_K1 = 1.2
+BM25_B = 0.75
+DEFAULT_LIMIT = 10
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset({
+    'a', 'an', 'and', 'are', 'can', 'do', 'for', 'help', 'i', 'in', 'is', 'me', 'of', 'on', 'or',
+    'that', 'the', 'to', 'with', 'which', 'who', 'what', 'agent', 'agents', 'a2a',
+})
+_SEARCH = re.compile(
+    r"^\s*(?:please\s+)?(?:search|find|look\s*up|discover|which)\b(?:\s+(?:for|me))?\s*", re.IGNORECASE
+)
+_LIST = re.compile(r"^\s*(?:list|show)(?:\s+me)?(?:\s+all)?(?:\s+the)?(?:\s+available)?\s+agents\s*$", re.IGNORECASE)
+
+
+def _stem(token: str) -> str:
+    # Plural folding is enough for agent vocabulary: agents/agent, calculations/calculation
+    if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    return [_stem(token) for token in _TOKEN.findall(text.lower()) if token not in _STOPWORDS]
+
+
+def card_terms(card: AgentCard) -> Counter:
+    """Field-weighted term frequencies of an agent card."""
+    fields = [('name', card.name), ('description', card.description or '')]
+    for skill in card.skills or []:
+        fields.append(('skill_name', skill.name))
+        fields.append(('description', skill.description or ''))
+        fields.extend(('tags', tag) for tag in skill.tags or [])
+        fields.extend(('examples', example) for example in skill.examples or [])
+    terms = Counter()
+    for field, text in fields:
+        for term in tokenize(text):
+            terms[term] += FIELD_WEIGHTS[field]
+    return terms
+
+
+class AgentSearchIndex:
+    """Inverted index from terms to agents, ranked with BM25.
+
+    Agents are keyed by the URL on their card. ``add`` and ``remove``
+    update the postings of that one agent only, and a search touches only
+    the postings of the query's terms, so lookups stay fast however many
+    agents are registered.
+    """
+
+    def __init__(self, k1: float = BM25_K1, b: float = BM25_B):
+        self.k1 = k1
+        self.b = b
+        self.cards: Dict[str, AgentCard] = {}
+        self._postings: Dict[str, Dict[str, float]] = {}
+        self._doc_terms: Dict[str, Counter] = {}
+        self._doc_length: Dict[str, float] = {}
+        self._total_length = 0.0
+
+    def __len__(self) -> int:
+        return len(self.cards)
+
+    def __contains__(self, agent_id: str) -> bool:
+        return agent_id in self.cards
+
+    @staticmethod
+    def agent_id(card: AgentCard) -> str:
+        return card.url.rstrip('/')
+
+    def add(self, card: AgentCard) -> str:
+        """Index ``card``, replacing any previous card with the same URL."""
+        agent_id = self.agent_id(card)
+        self.remove(agent_id)
+        terms = card_terms(card)
+        for term, weight in terms.items():
+            self._postings.setdefault(term, {})[agent_id] = weight
+        self.cards[agent_id] = card
+        self._doc_terms[agent_id] = terms
+        length = sum(terms.values())
+        self._doc_length[agent_id] = length
+        self._total_length += length
+        return agent_id
+
+    def remove(self, agent_id: str) -> Optional[AgentCard]:
+        card = self.cards.pop(agent_id, None)
+        if card is None:
+            return None
+        for term in self._doc_terms.pop(agent_id):
+            postings = self._postings[term]
+            del postings[agent_id]
+            if not postings:
+                del self._postings[term]
+        self._total_length -= self._doc_length.pop(agent_id)
+        return card
+
+    def search(self, query: str, limit: int = DEFAULT_LIMIT) -> List[Tuple[AgentCard, float]]:
+        """The ``limit`` best-matching agents for ``query`` with their BM25 scores."""
+        count = len(self.cards)
+        if not count:
+            return []
+        k1, doc_length = self.k1, self._doc_length
+        # norm(doc) = base + per_length * length(doc)
+        base = k1 * (1 - self.b)
+        per_length = k1 * self.b * count / self._total_length if self._total_length else 0.0
+        scores: Dict[str, float] = {}
+        get = scores.get
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            boost = idf * (k1 + 1)
+            for agent_id, tf in postings.items():
+                scores[agent_id] = get(agent_id, 0.0) + boost * tf / (tf + base + per_length * doc_length[agent_id])
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        return [(self.cards[agent_id], score) for agent_id, score in best]
+
+
+def format_results(query: str, results: List[Tuple[AgentCard, float]]) -> str:
+    if not results:
+        return f"🔍 No agents match '{query}'."
+    lines = [f"🔍 Found {len(results)} agent(s) for '{query}':"]
+    for rank, (card, score) in enumerate(results, 1):
+        lines.append(f"{rank}. **{card.name}** (score {score:.2f}) - {card.description}")
+        lines.append(f"   URL: {card.url}")
+        skills = ', '.join(skill.name for skill in card.skills or [])
+        if skills:
+            lines.append(f"   Skills: {skills}")
+    return "\n".join(lines)
+
+
+def format_listing(cards: List[AgentCard]) -> str:
+    if not cards:
+        return "📋 No agents are registered."
+    lines = [f"📋 {len(cards)} registered agent(s):"]
+    for card in sorted(cards, key=lambda c: c.name.lower()):
+        lines.append(f"• **{card.name}** - {card.url}")
+    return "\n".join(lines)
+
+
+class IndexedRegistryExecutor(AgentExecutor):
+    """Registry executor answering agent searches and listings from an AgentSearchIndex.
+
+    "search for calculator agents", "find agents that can do web search"
+    and "list all agents" are answered from the index; everything else
+    (details, help, ...) goes to the wrapped executor. Agents get into
+    the index by registering with the registry (see a2a_membership).
+    """
+
+    def __init__(self, executor: AgentExecutor, index: AgentSearchIndex):
+        self.executor = executor
+        self.index = index
+
+    def answer(self, query: str) -> Optional[str]:
+        """The index's answer to ``query``, or None when it is not a search or listing."""
+        if _LIST.match(query):
+            return format_listing(list(self.index.cards.values()))
+        match = _SEARCH.match(query)
+        if not match:
+            return None
+        terms = query[match.end():].strip(' ?.!')
+        if not tokenize(terms):
+            return format_listing(list(self.index.cards.values()))
+        return format_results(terms, self.index.search(terms))
+
+    async def execute(self, context: RequestContext, event_queue: EventQueue) -> None:
+        text = self.answer(context.get_user_input())
+        if text is None:
+            await self.executor.execute(context, event_queue)
+            return
+        await event_queue.enqueue_event(new_agent_text_message(text, context.context_id, context.task_id))
+
+    async def cancel(self, context: RequestContext, event_queue: EventQueue) -> None:
+        await self.executor.cancel(context, event_queue)
@@ -0,0 +1,231 @@
+"""Downstream agent pool - Long-lived clients for the agents a coordinator calls."""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import httpx
+
+from a2a.client import Client, ClientConfig, ClientFactory
+from a2a.client.helpers import create_text_message_object
+from a2a.types import AgentCard, Message, Role
+from a2a.utils.constants import AGENT_CARD_WELL_KNOWN_PATH
+from a2a.utils.message import get_message_text
+
+from a2a_balancer import BalancedClient
+from a2a_card_cache import AgentCardCache, default_card_cache
+from a2a_membership import LEAVE, RegistryChange, RegistryFeed
+from a2a_streaming import task_text
+from a2a_tracing import TracedClient
+from a2a_transport import prewarm
+
+
+# The agents the coordinator talks to.
+DOWNSTREAM_AGENTS = {
+    'echo': 'http://localhost:9999',
+    'calculator': 'http://localhost:8002',
+    'websearch': 'http://localhost:8001',
+    'registry': 'http://localhost:8000',
+}
+# Every agent of the local ecosystem, for clients that address agents by name.
+ECOSYSTEM_AGENTS = {**DOWNSTREAM_AGENTS, 'coordinator': 'http://localhost:8003'}
+DEFAULT_REFRESH_INTERVAL = 30.0
+DEFAULT_EVICT_AFTER = 3
+CARD_TIMEOUT = 2.0
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PooledAgent:
+    """A resolved downstream agent and the client kept for it."""
+
+    name: str
+    url: str
+    card: AgentCard
+    client: Client
+    etag: Optional[str] = None
+    resolved_at: float = 0.0
+    card_updates: int = 0
+    failures: int = 0
+
+
+class AgentClientPool:
+    """Resolves each downstream agent's card once and keeps one client per agent.
+
+    Clients share ``httpx_client``'s keep-alive pool and balance over an
+    agent's replicas. A background task revalidates every card each
+    ``refresh_interval`` seconds with a conditional GET, rebuilds the
+    client when a card changed, resolves agents that were not up yet and
+    evicts agents whose card could not be fetched ``evict_after`` times
+    in a row. ``get`` only touches the network for an agent that is not
+    in the pool yet. A pool that ``follow``s the registry's change feed
+    also drops agents as soon as they leave and picks up card updates
+    without waiting for the next refresh.
+    """
+
+    def __init__(
+        self,
+        httpx_client: httpx.AsyncClient,
+        agents: Optional[Dict[str, str]] = None,
+        refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+        evict_after: int = DEFAULT_EVICT_AFTER,
+        card_cache: Optional[AgentCardCache] = None,
+    ):
+        self.httpx_client = httpx_client
+        self.agents = dict(agents or DOWNSTREAM_AGENTS)
+        self.refresh_interval = refresh_interval
+        self.evict_after = evict_after
+        self.card_cache = card_cache or default_card_cache()
+        self.client_factory = ClientFactory(ClientConfig(httpx_client=httpx_client, streaming=False))
+        self._entries: Dict[str, PooledAgent] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._refresher: Optional[asyncio.Task] = None
+        self._closing = set()
+        self.resolutions = 0
+        self.evictions = 0
+
+    def _pooled(self, name: str, card: AgentCard, etag: Optional[str] = None) -> PooledAgent:
+        client = TracedClient(BalancedClient(self.client_factory, card, self.httpx_client), name)
+        return PooledAgent(name, self.agents[name], card, client, etag, time.time())
+
+    async def get(self, name: str) -> Client:
+        """The pooled client for agent ``name``, resolving its card on first use."""
+        entry = self._entries.get(name)
+        if entry is None:
+            entry = await self._resolve(name)
+        return entry.client
+
+    async def ask(self, name: str, query: str) -> str:
+        """Send ``query`` to agent ``name`` and return the text of its final answer."""
+        client = await self.get(name)
+        message = create_text_message_object(role=Role.user, content=query)
+        answer = ''
+        async for event in client.send_message(message):
+            if isinstance(event, Message):
+                answer = get_message_text(event)
+            else:
+                answer = task_text(event[0]) or answer
+        return answer
+
+    async def _resolve(self, name: str) -> PooledAgent:
+        if name not in self.agents:
+            raise KeyError(f"Unknown downstream agent '{name}'")
+        # Concurrent first calls for the same agent resolve its card once
+        async with self._locks.setdefault(name, asyncio.Lock()):
+            entry = self._entries.get(name)
+            if entry is None:
+                card = await self.card_cache.get_agent_card(self.httpx_client, self.agents[name], CARD_TIMEOUT)
+                entry = self._entries[name] = self._pooled(name, card)
+                self.resolutions += 1
+                logger.info(f"Pooled client for {name} ({card.name}) at {card.url}")
+        return entry
+
+    async def start(self) -> None:
+        """Start resolving and refreshing in the background; startup does not wait for the agents."""
+        if self._refresher is None or self._refresher.done():
+            self._refresher = asyncio.create_task(self._refresh_loop())
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("Refreshing downstream agents failed")
+            await asyncio.sleep(self.refresh_interval)
+
+    async def refresh(self) -> None:
+        """Revalidate every pooled card, resolve missing agents and open their connections."""
+        await asyncio.gather(*(self._refresh_agent(name) for name in self.agents))
+        endpoints = [endpoint.url for entry in self._entries.values() for endpoint in entry.client.endpoints]
+        await prewarm(self.httpx_client, endpoints)
+
+    async def _refresh_agent(self, name: str) -> None:
+        entry = self._entries.get(name)
+        if entry is None:
+            try:
+                await self._resolve(name)
+            except Exception as e:
+                logger.debug(f"Downstream agent {name} is not available yet: {e}")
+            return
+
+        headers = {'If-None-Match': entry.etag} if entry.etag else {}
+        try:
+            response = await self.httpx_client.get(
+                f"{entry.url.rstrip('/')}{AGENT_CARD_WELL_KNOWN_PATH}", headers=headers, timeout=CARD_TIMEOUT
+            )
+            if response.status_code != 304:
+                response.raise_for_status()
+                card = AgentCard.model_validate(response.json())
+        except (httpx.HTTPError, ValueError) as e:
+            entry.failures += 1
+            if entry.failures >= self.evict_after:
+                self._evict(name, f"{self.evict_after} failed refreshes ({e})")
+            return
+
+        entry.failures = 0
+        if response.status_code == 304:
+            return
+        etag = response.headers.get('etag')
+        if card == entry.card:
+            entry.etag = etag
+            return
+        self._replace(entry, card, etag)
+
+    def _replace(self, entry: PooledAgent, card: AgentCard, etag: Optional[str] = None) -> None:
+        updated = self._pooled(entry.name, card, etag)
+        updated.card_updates = entry.card_updates + 1
+        self._entries[entry.name] = updated
+        self._retire(entry.client)
+        self.card_cache.invalidate(entry.url)
+        logger.info(f"Agent card of {entry.name} changed; rebuilt its client")
+
+    def _retire(self, client: Client) -> None:
+        """Close a client that left the pool; calls already using it still finish."""
+        closing = asyncio.create_task(client.close())
+        self._closing.add(closing)
+        closing.add_done_callback(self._closing.discard)
+
+    def _evict(self, name: str, reason: str) -> None:
+        entry = self._entries.pop(name, None)
+        if entry is not None:
+            self._retire(entry.client)
+            self.evictions += 1
+            self.card_cache.invalidate(self.agents[name])
+            logger.warning(f"Evicting downstream agent {name}: {reason}")
+
+    def follow(self, feed: RegistryFeed) -> None:
+        """Apply the registry's leaves and card updates to the pool as they are published."""
+        feed.add_listener(self.on_registry_change)
+
+    def on_registry_change(self, change: RegistryChange) -> None:
+        names = [name for name, url in self.agents.items() if url.rstrip('/') == change.agent_id]
+        for name in names:
+            entry = self._entries.get(name)
+            if change.kind == LEAVE:
+                self._evict(name, f"it left the registry ({change.reason})")
+            elif entry is not None and change.card != entry.card:
+                self._replace(entry, change.card)
+
+    async def close(self) -> None:
+        if self._refresher is not None:
+            self._refresher.cancel()
+        for entry in self._entries.values():
+            self._retire(entry.client)
+        self._entries.clear()
+        await asyncio.gather(*self._closing, return_exceptions=True)
+
+    def stats(self) -> List[dict]:
+        now = time.time()
+        return [
+            {
+                'agent': entry.name,
+                'url': entry.card.url,
+                'age_s': round(now - entry.resolved_at, 1),
+                'card_updates': entry.card_updates,
+                'failures': entry.failures,
+            }
+            for entry in self._entries.values()
+        ]
@@ -3,6 +3,7 @@
 import asyncio
 import logging
 
+from a2a_batch import iter_batch_process
 from app.intelligent_router import IntelligentA2ARouter
 
 
@@ -44,7 +45,12 @@ async def demonstrate_automatic_usage():
         
         print("🎯 **Automatic routing and execution of diverse queries:**\n")
         
-        results = await router.batch_auto_process(test_queries)
+        # Queries run concurrently; each result is shown as soon as it arrives
+        results = [None] * len(test_queries)
+        async for result in iter_batch_process(router, test_queries):
+            results[result['index']] = result
+            print(f"✅ Completed in {result['elapsed']:.2f}s via {result['agent']}: {result['query']}")
+        print()
         
         # Step 4: Show results summary
         print("=" * 60)
@@ -3,6 +3,7 @@
 import asyncio
 import logging
 
+from a2a_workflow_dag import DAGWorkflowManager
 from app.auto_workflow_manager import AutoWorkflowManager
 from app.intelligent_router import IntelligentA2ARouter
 
@@ -20,22 +21,23 @@ async def demonstrate_automatic_workflows():
     print("=" * 60)
     
     workflow_manager = AutoWorkflowManager()
+    dag_manager = DAGWorkflowManager()
     
     try:
         # Initialize automatic system
         print("\n🔄 **Initializing Automatic A2A System...**")
-        await workflow_manager.initialize()
+        await asyncio.gather(workflow_manager.initialize(), dag_manager.initialize())
         
         # Show available workflows
-        print("\n" + workflow_manager.list_workflows())
+        print("\n" + dag_manager.list_workflows())
         
-        # Demo 1: Single automatic workflow
+        # Demo 1: Single automatic workflow (independent steps run concurrently)
         print("🎯 **Demo 1: Automatic Research & Calculate Workflow**")
-        results = await workflow_manager.execute_workflow('research_calculate')
+        results = await dag_manager.execute_workflow('research_calculate')
         
         # Demo 2: Complex problem solving workflow
         print("\n🎯 **Demo 2: Automatic Problem Solving Workflow**")
-        results = await workflow_manager.execute_workflow('problem_solving')
+        results = await dag_manager.execute_workflow('problem_solving')
         
         # Demo 3: Dynamic workflow creation
         print("\n🎯 **Demo 3: Dynamic Workflow Creation**")
@@ -43,15 +45,18 @@ async def demonstrate_automatic_workflows():
         await workflow_manager.create_dynamic_workflow(dynamic_description)
         
         # Demo 4: Interactive automatic mode
-        await interactive_automatic_workflows(workflow_manager)
+        await interactive_automatic_workflows(workflow_manager, dag_manager)
         
     except Exception as e:
         print(f"❌ Error in workflow demonstration: {e}")
     finally:
-        await workflow_manager.cleanup()
+        await asyncio.gather(workflow_manager.cleanup(), dag_manager.cleanup())
 
 
-async def interactive_automatic_workflows(workflow_manager: AutoWorkflowManager):
+async def interactive_automatic_workflows(
+    workflow_manager: AutoWorkflowManager,
+    dag_manager: DAGWorkflowManager,
+):
     """Interactive mode for automatic workflows."""
     
     print("\n🎮 **Interactive Automatic Workflows**")
@@ -72,21 +77,24 @@ async def interactive_automatic_workflows(workflow_manager: AutoWorkflowManager)
                 break
             
             if command.lower() == 'list':
-                print(workflow_manager.list_workflows())
+                print(dag_manager.list_workflows())
                 continue
             
             if command.lower() == 'all':
-                print("🚀 **Running All Automatic Workflows...**")
-                await workflow_manager.run_all_workflows()
+                print("🚀 **Running All Automatic Workflows in Parallel...**")
+                await dag_manager.run_all_workflows()
                 continue
             
             if command.lower().startswith('run '):
                 workflow_name = command[4:].strip()
                 try:
-                    await workflow_manager.execute_workflow(workflow_name)
+                    if workflow_name in dag_manager.workflows:
+                        await dag_manager.execute_workflow(workflow_name)
+                    else:
+                        await workflow_manager.execute_workflow(workflow_name)
                 except ValueError as e:
                     print(f"❌ {e}")
-                    print("Available workflows:", list(workflow_manager.workflows.keys()))
+                    print("Available workflows:", list(dag_manager.workflows.keys()))
                 continue
             
             if command.lower().startswith('create '):
@@ -197,11 +205,12 @@ async def main():
             await showcase_automatic_intelligence()
         elif choice == "3":
             workflow_manager = AutoWorkflowManager()
+            dag_manager = DAGWorkflowManager()
             try:
-                await workflow_manager.initialize()
-                await interactive_automatic_workflows(workflow_manager)
+                await asyncio.gather(workflow_manager.initialize(), dag_manager.initialize())
+                await interactive_automatic_workflows(workflow_manager, dag_manager)
             finally:
-                await workflow_manager.cleanup()
+                await asyncio.gather(workflow_manager.cleanup(), dag_manager.cleanup())
         elif choice == "4":
             await showcase_automatic_intelligence()
             await demonstrate_automatic_workflows()
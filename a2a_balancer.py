@@ -0,0 +1,356 @@
+"""Replica-aware A2A client - Balances one logical agent over its replica endpoints."""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from a2a.client import Client, ClientFactory
+from a2a.client.errors import A2AClientError, A2AClientHTTPError, A2AClientTimeoutError
+from a2a.types import AgentCard, Message, Task
+from a2a.utils.constants import AGENT_CARD_WELL_KNOWN_PATH
+
+
+REPLICAS_FILE_ENV = 'A2A_REPLICAS_FILE'
+DEFAULT_REPLICAS_FILE = os.path.join('.a2a', 'replicas.json')
+STRATEGIES = ('least_outstanding', 'ewma')
+
+EWMA_ALPHA = 0.3
+EJECT_BACKOFF_INITIAL = 1.0
+EJECT_BACKOFF_MAX = 30.0
+PROBE_TIMEOUT = 1.0
+TASK_AFFINITY_SIZE = 4096
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize_url(url: str) -> str:
+    return url.rstrip('/')
+
+
+def write_replicas_file(path: str, replicas: Dict[str, List[str]]) -> None:
+    """Atomically publish ``{agent url: [replica urls]}`` for ReplicaDirectory readers."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(replicas, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+class ReplicaDirectory:
+    """Replica endpoints of each logical agent, keyed by the URL in its agent card.
+
+    Reads the JSON file published by ``run_all_agents.py --supervise`` and
+    reloads it when it changes, checking at most every ``check_interval``
+    seconds. Agents missing from the file have no replicas.
+    """
+
+    def __init__(self, path: Optional[str] = None, check_interval: float = 1.0):
+        self.path = path or os.environ.get(REPLICAS_FILE_ENV, DEFAULT_REPLICAS_FILE)
+        self.check_interval = check_interval
+        self._replicas: Dict[str, List[str]] = {}
+        self._mtime: Optional[int] = None
+        self._checked = float('-inf')
+
+    def endpoints(self, agent_url: str) -> List[str]:
+        now = time.monotonic()
+        if now - self._checked >= self.check_interval:
+            self._checked = now
+            self._reload()
+        return self._replicas.get(_normalize_url(agent_url), [])
+
+    def _reload(self) -> None:
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            self._replicas, self._mtime = {}, None
+            return
+        if mtime == self._mtime:
+            return
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        self._mtime = mtime
+        self._replicas = {_normalize_url(url): list(replicas) for url, replicas in data.items()}
+
+
+class Endpoint:
+    """One replica of an agent with its client and health bookkeeping."""
+
+    def __init__(self, url: str, client: Client):
+        self.url = url
+        self.client = client
+        self.outstanding = 0
+        self.ewma: Optional[float] = None
+        self.requests = 0
+        self.failures = 0
+        self.ejected_until = 0.0
+        self.eject_backoff = EJECT_BACKOFF_INITIAL
+        self.probing = False
+
+    @property
+    def healthy(self) -> bool:
+        return not self.ejected_until
+
+    def stats(self) -> dict:
+        return {
+            'url': self.url,
+            'healthy': self.healthy,
+            'outstanding': self.outstanding,
+            'ewma_ms': self.ewma * 1000 if self.ewma is not None else None,
+            'requests': self.requests,
+            'failures': self.failures,
+        }
+
+
+class NoHealthyEndpointError(A2AClientError):
+    """Raised when none of an agent's endpoints can take a request."""
+
+
+def _not_sent(error: Exception) -> bool:
+    """Whether the request failed before reaching the agent, so another replica may safely take it."""
+    return isinstance(error.__cause__, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout))
+
+
+def _is_unhealthy(error: Exception) -> bool:
+    """Transport failures and 5xx answers count against a replica; JSON-RPC errors do not."""
+    if isinstance(error, A2AClientTimeoutError):
+        return True
+    return isinstance(error, A2AClientHTTPError) and error.status_code >= 500
+
+
+class BalancedClient(Client):
+    """A2A client spreading one logical agent's requests over its replicas.
+
+    Endpoints come from a ReplicaDirectory (the agent card URL alone when
+    the agent has no replicas). Each call goes to the healthy endpoint
+    with the fewest outstanding requests, or the lowest EWMA latency
+    weighted by outstanding requests with ``strategy='ewma'``. Failing
+    endpoints are ejected with exponential backoff and rejoin once their
+    agent card answers a probe. Messages that could not be sent at all
+    (connection refused or timed out) are retried on another endpoint;
+    anything that may have reached the agent is not, so a message is
+    never processed twice. Task follow-ups (get/cancel/resubscribe) stick
+    to the endpoint that created the task.
+    """
+
+    def __init__(
+        self,
+        client_factory: ClientFactory,
+        card: AgentCard,
+        httpx_client: httpx.AsyncClient,
+        directory: Optional[ReplicaDirectory] = None,
+        strategy: str = 'least_outstanding',
+    ):
+        super().__init__()
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown balancing strategy '{strategy}', expected one of {STRATEGIES}")
+        self.client_factory = client_factory
+        self.card = card
+        self.httpx_client = httpx_client
+        self.directory = directory or default_replica_directory()
+        self.strategy = strategy
+        self._primary = Endpoint(_normalize_url(card.url), client_factory.create(card))
+        self._endpoints: Dict[str, Endpoint] = {}
+        self._task_endpoints: "OrderedDict[str, Endpoint]" = OrderedDict()
+        self._probes = set()
+        self._sync()
+
+    @property
+    def endpoints(self) -> List[Endpoint]:
+        return list(self._endpoints.values()) or [self._primary]
+
+    def stats(self) -> List[dict]:
+        return [endpoint.stats() for endpoint in self.endpoints]
+
+    def _sync(self) -> None:
+        """Follow the replica directory: add new replicas, forget removed ones."""
+        urls = [_normalize_url(url) for url in self.directory.endpoints(self.card.url)]
+        if urls == list(self._endpoints):
+            return
+        endpoints = {}
+        for url in urls:
+            endpoint = self._endpoints.get(url)
+            if endpoint is None:
+                replica_card = self.card.model_copy(update={'url': f"{url}/"})
+                endpoint = Endpoint(url, self.client_factory.create(replica_card))
+            endpoints[url] = endpoint
+        self._endpoints = endpoints
+
+    def _pick(self, exclude: List[Endpoint] = ()) -> Optional[Endpoint]:
+        self._sync()
+        now = time.monotonic()
+        endpoints = self.endpoints
+        for endpoint in endpoints:
+            if endpoint.ejected_until and now >= endpoint.ejected_until and not endpoint.probing:
+                endpoint.probing = True
+                probe = asyncio.create_task(self._probe(endpoint))
+                self._probes.add(probe)
+                probe.add_done_callback(self._probes.discard)
+
+        candidates = [e for e in endpoints if e.healthy and e not in exclude]
+        if not candidates and self._primary not in endpoints and self._primary not in exclude:
+            # Every replica is down: fall back to the URL the agent card advertises
+            candidates = [self._primary]
+        if not candidates:
+            candidates = sorted(
+                (e for e in endpoints if e not in exclude), key=lambda e: e.ejected_until
+            )[:1]
+        if not candidates:
+            return None
+
+        if self.strategy == 'ewma':
+            return min(candidates, key=lambda e: (e.ewma or 0.0) * (e.outstanding + 1))
+        return min(candidates, key=lambda e: (e.outstanding, e.ewma or 0.0))
+
+    def _endpoint(self, task_id: Optional[str] = None) -> Endpoint:
+        endpoint = self._task_endpoints.get(task_id) if task_id else None
+        endpoint = endpoint or self._pick()
+        if endpoint is None:
+            raise NoHealthyEndpointError(f"{self.card.name}: no healthy endpoint")
+        return endpoint
+
+    async def _probe(self, endpoint: Endpoint) -> None:
+        try:
+            response = await self.httpx_client.get(
+                f"{endpoint.url}{AGENT_CARD_WELL_KNOWN_PATH}", timeout=PROBE_TIMEOUT
+            )
+            ok = response.status_code == 200
+        except httpx.HTTPError:
+            ok = False
+        finally:
+            endpoint.probing = False
+        if ok:
+            endpoint.ejected_until = 0.0
+            endpoint.eject_backoff = EJECT_BACKOFF_INITIAL
+            logger.info(f"{self.card.name}: replica {endpoint.url} is back")
+        else:
+            self._eject(endpoint)
+
+    def _eject(self, endpoint: Endpoint) -> None:
+        endpoint.ejected_until = time.monotonic() + endpoint.eject_backoff
+        endpoint.eject_backoff = min(endpoint.eject_backoff * 2, EJECT_BACKOFF_MAX)
+
+    def _failed(self, endpoint: Endpoint, error: Exception) -> None:
+        endpoint.failures += 1
+        # Concurrent requests failing together eject the endpoint once
+        if endpoint.healthy:
+            logger.warning(f"{self.card.name}: ejecting replica {endpoint.url}: {error}")
+            self._eject(endpoint)
+
+    def _succeeded(self, endpoint: Endpoint, seconds: float) -> None:
+        if endpoint.ewma is None:
+            endpoint.ewma = seconds
+        else:
+            endpoint.ewma = EWMA_ALPHA * seconds + (1 - EWMA_ALPHA) * endpoint.ewma
+
+    def _remember_task(self, event: Any, endpoint: Endpoint) -> None:
+        if isinstance(event, tuple):
+            task_id = event[0].id
+        elif isinstance(event, (Message, Task)):
+            task_id = getattr(event, 'task_id', None) or getattr(event, 'id', None)
+        else:
+            return
+        if task_id and task_id not in self._task_endpoints:
+            self._task_endpoints[task_id] = endpoint
+            while len(self._task_endpoints) > TASK_AFFINITY_SIZE:
+                self._task_endpoints.popitem(last=False)
+
+    async def send_message(self, request, *, context=None, request_metadata=None, extensions=None):
+        tried: List[Endpoint] = []
+        last_error: Optional[Exception] = None
+        while True:
+            endpoint = self._pick(exclude=tried)
+            if endpoint is None:
+                if last_error is not None:
+                    raise last_error
+                raise NoHealthyEndpointError(f"{self.card.name}: no healthy endpoint")
+            tried.append(endpoint)
+            received = False
+            endpoint.outstanding += 1
+            endpoint.requests += 1
+            start = time.perf_counter()
+            try:
+                async for event in endpoint.client.send_message(
+                    request, context=context, request_metadata=request_metadata, extensions=extensions
+                ):
+                    received = True
+                    self._remember_task(event, endpoint)
+                    yield event
+            except (A2AClientHTTPError, A2AClientTimeoutError) as e:
+                if not _is_unhealthy(e):
+                    raise
+                self._failed(endpoint, e)
+                if received or not _not_sent(e):
+                    raise
+                last_error = e
+                continue
+            finally:
+                endpoint.outstanding -= 1
+            self._succeeded(endpoint, time.perf_counter() - start)
+            return
+
+    async def _call(self, task_id: Optional[str], method: str, *args, **kwargs):
+        endpoint = self._endpoint(task_id)
+        endpoint.outstanding += 1
+        endpoint.requests += 1
+        try:
+            return await getattr(endpoint.client, method)(*args, **kwargs)
+        except (A2AClientHTTPError, A2AClientTimeoutError) as e:
+            if _is_unhealthy(e):
+                self._failed(endpoint, e)
+            raise
+        finally:
+            endpoint.outstanding -= 1
+
+    async def get_task(self, request, *, context=None, extensions=None):
+        return await self._call(request.id, 'get_task', request, context=context, extensions=extensions)
+
+    async def cancel_task(self, request, *, context=None, extensions=None):
+        return await self._call(request.id, 'cancel_task', request, context=context, extensions=extensions)
+
+    async def set_task_callback(self, request, *, context=None, extensions=None):
+        return await self._call(
+            request.task_id, 'set_task_callback', request, context=context, extensions=extensions
+        )
+
+    async def get_task_callback(self, request, *, context=None, extensions=None):
+        return await self._call(
+            request.id, 'get_task_callback', request, context=context, extensions=extensions
+        )
+
+    async def resubscribe(self, request, *, context=None, extensions=None):
+        endpoint = self._endpoint(request.id)
+        async for event in endpoint.client.resubscribe(request, context=context, extensions=extensions):
+            yield event
+
+    async def get_card(self, *, context=None, extensions=None, signature_verifier=None):
+        return await self._call(
+            None, 'get_card', context=context, extensions=extensions, signature_verifier=signature_verifier
+        )
+
+    async def close(self) -> None:
+        """Stop pending probes and forget endpoints; the shared httpx client stays open."""
+        for probe in list(self._probes):
+            probe.cancel()
+        await asyncio.gather(*self._probes, return_exceptions=True)
+        self._endpoints.clear()
+        self._task_endpoints.clear()
+
+
+_default_directory: Optional[ReplicaDirectory] = None
+
+
+def default_replica_directory() -> ReplicaDirectory:
+    """Process-wide ReplicaDirectory shared by every balanced client."""
+    global _default_directory
+    if _default_directory is None:
+        _default_directory = ReplicaDirectory()
+    return _default_directory
@@ -0,0 +1,114 @@
+"""Concurrent batch processing - Runs routed queries in parallel with per-agent limits."""
+
+import asyncio
+import re
+import time
+from typing import AsyncIterator, Dict, List, Optional
+
+from a2a_agent_pool import ECOSYSTEM_AGENTS, AgentClientPool
+from a2a_transport import create_http_client
+from app.intelligent_router import IntelligentA2ARouter
+
+
+DEFAULT_MAX_CONCURRENCY = 16
+DEFAULT_PER_AGENT_CONCURRENCY = 4
+
+_NAME_NOISE = re.compile(r"\b(?:a2a|agent)\b|[^a-z0-9]", re.IGNORECASE)
+
+
+def pool_agent(pool: AgentClientPool, agent_type: str, agent_name: str) -> str:
+    """The pool's name for the agent the router chose: 'Web Search Agent' -> 'websearch'."""
+    for candidate in (agent_type, agent_name):
+        name = _NAME_NOISE.sub('', candidate or '').lower()
+        if candidate in pool.agents:
+            return candidate
+        if name in pool.agents:
+            return name
+    raise KeyError(f"No known agent for '{agent_name or agent_type}'")
+
+
+async def iter_batch_process(
+    router: IntelligentA2ARouter,
+    queries: List[str],
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    per_agent_concurrency: int = DEFAULT_PER_AGENT_CONCURRENCY,
+    ordered: bool = False,
+    pool: Optional[AgentClientPool] = None,
+) -> AsyncIterator[dict]:
+    """Process ``queries`` concurrently, yielding each result as it completes.
+
+    Every query is routed once by ``router`` and sent to the chosen agent
+    through ``pool`` (a pool of its own when not given). A query first
+    waits for a slot of its agent's ``per_agent_concurrency`` limit and
+    only then takes one of the global ``max_concurrency`` slots, so
+    queries queued behind a slow agent do not hold global slots. With
+    ``ordered=True`` results are held back until all earlier queries have
+    been yielded, preserving input order.
+    """
+    owned_client = None
+    if pool is None:
+        owned_client = create_http_client()
+        pool = AgentClientPool(owned_client, agents=ECOSYSTEM_AGENTS)
+    global_limit = asyncio.Semaphore(max(1, max_concurrency))
+    agent_limits: Dict[str, asyncio.Semaphore] = {}
+
+    async def process(index: int, query: str) -> dict:
+        started = time.perf_counter()
+        agent_type = agent_name = None
+        try:
+            agent_type, agent_name, _ = await router.auto_route_query(query)
+            agent = pool_agent(pool, agent_type, agent_name)
+            agent_limit = agent_limits.setdefault(agent, asyncio.Semaphore(max(1, per_agent_concurrency)))
+            async with agent_limit:
+                async with global_limit:
+                    response = await pool.ask(agent, query)
+        except Exception as e:
+            response = f"❌ Auto-processing error: {e}"
+        return {
+            'index': index,
+            'query': query,
+            'agent': agent_name,
+            'response': response,
+            'elapsed': time.perf_counter() - started,
+        }
+
+    tasks = [asyncio.create_task(process(i, query)) for i, query in enumerate(queries)]
+    pending: Dict[int, dict] = {}
+    next_index = 0
+    try:
+        for completed in asyncio.as_completed(tasks):
+            result = await completed
+            if not ordered:
+                yield result
+                continue
+            pending[result['index']] = result
+            while next_index in pending:
+                yield pending.pop(next_index)
+                next_index += 1
+    finally:
+        for task in tasks:
+            task.cancel()
+        if owned_client is not None:
+            await pool.close()
+            await owned_client.aclose()
+
+
+async def concurrent_batch_process(
+    router: IntelligentA2ARouter,
+    queries: List[str],
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    per_agent_concurrency: int = DEFAULT_PER_AGENT_CONCURRENCY,
+    pool: Optional[AgentClientPool] = None,
+) -> List[dict]:
+    """Process ``queries`` concurrently and return the results in input order."""
+    return [
+        result
+        async for result in iter_batch_process(
+            router,
+            queries,
+            max_concurrency=max_concurrency,
+            per_agent_concurrency=per_agent_concurrency,
+            ordered=True,
+            pool=pool,
+        )
+    ]
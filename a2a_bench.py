@@ -0,0 +1,275 @@
+"""A2A load generator - Drives concurrent virtual clients against an agent and reports latency percentiles."""
+
+import asyncio
+import json
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import click
+
+from a2a.client import Client, ClientConfig, ClientFactory
+from a2a.client.helpers import create_text_message_object
+from a2a.types import Role
+
+from a2a_card_cache import default_card_cache
+from a2a_stats import percentile
+from a2a_streaming import stream_message
+from a2a_transport import TransportSettings, create_http_client
+
+
+# Local agents and a representative query for each; the Echo Agent is the
+# framework-overhead baseline since its executor does no work.
+BENCH_AGENTS = {
+    'echo': ('http://localhost:9999', 'Hello A2A World!'),
+    'registry': ('http://localhost:8000', 'search for calculator agents'),
+    'websearch': ('http://localhost:8001', 'search for mathematics'),
+    'calculator': ('http://localhost:8002', 'Calculate 15 + 25'),
+    'coordinator': ('http://localhost:8003', 'Calculate 2+3 and search for mathematics'),
+}
+MODES = ('non-streaming', 'streaming')
+PERCENTILES = (50, 95, 99)
+DEFAULT_THRESHOLD = 0.10
+# A failing agent answers instantly; back off instead of spinning on it
+ERROR_BACKOFF = 0.05
+ERROR_BACKOFF_MAX = 1.0
+
+
+def echo(text: str) -> None:
+    """Progress output goes to stderr so stdout stays valid JSON."""
+    click.echo(text, err=True)
+
+
+@dataclass
+class LoadStats:
+    """Samples collected by the virtual clients during the measured window."""
+
+    latencies: List[float] = field(default_factory=list)
+    first_events: List[float] = field(default_factory=list)
+    errors: Counter = field(default_factory=Counter)
+    last_completion: float = 0.0
+
+
+def latency_summary(values: List[float]) -> Optional[Dict[str, float]]:
+    """p50/p95/p99, mean and max of ``values`` in milliseconds."""
+    if not values:
+        return None
+    summary = {f"p{q}": round(percentile(values, q) * 1000, 2) for q in PERCENTILES}
+    summary['mean'] = round(sum(values) / len(values) * 1000, 2)
+    summary['max'] = round(max(values) * 1000, 2)
+    return summary
+
+
+async def virtual_client(
+    client: Client,
+    text: str,
+    streaming: bool,
+    measure_from: float,
+    deadline: float,
+    stats: LoadStats,
+) -> None:
+    """Send ``text`` back to back until ``deadline``; calls started during warm-up are not recorded.
+
+    After a failed call the client waits before the next one, doubling
+    the wait while calls keep failing.
+    """
+    failures = 0
+    while time.perf_counter() < deadline:
+        message = create_text_message_object(role=Role.user, content=text)
+        start = time.perf_counter()
+        first_event = None
+        try:
+            if streaming:
+                _, timing = await stream_message(client, message)
+                first_event = timing.first_event
+            else:
+                async for _ in client.send_message(message):
+                    pass
+        except Exception as e:
+            if start >= measure_from:
+                stats.errors[type(e).__name__] += 1
+            failures += 1
+            backoff = min(ERROR_BACKOFF_MAX, ERROR_BACKOFF * 2 ** (failures - 1))
+            await asyncio.sleep(max(0.0, min(backoff, deadline - time.perf_counter())))
+            continue
+        failures = 0
+        finished = time.perf_counter()
+        if start >= measure_from:
+            stats.latencies.append(finished - start)
+            if first_event is not None:
+                stats.first_events.append(first_event)
+            stats.last_completion = max(stats.last_completion, finished)
+
+
+async def run_load(
+    url: str,
+    text: str,
+    streaming: bool,
+    clients: int,
+    duration: float,
+    warmup: float,
+) -> dict:
+    """Run one load test against the agent at ``url`` and return its report."""
+    settings = TransportSettings.from_env()
+    settings.max_connections = max(settings.max_connections, clients)
+    settings.max_keepalive_connections = max(settings.max_keepalive_connections, clients)
+
+    async with create_http_client(settings) as httpx_client:
+        card = await default_card_cache().get_agent_card(httpx_client, url)
+        if streaming and not (card.capabilities and card.capabilities.streaming):
+            echo(f"⚠️ {card.name} does not advertise streaming; the client will fall back to message/send")
+        client = ClientFactory(ClientConfig(httpx_client=httpx_client, streaming=streaming)).create(card)
+
+        stats = LoadStats()
+        started_at = datetime.now(timezone.utc).isoformat()
+        start = time.perf_counter()
+        measure_from = start + warmup
+        deadline = measure_from + duration
+        await asyncio.gather(*(
+            virtual_client(client, text, streaming, measure_from, deadline, stats)
+            for _ in range(clients)
+        ))
+        pool = httpx_client.pool_metrics.stats()
+
+    requests = len(stats.latencies)
+    errors = sum(stats.errors.values())
+    window = max(stats.last_completion, deadline) - measure_from
+    return {
+        'agent': card.name,
+        'url': url,
+        'mode': MODES[1] if streaming else MODES[0],
+        'clients': clients,
+        'duration_s': round(window, 3),
+        'started_at': started_at,
+        'requests': requests,
+        'errors': errors,
+        'error_types': dict(stats.errors),
+        'error_rate': round(errors / (requests + errors), 4) if requests + errors else 0.0,
+        'throughput_rps': round(requests / window, 2) if window > 0 else 0.0,
+        'latency_ms': latency_summary(stats.latencies),
+        'first_event_ms': latency_summary(stats.first_events),
+        'http_pool': {key: round(value, 3) for key, value in pool.items()},
+    }
+
+
+def run_key(run: dict) -> tuple:
+    return run['url'], run['mode'], run['clients']
+
+
+def compare_reports(baseline: dict, current: dict, threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """Regressions of ``current`` against ``baseline`` for runs with the same URL, mode and clients.
+
+    Throughput dropping or a latency percentile or the error rate growing
+    by more than ``threshold`` (a fraction) counts; any errors count when
+    the baseline had none.
+    """
+    baseline_runs = {run_key(run): run for run in baseline.get('runs', [])}
+    regressions = []
+    for run in current.get('runs', []):
+        base = baseline_runs.get(run_key(run))
+        if base is None:
+            continue
+        label = f"{run['agent']} {run['mode']} x{run['clients']}"
+        if base['throughput_rps'] and run['throughput_rps'] < base['throughput_rps'] * (1 - threshold):
+            regressions.append(
+                f"{label}: throughput {base['throughput_rps']} -> {run['throughput_rps']} req/s"
+            )
+        for metric in ('latency_ms', 'first_event_ms'):
+            if not base.get(metric) or not run.get(metric):
+                continue
+            for q in PERCENTILES:
+                before, after = base[metric][f"p{q}"], run[metric][f"p{q}"]
+                if before and after > before * (1 + threshold):
+                    regressions.append(f"{label}: {metric[:-3]} p{q} {before} -> {after} ms")
+        if run['error_rate'] > base['error_rate'] * (1 + threshold):
+            regressions.append(f"{label}: error rate {base['error_rate']:.2%} -> {run['error_rate']:.2%}")
+    return regressions
+
+
+def print_run(run: dict) -> None:
+    latency = run['latency_ms'] or {}
+    echo(f"📊 {run['agent']} ({run['mode']}, {run['clients']} clients): "
+         f"{run['throughput_rps']} req/s, {run['requests']} ok, {run['errors']} errors")
+    if latency:
+        echo(f"   ⏱️ latency p50 {latency['p50']}ms, p95 {latency['p95']}ms, p99 {latency['p99']}ms")
+    if run['first_event_ms']:
+        echo(f"   ⚡ first event p50 {run['first_event_ms']['p50']}ms, p95 {run['first_event_ms']['p95']}ms")
+
+
+def report_regressions(regressions: List[str]) -> None:
+    if not regressions:
+        echo("✅ No regressions against the baseline")
+        return
+    echo(f"❌ {len(regressions)} regression(s) against the baseline:")
+    for regression in regressions:
+        echo(f"   • {regression}")
+
+
+def load_report(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+@click.group()
+def cli():
+    """Load tests for A2A agents; everything runs against local servers."""
+
+
+@cli.command()
+@click.option('--agent', 'agent', type=click.Choice(sorted(BENCH_AGENTS)), default='echo',
+              help='Local agent to load (sets the default URL and message).')
+@click.option('--url', 'url', default=None, help='Agent base URL, overriding --agent.')
+@click.option('--message', 'text', default=None, help='Message text each virtual client sends.')
+@click.option('--clients', 'clients', default=10, help='Concurrent virtual clients.')
+@click.option('--duration', 'duration', default=10.0, help='Measured seconds per mode.')
+@click.option('--warmup', 'warmup', default=1.0, help='Unmeasured seconds before each run.')
+@click.option('--mode', 'modes', multiple=True, type=click.Choice(MODES), default=MODES,
+              help='Non-streaming (message/send) and/or streaming (message/stream) runs.')
+@click.option('--output', 'output', default=None, help='Also write the JSON report to this file.')
+@click.option('--baseline', 'baseline', default=None, help='Report to compare this run against.')
+@click.option('--threshold', 'threshold', default=DEFAULT_THRESHOLD,
+              help='Relative change counted as a regression (0.1 = 10%).')
+def run(agent, url, text, clients, duration, warmup, modes, output, baseline, threshold):
+    """Drive an agent with concurrent virtual clients and report throughput and latency as JSON."""
+    default_url, default_text = BENCH_AGENTS[agent]
+    url, text = url or default_url, text or default_text
+
+    runs = []
+    for mode in modes:
+        echo(f"🚀 {mode}: {clients} clients for {duration:g}s (+{warmup:g}s warm-up) against {url}")
+        result = asyncio.run(run_load(url, text, mode == 'streaming', clients, duration, warmup))
+        print_run(result)
+        runs.append(result)
+
+    report = {'runs': runs}
+    click.echo(json.dumps(report, indent=2))
+    if output:
+        with open(output, 'w') as f:
+            json.dump(report, f, indent=2)
+        echo(f"💾 Report written to {output}")
+
+    if baseline:
+        regressions = compare_reports(load_report(baseline), report, threshold)
+        report_regressions(regressions)
+        if regressions:
+            sys.exit(1)
+
+
+@cli.command()
+@click.argument('baseline')
+@click.argument('current')
+@click.option('--threshold', 'threshold', default=DEFAULT_THRESHOLD,
+              help='Relative change counted as a regression (0.1 = 10%).')
+def compare(baseline, current, threshold):
+    """Compare two JSON reports; exits with status 1 on regressions."""
+    regressions = compare_reports(load_report(baseline), load_report(current), threshold)
+    report_regressions(regressions)
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    cli()
@@ -0,0 +1,199 @@
+"""Calculator result cache - Canonicalizes expressions and memoizes answers."""
+
+import ast
+import logging
+import re
+from collections import OrderedDict
+from typing import Optional
+
+from a2a.server.agent_execution import AgentExecutor, RequestContext
+from a2a.server.events import EventQueue
+from a2a.utils import new_agent_text_message
+
+from a2a_executor_utils import RecordingEventQueue, response_text
+
+
+DEFAULT_CACHE_SIZE = 1024
+
+# Natural language around the expression, e.g. "Calculate pi * 2?"
+_PREFIX = re.compile(r"^\s*(please\s+)?(calculate|compute|evaluate|what\s+is|solve)\s*:?\s*", re.IGNORECASE)
+_SUFFIX = re.compile(r"[\s?.!]+$")
+
+_COMMUTATIVE = (ast.Add, ast.Mult, ast.BitAnd, ast.BitOr, ast.BitXor)
+_FOLDABLE = {
+    ast.Add: lambda a, b: a + b,
+    ast.Sub: lambda a, b: a - b,
+    ast.Mult: lambda a, b: a * b,
+    ast.Div: lambda a, b: a / b,
+    ast.FloorDiv: lambda a, b: a // b,
+    ast.Mod: lambda a, b: a % b,
+    ast.Pow: lambda a, b: a ** b,
+}
+# Keep folding cheap: no huge powers or numbers in the cache key.
+_MAX_FOLD_EXPONENT = 64
+_MAX_FOLD_MAGNITUDE = 10 ** 30
+# Operands made only of these are numbers, so reordering them keeps the value.
+_NUMERIC_NODES = (
+    ast.BinOp, ast.UnaryOp, ast.Call, ast.Name, ast.Load, ast.operator, ast.unaryop, ast.keyword,
+)
+
+# The calculator's reply; cached answers are re-rendered from their result.
+REPLY_TEMPLATE = "🧮 Calculator Results:\n**Expression:** {expression}\n**Result:** {result}"
+_RESULT = re.compile(r"^\*\*Result:\*\*\s*(.+?)\s*$", re.MULTILINE)
+
+logger = logging.getLogger(__name__)
+
+
+def _is_number(node: ast.AST) -> bool:
+    return (
+        isinstance(node, ast.Constant)
+        and isinstance(node.value, (int, float))
+        and not isinstance(node.value, bool)
+    )
+
+
+def _is_numeric(node: ast.AST) -> bool:
+    """True for arithmetic on numbers, names and calls; False once strings, lists etc. appear."""
+    return all(_is_number(child) or isinstance(child, _NUMERIC_NODES) for child in ast.walk(node))
+
+
+class _Canonicalizer(ast.NodeTransformer):
+    """Folds numeric constants and orders the numeric operands of commutative operators."""
+
+    def visit_UnaryOp(self, node: ast.UnaryOp) -> ast.AST:
+        self.generic_visit(node)
+        if _is_number(node.operand) and isinstance(node.op, (ast.USub, ast.UAdd)):
+            value = -node.operand.value if isinstance(node.op, ast.USub) else node.operand.value
+            return ast.Constant(value)
+        return node
+
+    def visit_BinOp(self, node: ast.BinOp) -> ast.AST:
+        self.generic_visit(node)
+        fold = _FOLDABLE.get(type(node.op))
+        if fold and _is_number(node.left) and _is_number(node.right):
+            if not (isinstance(node.op, ast.Pow) and abs(node.right.value) > _MAX_FOLD_EXPONENT):
+                try:
+                    value = fold(node.left.value, node.right.value)
+                except (ArithmeticError, ValueError):
+                    return node
+                if isinstance(value, (int, float)) and abs(value) < _MAX_FOLD_MAGNITUDE:
+                    return ast.Constant(value)
+        if isinstance(node.op, ast.Pow) and _is_number(node.left) and node.left.value < 0:
+            # A folded negative base stays a negation so it unparses as (-2) ** x, not -2 ** x
+            node.left = ast.UnaryOp(ast.USub(), ast.Constant(-node.left.value))
+        if isinstance(node.op, _COMMUTATIVE) and _is_numeric(node.left) and _is_numeric(node.right):
+            left, right = ast.unparse(node.left), ast.unparse(node.right)
+            if right < left:
+                node.left, node.right = node.right, node.left
+        return node
+
+
+def extract_expression(text: str) -> str:
+    """Strip the natural-language wrapper from a calculator request."""
+    return _SUFFIX.sub("", _PREFIX.sub("", text.strip()))
+
+
+def canonicalize(text: str) -> Optional[str]:
+    """Return a canonical form of the expression in ``text``, or None if it is not one.
+
+    Whitespace and redundant parentheses disappear, numeric sub-expressions
+    are folded and commutative operands are ordered, so ``3 + 2*2`` and
+    ``4+3`` share the key ``7``.
+    """
+    expression = extract_expression(text).replace('^', '**')
+    if not expression:
+        return None
+    try:
+        tree = ast.parse(expression, mode='eval')
+    except (SyntaxError, ValueError):
+        return None
+    if any(
+        isinstance(node, (ast.Lambda, ast.NamedExpr, ast.Attribute, ast.Subscript, ast.comprehension))
+        for node in ast.walk(tree)
+    ):
+        return None
+    return ast.unparse(_Canonicalizer().visit(tree))
+
+
+def result_value(text: str) -> Optional[str]:
+    """The value on the **Result:** line of a calculator reply."""
+    match = _RESULT.search(text)
+    return match.group(1) if match else None
+
+
+class ResultCache:
+    """Size-bounded LRU mapping canonical expressions to result values."""
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: str, result: str) -> None:
+        if self.max_size <= 0:
+            return
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+
+class CachingCalculatorExecutor(AgentExecutor):
+    """Wraps the calculator executor with a canonicalizing result cache.
+
+    Requests whose expression canonicalizes to a cached key are answered
+    directly without running the wrapped executor, with the reply rendered
+    for the expression as the user wrote it; everything else is delegated
+    and the result value of its answer recorded.
+    """
+
+    def __init__(self, executor: AgentExecutor, max_size: int = DEFAULT_CACHE_SIZE):
+        self.executor = executor
+        self.cache = ResultCache(max_size)
+
+    async def execute(self, context: RequestContext, event_queue: EventQueue) -> None:
+        user_input = context.get_user_input()
+        key = canonicalize(user_input)
+        if key is None:
+            await self.executor.execute(context, event_queue)
+            return
+
+        expression = extract_expression(user_input)
+        cached = self.cache.get(key)
+        if cached is not None:
+            text = REPLY_TEMPLATE.format(expression=expression, result=cached)
+            await event_queue.enqueue_event(
+                new_agent_text_message(text, context.context_id, context.task_id)
+            )
+            return
+
+        recorder = RecordingEventQueue(event_queue)
+        await self.executor.execute(context, recorder)
+        text = response_text(recorder.events)
+        result = result_value(text) if text is not None else None
+        if result is not None:
+            self.cache.put(key, result)
+        logger.debug(f"Calculator cache stats: {self.cache.stats()}")
+
+    async def cancel(self, context: RequestContext, event_queue: EventQueue) -> None:
+        await self.executor.cancel(context, event_queue)
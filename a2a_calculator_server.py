@@ -3,22 +3,28 @@ import os
 import sys
 
 import click
-import httpx
-import uvicorn
 
 from a2a.server.apps import A2AStarletteApplication
 from a2a.server.request_handlers import DefaultRequestHandler
-from a2a.server.tasks import (
-    BasePushNotificationSender,
-    InMemoryPushNotificationConfigStore,
-    InMemoryTaskStore,
-)
 from a2a.types import (
     AgentCapabilities,
     AgentCard,
     AgentSkill,
 )
 
+from a2a_calculator_cache import DEFAULT_CACHE_SIZE, CachingCalculatorExecutor
+from a2a_card_cache import agent_card_route
+from a2a_membership import REGISTRY_URL, RegistryLease
+from a2a_metrics import AgentMetrics, MetricsMiddleware
+from a2a_push import QueuedPushNotificationSender
+from a2a_serving import component_lifespan, run_server, server_config_from_env, shared_task_store_spec
+from a2a_task_stores import (
+    TASK_STORE_HELP,
+    build_push_config_store,
+    build_task_store,
+)
+from a2a_tracing import TracingAgentExecutor
+from a2a_transport import shared_http_client
 from app.calculator_agent import CalculatorAgent
 from app.calculator_agent_executor import CalculatorAgentExecutor
 
@@ -27,83 +33,136 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def build_app(
+    host,
+    port,
+    task_store_spec='memory',
+    cache_size=DEFAULT_CACHE_SIZE,
+    public_url=None,
+    registry_url=None,
+):
+    """Builds the Calculator Agent application."""
+    capabilities = AgentCapabilities(streaming=True, push_notifications=True)
+    # Enhanced skills with detailed A2A protocol information
+    skills = [
+        AgentSkill(
+            id='calculate',
+            name='Mathematical Calculator',
+            description='Performs mathematical calculations and evaluates expressions using safe evaluation through A2A protocol',
+            tags=['math', 'calculation', 'arithmetic', 'algebra', 'functions', 'a2a protocol'],
+            examples=[
+                '2 + 3 * 4',
+                'sqrt(16) + sin(pi/2)',
+                '2**3 + log10(100)',
+                'Calculate the area of a circle with radius 5: pi * 5**2',
+                'cos(pi) + abs(-5)'
+            ],
+        ),
+        AgentSkill(
+            id='mathematical_functions',
+            name='Advanced Mathematical Functions',
+            description='Supports trigonometric, logarithmic, and other mathematical functions for complex calculations',
+            tags=['trigonometry', 'logarithms', 'advanced math', 'functions'],
+            examples=[
+                'sin(pi/4) + cos(pi/4)',
+                'log(e) + log10(100)',
+                'sqrt(abs(-16))',
+                'floor(3.7) + ceil(3.2)'
+            ],
+        ),
+        AgentSkill(
+            id='computation_service',
+            name='A2A Computation Service',
+            description='Provides computational services to other A2A agents requiring mathematical operations',
+            tags=['computation', 'service', 'a2a protocol', 'mathematical operations'],
+            examples=[
+                'compute mathematical expressions',
+                'evaluate formulas',
+                'perform calculations for other agents'
+            ],
+        )
+    ]
+    agent_card = AgentCard(
+        name='Calculator Agent',
+        description='A specialized A2A agent for mathematical calculations, from basic arithmetic to complex expressions with functions. Provides computational services to the A2A ecosystem.',
+        url=public_url or f'http://{host}:{port}/',
+        version='1.0.0',
+        default_input_modes=CalculatorAgent.SUPPORTED_CONTENT_TYPES,
+        default_output_modes=CalculatorAgent.SUPPORTED_CONTENT_TYPES,
+        capabilities=capabilities,
+        skills=skills,
+    )
+
+    # Set up the server components
+    task_store = build_task_store(task_store_spec)
+    httpx_client = shared_http_client()
+    push_config_store = build_push_config_store(task_store_spec)
+    push_sender = QueuedPushNotificationSender(
+        httpx_client=httpx_client,
+        config_store=push_config_store
+    )
+    metrics = AgentMetrics(agent_card.name)
+    metrics.track_task_store(task_store)
+    metrics.track_push_sender(push_sender)
+    # Registered with the Agent Registry for as long as the server runs
+    lease = RegistryLease(httpx_client, registry_url, agent_card) if registry_url else None
+    agent_executor = CalculatorAgentExecutor()
+    if cache_size > 0:
+        agent_executor = CachingCalculatorExecutor(agent_executor, max_size=cache_size)
+        metrics.track_cache('calculator', agent_executor.cache)
+    request_handler = DefaultRequestHandler(
+        agent_executor=metrics.instrument_executor(
+            TracingAgentExecutor(agent_executor, agent_card.name)
+        ),
+        task_store=task_store,
+        push_config_store=push_config_store,
+        push_sender=push_sender
+    )
+    server = A2AStarletteApplication(
+        agent_card=agent_card, 
+        http_handler=request_handler
+    )
+
+    app = server.build(
+        routes=[agent_card_route(agent_card), metrics.route()],
+        lifespan=component_lifespan(lease, push_sender, task_store, push_config_store),
+    )
+    app.add_middleware(MetricsMiddleware, metrics=metrics)
+    return app
+
+
+def create_app():
+    """Builds the application inside a uvicorn worker process."""
+    return build_app(**server_config_from_env())
+
+
 @click.command()
 @click.option('--host', 'host', default='localhost')
 @click.option('--port', 'port', default=8002)
-def main(host, port):
+@click.option('--task-store', 'task_store_spec', default='memory', help=TASK_STORE_HELP)
+@click.option('--cache-size', 'cache_size', default=DEFAULT_CACHE_SIZE,
+              help='Maximum number of cached calculator results (0 disables the cache).')
+@click.option('--public-url', 'public_url', default=None,
+              help='URL advertised in the agent card, e.g. when served behind a proxy.')
+@click.option('--registry-url', 'registry_url', default=REGISTRY_URL,
+              help="Agent Registry to register with under a heartbeat lease; '' to run unregistered.")
+@click.option('--workers', 'workers', default=1,
+              help='Number of worker processes; workers share task state through SQLite, '
+                   'but resubscribe and cancel only reach the worker running the task.')
+def main(host, port, cache_size, task_store_spec, public_url, registry_url, workers):
     """Starts the Calculator Agent server."""
     try:
-        capabilities = AgentCapabilities(streaming=True, push_notifications=True)
-        # Enhanced skills with detailed A2A protocol information
-        skills = [
-            AgentSkill(
-                id='calculate',
-                name='Mathematical Calculator',
-                description='Performs mathematical calculations and evaluates expressions using safe evaluation through A2A protocol',
-                tags=['math', 'calculation', 'arithmetic', 'algebra', 'functions', 'a2a protocol'],
-                examples=[
-                    '2 + 3 * 4',
-                    'sqrt(16) + sin(pi/2)',
-                    '2**3 + log10(100)',
-                    'Calculate the area of a circle with radius 5: pi * 5**2',
-                    'cos(pi) + abs(-5)'
-                ],
-            ),
-            AgentSkill(
-                id='mathematical_functions',
-                name='Advanced Mathematical Functions',
-                description='Supports trigonometric, logarithmic, and other mathematical functions for complex calculations',
-                tags=['trigonometry', 'logarithms', 'advanced math', 'functions'],
-                examples=[
-                    'sin(pi/4) + cos(pi/4)',
-                    'log(e) + log10(100)',
-                    'sqrt(abs(-16))',
-                    'floor(3.7) + ceil(3.2)'
-                ],
-            ),
-            AgentSkill(
-                id='computation_service',
-                name='A2A Computation Service',
-                description='Provides computational services to other A2A agents requiring mathematical operations',
-                tags=['computation', 'service', 'a2a protocol', 'mathematical operations'],
-                examples=[
-                    'compute mathematical expressions',
-                    'evaluate formulas',
-                    'perform calculations for other agents'
-                ],
-            )
-        ]
-        agent_card = AgentCard(
-            name='Calculator Agent',
-            description='A specialized A2A agent for mathematical calculations, from basic arithmetic to complex expressions with functions. Provides computational services to the A2A ecosystem.',
-            url=f'http://{host}:{port}/',
-            version='1.0.0',
-            default_input_modes=CalculatorAgent.SUPPORTED_CONTENT_TYPES,
-            default_output_modes=CalculatorAgent.SUPPORTED_CONTENT_TYPES,
-            capabilities=capabilities,
-            skills=skills,
-        )
-
-        # Set up the server components
-        httpx_client = httpx.AsyncClient()
-        push_config_store = InMemoryPushNotificationConfigStore()
-        push_sender = BasePushNotificationSender(
-            httpx_client=httpx_client,
-            config_store=push_config_store
-        )
-        request_handler = DefaultRequestHandler(
-            agent_executor=CalculatorAgentExecutor(),
-            task_store=InMemoryTaskStore(),
-            push_config_store=push_config_store,
-            push_sender=push_sender
-        )
-        server = A2AStarletteApplication(
-            agent_card=agent_card, 
-            http_handler=request_handler
-        )
+        config = {
+            'host': host,
+            'port': port,
+            'task_store_spec': shared_task_store_spec(task_store_spec, 'calculator', workers),
+            'public_url': public_url,
+            'registry_url': registry_url or None,
+            'cache_size': cache_size,
+        }
 
         logger.info(f"Starting Calculator Agent server on {host}:{port}")
-        uvicorn.run(server.build(), host=host, port=port)
+        run_server('a2a_calculator_server:create_app', build_app, config, workers)
 
     except Exception as e:
         logger.error(f'An error occurred during server startup: {e}')
@@ -0,0 +1,197 @@
+"""Agent card caching - Persistent client cache and ETag-aware server endpoint."""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from typing import Dict, Optional
+
+import httpx
+
+from a2a.client.errors import A2AClientHTTPError, A2AClientJSONError
+from a2a.types import AgentCard
+from a2a.utils.constants import AGENT_CARD_WELL_KNOWN_PATH
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.expanduser('~'), '.cache', 'a2a', 'agent_cards.json'
+)
+DEFAULT_CACHE_TTL = 300.0
+
+
+logger = logging.getLogger(__name__)
+
+
+class AgentCardCache:
+    """On-disk agent card cache keyed by base URL.
+
+    Within ``ttl`` seconds of the last fetch a card is served without any
+    network access. After that it is revalidated with ``If-None-Match``,
+    so an unchanged card costs a single 304 round trip.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: Optional[float] = None):
+        self.path = path or os.environ.get('A2A_CARD_CACHE_PATH', DEFAULT_CACHE_PATH)
+        self.ttl = ttl if ttl is not None else float(
+            os.environ.get('A2A_CARD_CACHE_TTL', DEFAULT_CACHE_TTL)
+        )
+        self._entries: Dict[str, dict] = self._load()
+        self._cards: Dict[str, AgentCard] = {}
+        self.hits = 0
+        self.revalidations = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(base_url: str) -> str:
+        return base_url.rstrip('/')
+
+    def _load(self) -> Dict[str, dict]:
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                entries = json.load(f)
+            return entries if isinstance(entries, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable agent card cache {self.path}: {e}")
+            return {}
+
+    def _save(self) -> None:
+        # Merge with whatever other processes wrote since we loaded, keeping
+        # the most recently fetched entry for every base URL.
+        entries = self._load()
+        for key, entry in self._entries.items():
+            if entry['fetched_at'] >= entries.get(key, {}).get('fetched_at', 0):
+                entries[key] = entry
+        self._entries = entries
+
+        directory = os.path.dirname(self.path) or '.'
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Failed to persist agent card cache {self.path}: {e}")
+
+    def _card(self, key: str) -> AgentCard:
+        card = self._cards.get(key)
+        if card is None:
+            card = AgentCard.model_validate(self._entries[key]['card'])
+            self._cards[key] = card
+        return card
+
+    def invalidate(self, base_url: str) -> None:
+        """Forget the cached card for ``base_url``."""
+        key = self._key(base_url)
+        self._entries.pop(key, None)
+        self._cards.pop(key, None)
+
+    async def get_agent_card(
+        self,
+        httpx_client: httpx.AsyncClient,
+        base_url: str,
+        timeout: Optional[float] = None,
+    ) -> AgentCard:
+        """Return the agent card for ``base_url``, fetching only when needed."""
+        key = self._key(base_url)
+        entry = self._entries.get(key)
+
+        if entry and time.time() - entry['fetched_at'] < self.ttl:
+            self.hits += 1
+            return self._card(key)
+
+        headers = {}
+        if entry and entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+
+        target_url = f"{key}{AGENT_CARD_WELL_KNOWN_PATH}"
+        try:
+            response = await httpx_client.get(
+                target_url,
+                headers=headers,
+                **({'timeout': timeout} if timeout is not None else {}),
+            )
+            if response.status_code == 304 and entry:
+                self.revalidations += 1
+                entry['fetched_at'] = time.time()
+                self._save()
+                return self._card(key)
+            response.raise_for_status()
+            card = AgentCard.model_validate(response.json())
+        except httpx.HTTPStatusError as e:
+            raise A2AClientHTTPError(
+                e.response.status_code,
+                f'Failed to fetch agent card from {target_url}: {e}',
+            ) from e
+        except httpx.RequestError as e:
+            raise A2AClientHTTPError(
+                503,
+                f'Network communication error fetching agent card from {target_url}: {e}',
+            ) from e
+        except ValueError as e:
+            raise A2AClientJSONError(
+                f'Failed to parse agent card from {target_url}: {e}'
+            ) from e
+
+        self.misses += 1
+        self._store(key, card, response.headers.get('etag'))
+        return card
+
+    def _store(self, key: str, card: AgentCard, etag: Optional[str]) -> None:
+        self._entries[key] = {
+            'etag': etag,
+            'fetched_at': time.time(),
+            'card': card.model_dump(mode='json', exclude_none=True, by_alias=True),
+        }
+        self._cards[key] = card
+        self._save()
+
+
+_default_cache: Optional[AgentCardCache] = None
+
+
+def default_card_cache() -> AgentCardCache:
+    """Return the process-wide agent card cache shared by all clients."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = AgentCardCache()
+    return _default_cache
+
+
+def agent_card_route(
+    agent_card: AgentCard,
+    path: str = AGENT_CARD_WELL_KNOWN_PATH,
+    max_age: int = 60,
+) -> Route:
+    """Build a route serving ``agent_card`` from pre-serialized bytes.
+
+    The body is serialized once and tagged with a strong ETag, so repeat
+    requests carrying a matching ``If-None-Match`` get an empty 304.
+    Pass the route to ``A2AStarletteApplication.build(routes=[...])`` so
+    it takes precedence over the SDK's own card endpoint.
+    """
+    body = json.dumps(
+        agent_card.model_dump(mode='json', exclude_none=True, by_alias=True),
+        ensure_ascii=False,
+        separators=(',', ':'),
+    ).encode('utf-8')
+    etag = f'"{hashlib.sha256(body).hexdigest()}"'
+    headers = {
+        'ETag': etag,
+        'Cache-Control': f'max-age={max_age}',
+    }
+
+    async def get_agent_card(request: Request) -> Response:
+        if_none_match = request.headers.get('if-none-match', '')
+        if etag in (tag.strip() for tag in if_none_match.split(',')) or if_none_match.strip() == '*':
+            return Response(status_code=304, headers=headers)
+        return Response(body, media_type='application/json', headers=headers)
+
+    return Route(path, get_agent_card, methods=['GET'], name='cached_agent_card')
@@ -4,16 +4,29 @@ import asyncio
 import logging
 from uuid import uuid4
 
-import httpx
+import click
 
-from a2a.client import A2ACardResolver, ClientFactory, ClientConfig
+from a2a.client import ClientFactory, ClientConfig
 from a2a.client.helpers import create_text_message_object
 from a2a.types import Role
 from a2a.utils.message import get_message_text
 from a2a.utils.constants import AGENT_CARD_WELL_KNOWN_PATH
 
+from a2a_card_cache import default_card_cache
+from a2a_streaming import stream_message
+from a2a_transport import create_http_client
 
-async def main() -> None:
+
+async def send_streaming(client, message, logger) -> None:
+    """Send a message over SSE, printing each event as it arrives."""
+    text, timing = await stream_message(
+        client, message, 'echo', on_event=lambda line: print(f"  ⏳ {line}")
+    )
+    print(f"Agent response: {text}")
+    logger.info(f"Streaming timing: {timing.summary()}")
+
+
+async def main(streaming: bool = False) -> None:
     """Main client function to send messages to the Echo Agent."""
     # Configure logging to show INFO level messages
     logging.basicConfig(level=logging.INFO)
@@ -21,17 +34,11 @@ async def main() -> None:
 
     base_url = 'http://localhost:9999'
 
-    async with httpx.AsyncClient() as httpx_client:
-        # Initialize A2ACardResolver
-        resolver = A2ACardResolver(
-            httpx_client=httpx_client,
-            base_url=base_url,
-        )
-
-        # Fetch Agent Card
+    async with create_http_client() as httpx_client:
+        # Fetch Agent Card (served from the shared card cache when fresh)
         try:
             logger.info(f'Fetching agent card from: {base_url}{AGENT_CARD_WELL_KNOWN_PATH}')
-            agent_card = await resolver.get_agent_card()
+            agent_card = await default_card_cache().get_agent_card(httpx_client, base_url)
             logger.info('Successfully fetched agent card:')
             logger.info(agent_card.model_dump_json(indent=2, exclude_none=True))
 
@@ -42,7 +49,7 @@ async def main() -> None:
         # Initialize Client using ClientFactory
         config = ClientConfig(
             httpx_client=httpx_client,
-            streaming=False,  # Use non-streaming for simplicity
+            streaming=streaming,  # SSE when the agent card advertises streaming
         )
         factory = ClientFactory(config)
         client = factory.create(agent_card)
@@ -55,23 +62,26 @@ async def main() -> None:
             content="Hello A2A World!"
         )
         
-        async for event in client.send_message(message):
-            if isinstance(event, tuple):  # (Task, UpdateEvent)
-                task, update_event = event
-                logger.info("Received task response:")
-                print(f"Task ID: {task.id}")
-                print(f"Status: {task.status.state}")
-                if task.history:
-                    for msg in task.history:
-                        message_text = get_message_text(msg)
-                        if msg.role == Role.agent:
-                            print(f"Agent response: {message_text}")
-                        else:
-                            print(f"User message: {message_text}")
-            else:  # Direct Message
-                logger.info("Received message response:")
-                message_text = get_message_text(event)
-                print(f"Message: {message_text}")
+        if streaming:
+            await send_streaming(client, message, logger)
+        else:
+            async for event in client.send_message(message):
+                if isinstance(event, tuple):  # (Task, UpdateEvent)
+                    task, update_event = event
+                    logger.info("Received task response:")
+                    print(f"Task ID: {task.id}")
+                    print(f"Status: {task.status.state}")
+                    if task.history:
+                        for msg in task.history:
+                            message_text = get_message_text(msg)
+                            if msg.role == Role.agent:
+                                print(f"Agent response: {message_text}")
+                            else:
+                                print(f"User message: {message_text}")
+                else:  # Direct Message
+                    logger.info("Received message response:")
+                    message_text = get_message_text(event)
+                    print(f"Message: {message_text}")
 
         # Example of multiple messages
         print("\nSending another message...")
@@ -80,24 +90,37 @@ async def main() -> None:
             content="This is a test message!"
         )
         
-        async for event in client.send_message(message2):
-            if isinstance(event, tuple):  # (Task, UpdateEvent)
-                task, update_event = event
-                logger.info("Received second task response:")
-                print(f"Task ID: {task.id}")
-                print(f"Status: {task.status.state}")
-                if task.history:
-                    for msg in task.history:
-                        message_text = get_message_text(msg)
-                        if msg.role == Role.agent:
-                            print(f"Agent response: {message_text}")
-                        else:
-                            print(f"User message: {message_text}")
-            else:  # Direct Message
-                logger.info("Received second message response:")
-                message_text = get_message_text(event)
-                print(f"Message: {message_text}")
+        if streaming:
+            await send_streaming(client, message2, logger)
+        else:
+            async for event in client.send_message(message2):
+                if isinstance(event, tuple):  # (Task, UpdateEvent)
+                    task, update_event = event
+                    logger.info("Received second task response:")
+                    print(f"Task ID: {task.id}")
+                    print(f"Status: {task.status.state}")
+                    if task.history:
+                        for msg in task.history:
+                            message_text = get_message_text(msg)
+                            if msg.role == Role.agent:
+                                print(f"Agent response: {message_text}")
+                            else:
+                                print(f"User message: {message_text}")
+                else:  # Direct Message
+                    logger.info("Received second message response:")
+                    message_text = get_message_text(event)
+                    print(f"Message: {message_text}")
+
+        logger.info(f"HTTP pool: {httpx_client.pool_metrics.summary()}")
+
+
+@click.command()
+@click.option('--stream', 'streaming', is_flag=True,
+              help='Stream responses over SSE, showing each event as it arrives.')
+def cli(streaming):
+    """Sends test messages to the Echo Agent."""
+    asyncio.run(main(streaming))
 
 
 if __name__ == '__main__':
-    asyncio.run(main())
+    cli()
@@ -3,22 +3,29 @@ import os
 import sys
 
 import click
-import httpx
-import uvicorn
 
 from a2a.server.apps import A2AStarletteApplication
 from a2a.server.request_handlers import DefaultRequestHandler
-from a2a.server.tasks import (
-    BasePushNotificationSender,
-    InMemoryPushNotificationConfigStore,
-    InMemoryTaskStore,
-)
 from a2a.types import (
     AgentCapabilities,
     AgentCard,
     AgentSkill,
 )
 
+from a2a_agent_pool import AgentClientPool
+from a2a_card_cache import agent_card_route
+from a2a_fanout import DEFAULT_SUBTASK_TIMEOUT, FanOutCoordinatorExecutor
+from a2a_membership import REGISTRY_URL, RegistryFeed, RegistryLease
+from a2a_metrics import AgentMetrics, MetricsMiddleware
+from a2a_push import QueuedPushNotificationSender
+from a2a_serving import component_lifespan, run_server, server_config_from_env, shared_task_store_spec
+from a2a_task_stores import (
+    TASK_STORE_HELP,
+    build_push_config_store,
+    build_task_store,
+)
+from a2a_tracing import TracingAgentExecutor
+from a2a_transport import shared_http_client
 from app.coordinator_agent import CoordinatorAgent
 from app.coordinator_agent_executor import CoordinatorAgentExecutor
 
@@ -27,86 +34,151 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def build_app(
+    host,
+    port,
+    task_store_spec='memory',
+    public_url=None,
+    subtask_timeout=DEFAULT_SUBTASK_TIMEOUT,
+    registry_url=None,
+    downstream_agents=None,
+):
+    """Builds the A2A Coordinator Agent application.
+
+    ``downstream_agents`` maps agent names to base URLs for the fan-out
+    pool (default: DOWNSTREAM_AGENTS on their usual localhost ports).
+    """
+    capabilities = AgentCapabilities(streaming=True, push_notifications=True)
+
+    # Enhanced skills showcasing A2A agent-to-agent communication
+    skills = [
+        AgentSkill(
+            id='agent_coordination',
+            name='A2A Agent Coordination',
+            description='Coordinates multiple A2A agents to fulfill complex requests using the A2A protocol',
+            tags=['coordination', 'multi-agent', 'a2a protocol', 'orchestration'],
+            examples=[
+                'Calculate 2+3 and search for mathematics',
+                'What is quantum computing and compute pi * 2',
+                'Find agents that can help with calculations',
+                'Coordinate search and computation tasks'
+            ],
+        ),
+        AgentSkill(
+            id='a2a_communication',
+            name='A2A Inter-Agent Communication',
+            description='Demonstrates agent-to-agent communication using A2A protocol message passing',
+            tags=['a2a protocol', 'communication', 'inter-agent', 'messaging'],
+            examples=[
+                'Send calculation request to calculator agent',
+                'Query web search agent for information',
+                'Request agent list from registry',
+                'Echo test via echo agent'
+            ],
+        ),
+        AgentSkill(
+            id='complex_task_handling',
+            name='Complex Task Decomposition',
+            description='Breaks down complex tasks and routes sub-tasks to appropriate specialized A2A agents',
+            tags=['task decomposition', 'routing', 'specialization', 'workflow'],
+            examples=[
+                'Research and calculate compound tasks',
+                'Multi-step problem solving',
+                'Cross-agent workflow execution'
+            ],
+        )
+    ]
+
+    agent_card = AgentCard(
+        name='A2A Coordinator Agent',
+        description='A meta-agent that demonstrates the power of A2A protocol by coordinating multiple specialized agents. Showcases agent discovery, inter-agent communication, and complex task orchestration.',
+        url=public_url or f'http://{host}:{port}/',
+        version='1.0.0',
+        default_input_modes=CoordinatorAgent.SUPPORTED_CONTENT_TYPES,
+        default_output_modes=CoordinatorAgent.SUPPORTED_CONTENT_TYPES,
+        capabilities=capabilities,
+        skills=skills,
+    )
+
+    # Set up the server components
+    task_store = build_task_store(task_store_spec)
+    httpx_client = shared_http_client()
+    push_config_store = build_push_config_store(task_store_spec)
+    push_sender = QueuedPushNotificationSender(
+        httpx_client=httpx_client,
+        config_store=push_config_store
+    )
+    metrics = AgentMetrics(agent_card.name)
+    metrics.track_task_store(task_store)
+    metrics.track_push_sender(push_sender)
+    # Registered with the Agent Registry for as long as the server runs
+    lease = RegistryLease(httpx_client, registry_url, agent_card) if registry_url else None
+    # Compound queries fan out to their agents concurrently
+    downstream = AgentClientPool(httpx_client, downstream_agents)
+    metrics.track_agent_pool(downstream)
+    feed = None
+    if registry_url:
+        # Agents that leave the registry drop out of the pool right away
+        feed = RegistryFeed(httpx_client, registry_url)
+        downstream.follow(feed)
+    agent_executor = FanOutCoordinatorExecutor(
+        CoordinatorAgentExecutor(), downstream, subtask_timeout=subtask_timeout
+    )
+    request_handler = DefaultRequestHandler(
+        agent_executor=metrics.instrument_executor(
+            TracingAgentExecutor(agent_executor, agent_card.name)
+        ),
+        task_store=task_store,
+        push_config_store=push_config_store,
+        push_sender=push_sender
+    )
+    server = A2AStarletteApplication(
+        agent_card=agent_card, 
+        http_handler=request_handler
+    )
+
+    app = server.build(
+        routes=[agent_card_route(agent_card), metrics.route()],
+        lifespan=component_lifespan(lease, feed, downstream, push_sender, task_store, push_config_store),
+    )
+    app.add_middleware(MetricsMiddleware, metrics=metrics)
+    return app
+
+
+def create_app():
+    """Builds the application inside a uvicorn worker process."""
+    return build_app(**server_config_from_env())
+
+
 @click.command()
 @click.option('--host', 'host', default='localhost')
 @click.option('--port', 'port', default=8003)
-def main(host, port):
+@click.option('--task-store', 'task_store_spec', default='memory', help=TASK_STORE_HELP)
+@click.option('--subtask-timeout', 'subtask_timeout', default=DEFAULT_SUBTASK_TIMEOUT,
+              help='Seconds to wait for each part of a compound query before answering without it.')
+@click.option('--public-url', 'public_url', default=None,
+              help='URL advertised in the agent card, e.g. when served behind a proxy.')
+@click.option('--registry-url', 'registry_url', default=REGISTRY_URL,
+              help="Agent Registry to register with under a heartbeat lease; '' to run unregistered.")
+@click.option('--workers', 'workers', default=1,
+              help='Number of worker processes; workers share task state through SQLite, '
+                   'but resubscribe and cancel only reach the worker running the task.')
+def main(host, port, task_store_spec, subtask_timeout, public_url, registry_url, workers):
     """Starts the A2A Coordinator Agent server."""
     try:
-        capabilities = AgentCapabilities(streaming=True, push_notifications=True)
-        
-        # Enhanced skills showcasing A2A agent-to-agent communication
-        skills = [
-            AgentSkill(
-                id='agent_coordination',
-                name='A2A Agent Coordination',
-                description='Coordinates multiple A2A agents to fulfill complex requests using the A2A protocol',
-                tags=['coordination', 'multi-agent', 'a2a protocol', 'orchestration'],
-                examples=[
-                    'Calculate 2+3 and search for mathematics',
-                    'What is quantum computing and compute pi * 2',
-                    'Find agents that can help with calculations',
-                    'Coordinate search and computation tasks'
-                ],
-            ),
-            AgentSkill(
-                id='a2a_communication',
-                name='A2A Inter-Agent Communication',
-                description='Demonstrates agent-to-agent communication using A2A protocol message passing',
-                tags=['a2a protocol', 'communication', 'inter-agent', 'messaging'],
-                examples=[
-                    'Send calculation request to calculator agent',
-                    'Query web search agent for information',
-                    'Request agent list from registry',
-                    'Echo test via echo agent'
-                ],
-            ),
-            AgentSkill(
-                id='complex_task_handling',
-                name='Complex Task Decomposition',
-                description='Breaks down complex tasks and routes sub-tasks to appropriate specialized A2A agents',
-                tags=['task decomposition', 'routing', 'specialization', 'workflow'],
-                examples=[
-                    'Research and calculate compound tasks',
-                    'Multi-step problem solving',
-                    'Cross-agent workflow execution'
-                ],
-            )
-        ]
-        
-        agent_card = AgentCard(
-            name='A2A Coordinator Agent',
-            description='A meta-agent that demonstrates the power of A2A protocol by coordinating multiple specialized agents. Showcases agent discovery, inter-agent communication, and complex task orchestration.',
-            url=f'http://{host}:{port}/',
-            version='1.0.0',
-            default_input_modes=CoordinatorAgent.SUPPORTED_CONTENT_TYPES,
-            default_output_modes=CoordinatorAgent.SUPPORTED_CONTENT_TYPES,
-            capabilities=capabilities,
-            skills=skills,
-        )
-
-        # Set up the server components
-        httpx_client = httpx.AsyncClient()
-        push_config_store = InMemoryPushNotificationConfigStore()
-        push_sender = BasePushNotificationSender(
-            httpx_client=httpx_client,
-            config_store=push_config_store
-        )
-        request_handler = DefaultRequestHandler(
-            agent_executor=CoordinatorAgentExecutor(),
-            task_store=InMemoryTaskStore(),
-            push_config_store=push_config_store,
-            push_sender=push_sender
-        )
-        server = A2AStarletteApplication(
-            agent_card=agent_card, 
-            http_handler=request_handler
-        )
+        config = {
+            'host': host,
+            'port': port,
+            'task_store_spec': shared_task_store_spec(task_store_spec, 'coordinator', workers),
+            'public_url': public_url,
+            'registry_url': registry_url or None,
+            'subtask_timeout': subtask_timeout,
+        }
 
         logger.info(f"Starting A2A Coordinator Agent server on {host}:{port}")
         logger.info("🤝 Coordinator will demonstrate A2A agent-to-agent communication")
         logger.info("🔗 Will connect to other A2A agents in the ecosystem")
-        uvicorn.run(server.build(), host=host, port=port)
+        run_server('a2a_coordinator_server:create_app', build_app, config, workers)
 
     except Exception as e:
         logger.error(f'An error occurred during server startup: {e}')
@@ -0,0 +1,106 @@
+"""Concurrent A2A agent discovery - Resolves many agent cards at once with deadlines."""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import httpx
+
+from a2a.types import AgentCard
+
+from a2a_card_cache import AgentCardCache, default_card_cache
+
+
+DEFAULT_MAX_CONCURRENCY = 16
+DEFAULT_AGENT_TIMEOUT = 2.0
+DEFAULT_OVERALL_TIMEOUT = 5.0
+
+
+@dataclass
+class DiscoveryResult:
+    """Outcome of resolving a single agent card."""
+
+    name: str
+    base_url: str
+    card: Optional[AgentCard] = None
+    latency: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.card is not None
+
+    @property
+    def latency_ms(self) -> float:
+        return self.latency * 1000
+
+
+async def discover_agents(
+    httpx_client: httpx.AsyncClient,
+    targets: List[Tuple[str, str]],
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    agent_timeout: float = DEFAULT_AGENT_TIMEOUT,
+    overall_timeout: float = DEFAULT_OVERALL_TIMEOUT,
+    card_cache: Optional[AgentCardCache] = None,
+) -> List[DiscoveryResult]:
+    """Resolve the agent cards of all (name, base_url) targets concurrently.
+
+    At most ``max_concurrency`` cards are fetched at the same time, each one
+    is abandoned after ``agent_timeout`` seconds, and whatever has not
+    answered when ``overall_timeout`` expires is reported as timed out so
+    the caller always gets partial results back. Results keep the order
+    of ``targets``. Cards come from ``card_cache`` (the shared on-disk
+    cache by default), so warm runs skip or revalidate the fetch.
+    """
+    card_cache = card_cache or default_card_cache()
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    started_at = {}
+
+    async def resolve(index: int, name: str, base_url: str) -> DiscoveryResult:
+        async with semaphore:
+            started_at[index] = time.perf_counter()
+            try:
+                card = await asyncio.wait_for(
+                    card_cache.get_agent_card(httpx_client, base_url, timeout=agent_timeout),
+                    timeout=agent_timeout,
+                )
+                return DiscoveryResult(
+                    name, base_url, card=card,
+                    latency=time.perf_counter() - started_at[index],
+                )
+            except asyncio.TimeoutError:
+                error = f"timed out after {agent_timeout:.1f}s"
+            except Exception as e:
+                error = str(e)
+            return DiscoveryResult(
+                name, base_url, error=error,
+                latency=time.perf_counter() - started_at[index],
+            )
+
+    tasks = [
+        asyncio.create_task(resolve(index, name, url))
+        for index, (name, url) in enumerate(targets)
+    ]
+    if not tasks:
+        return []
+
+    _, pending = await asyncio.wait(tasks, timeout=overall_timeout)
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    results = []
+    for index, ((name, base_url), task) in enumerate(zip(targets, tasks)):
+        if task in pending:
+            started = started_at.get(index)
+            results.append(DiscoveryResult(
+                name, base_url,
+                error=f"overall discovery deadline of {overall_timeout:.1f}s exceeded",
+                latency=time.perf_counter() - started if started else 0.0,
+            ))
+        else:
+            results.append(task.result())
+
+    return results
@@ -2,78 +2,137 @@
 
 import asyncio
 import logging
-from typing import Dict, List, Optional
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional
 
-import httpx
+import click
 
-from a2a.client import A2ACardResolver, ClientFactory, ClientConfig
+from a2a.client import ClientFactory, ClientConfig
 from a2a.client.helpers import create_text_message_object
 from a2a.types import AgentCard, Role
 from a2a.utils.message import get_message_text
 from a2a.utils.constants import AGENT_CARD_WELL_KNOWN_PATH
 
+from a2a_balancer import BalancedClient
+from a2a_discovery import (
+    DEFAULT_AGENT_TIMEOUT,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_OVERALL_TIMEOUT,
+    discover_agents,
+)
+from a2a_membership import JOIN, LEAVE, REGISTRY_URL, RegistryChange, RegistryFeed
+from a2a_streaming import CallTiming, stream_message
+from a2a_tracing import TracedClient
+from a2a_transport import create_http_client, prewarm
+
+
+# Known A2A ecosystem endpoints; names and roles for registered agents, and
+# the agents to probe when the registry is not reachable
+ECOSYSTEM_AGENTS = [
+    {"name": "A2A Registry", "url": "http://localhost:8000", "role": "discovery"},
+    {"name": "Echo Agent", "url": "http://localhost:9999", "role": "testing"},
+    {"name": "Web Search Agent", "url": "http://localhost:8001", "role": "information"},
+    {"name": "Calculator Agent", "url": "http://localhost:8002", "role": "computation"},
+    {"name": "Coordinator Agent", "url": "http://localhost:8003", "role": "orchestration"},
+]
+
 
 class A2ADiscoveryClient:
     """A client that uses A2A protocol for agent discovery and ecosystem interaction."""
     
-    def __init__(self):
-        self.httpx_client = httpx.AsyncClient()
+    def __init__(self, streaming: bool = False, registry_url: str = REGISTRY_URL):
+        self.streaming = streaming
+        self.timings: Deque[CallTiming] = deque(maxlen=1000)
+        self.httpx_client = create_http_client()
         self.client_config = ClientConfig(
             httpx_client=self.httpx_client,
-            streaming=False,
+            streaming=streaming,
         )
         self.client_factory = ClientFactory(self.client_config)
         self.discovered_agents: Dict[str, dict] = {}
         self.registry_client = None
+        self.registry_feed = RegistryFeed(self.httpx_client, registry_url)
+        self.registry_feed.add_listener(self._on_registry_change)
+    
+    def _add_agent(self, name: str, role: str, card: AgentCard, url: str, discovered_via: str, **details):
+        """Create a client for a discovered agent, balanced over its replicas."""
+        client = TracedClient(BalancedClient(self.client_factory, card, self.httpx_client), name)
+        self.discovered_agents[name] = {
+            'card': card,
+            'client': client,
+            'url': url,
+            'role': role,
+            'discovered_via': discovered_via,
+            **details,
+        }
+        # Special handling for registry
+        if role == 'discovery':
+            self.registry_client = client
     
-    async def discover_a2a_ecosystem(self):
-        """Discover the A2A ecosystem starting with the registry."""
+    def _on_registry_change(self, change: RegistryChange):
+        """Keep the discovered agents in step with the registry's change feed."""
+        known = next((info for info in ECOSYSTEM_AGENTS if info['url'] == change.agent_id), None)
+        name, role = (known['name'], known['role']) if known else (change.card.name, 'agent')
+        if change.kind == LEAVE:
+            if self.discovered_agents.pop(name, None) is not None:
+                logging.info(f"👋 {name} left the A2A ecosystem ({change.reason})")
+            return
+        self._add_agent(name, role, change.card, change.agent_id, 'A2A Registry change feed')
+        if change.kind == JOIN:
+            logging.info(f"✅ {name} joined the A2A ecosystem")
+        else:
+            logging.info(f"🔄 {name} updated its agent card")
+    
+    async def discover_a2a_ecosystem(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        agent_timeout: float = DEFAULT_AGENT_TIMEOUT,
+        overall_timeout: float = DEFAULT_OVERALL_TIMEOUT,
+    ):
+        """Discover the A2A ecosystem from the registry, or by resolving the known agent cards."""
         logging.info("🔍 Starting A2A Ecosystem Discovery...")
         
-        # Known A2A ecosystem endpoints
-        ecosystem_agents = [
-            {"name": "A2A Registry", "url": "http://localhost:8000", "role": "discovery"},
-            {"name": "Echo Agent", "url": "http://localhost:9999", "role": "testing"},
-            {"name": "Web Search Agent", "url": "http://localhost:8001", "role": "information"},
-            {"name": "Calculator Agent", "url": "http://localhost:8002", "role": "computation"},
-            {"name": "Coordinator Agent", "url": "http://localhost:8003", "role": "orchestration"},
-        ]
+        # Agents register with the registry; its change feed keeps the view current from here on
+        await self.registry_feed.start()
+        if await self.registry_feed.wait_ready(agent_timeout):
+            discovered_count = len(self.discovered_agents)
+            logging.info(f"🎉 A2A Discovery Complete: {discovered_count} agents registered with the A2A Registry")
+        else:
+            logging.warning("⚠️  A2A Registry change feed not available, resolving the known agents")
+            discovered_count = await self._discover_known_agents(max_concurrency, agent_timeout, overall_timeout)
+        
+        # Open pooled connections now so the first messages skip TCP setup
+        endpoints = [e.url for agent_info in self.discovered_agents.values() for e in agent_info['client'].endpoints]
+        warmed = await prewarm(self.httpx_client, endpoints)
+        logging.info(f"🔌 Pre-warmed connections to {warmed}/{len(endpoints)} agent endpoints")
+        return discovered_count
+    
+    async def _discover_known_agents(self, max_concurrency: int, agent_timeout: float, overall_timeout: float) -> int:
+        """Resolve every known ecosystem agent card concurrently."""
+        results = await discover_agents(
+            self.httpx_client,
+            [(agent_info['name'], agent_info['url']) for agent_info in ECOSYSTEM_AGENTS],
+            max_concurrency=max_concurrency,
+            agent_timeout=agent_timeout,
+            overall_timeout=overall_timeout,
+        )
         
         discovered_count = 0
         
-        for agent_info in ecosystem_agents:
-            try:
-                logging.info(f"🤖 Discovering {agent_info['name']} via A2A protocol...")
-                
-                # Use A2A Card Resolver to get agent card
-                resolver = A2ACardResolver(
-                    httpx_client=self.httpx_client,
-                    base_url=agent_info['url']
-                )
-                
-                agent_card = await resolver.get_agent_card()
-                client = self.client_factory.create(agent_card)
-                
-                # Store discovered agent with A2A details
-                self.discovered_agents[agent_info['name']] = {
-                    'card': agent_card,
-                    'client': client,
-                    'url': agent_info['url'],
-                    'role': agent_info['role'],
-                    'discovered_via': 'A2A Card Resolution'
-                }
-                
-                # Special handling for registry
-                if agent_info['role'] == 'discovery':
-                    self.registry_client = client
-                
-                discovered_count += 1
-                logging.info(f"✅ {agent_info['name']} discovered successfully")
-                
-            except Exception as e:
-                logging.warning(f"⚠️  Failed to discover {agent_info['name']}: {e}")
+        for agent_info, result in zip(ECOSYSTEM_AGENTS, results):
+            if not result.ok:
+                logging.warning(f"⚠️  Failed to discover {agent_info['name']}: {result.error}")
+                continue
+            
+            self._add_agent(
+                agent_info['name'], agent_info['role'], result.card, agent_info['url'],
+                'A2A Card Resolution', latency_ms=result.latency_ms,
+            )
+            discovered_count += 1
+            logging.info(f"✅ {agent_info['name']} discovered successfully ({result.latency_ms:.1f}ms)")
         
-        logging.info(f"🎉 A2A Discovery Complete: {discovered_count}/{len(ecosystem_agents)} agents discovered")
+        logging.info(f"🎉 A2A Discovery Complete: {discovered_count}/{len(ECOSYSTEM_AGENTS)} agents discovered")
         return discovered_count
     
     async def query_registry_via_a2a(self, query: str) -> str:
@@ -106,8 +165,18 @@ class A2ADiscoveryClient:
         except Exception as e:
             return f"❌ Error querying registry: {e}"
     
-    async def send_a2a_message(self, agent_name: str, message: str) -> str:
-        """Send a message to an agent using A2A protocol."""
+    async def send_a2a_message(
+        self,
+        agent_name: str,
+        message: str,
+        on_event: Optional[Callable[[str], None]] = None,
+    ) -> str:
+        """Send a message to an agent using A2A protocol.
+
+        In streaming mode ``on_event`` receives each partial status or
+        artifact update as it arrives; every call's timing is kept in
+        ``self.timings``.
+        """
         if agent_name not in self.discovered_agents:
             return f"❌ Agent '{agent_name}' not discovered in A2A ecosystem"
         
@@ -121,7 +190,14 @@ class A2ADiscoveryClient:
                 content=message
             )
             
+            if self.streaming:
+                response_text, timing = await stream_message(client, message_obj, agent_name, on_event)
+                self.timings.append(timing)
+                return response_text if response_text else "No response received"
+            
             # Send via A2A protocol
+            timing = CallTiming(agent=agent_name, streaming=False)
+            start = time.perf_counter()
             response_text = ""
             async for event in client.send_message(message_obj):
                 if isinstance(event, tuple):  # (Task, UpdateEvent)
@@ -133,12 +209,23 @@ class A2ADiscoveryClient:
                                 break
                 else:  # Direct Message
                     response_text = get_message_text(event)
+            timing.completion = time.perf_counter() - start
+            timing.first_event, timing.events = timing.completion, 1
+            self.timings.append(timing)
             
             return response_text if response_text else "No response received"
             
         except Exception as e:
             return f"❌ A2A communication error: {e}"
     
+    def _print_event(self, line: str):
+        """Show a partial update while a streamed response is still arriving."""
+        print(f"   ⏳ {line}")
+    
+    def _print_timing(self):
+        if self.timings:
+            print(f"⏱️ {self.timings[-1].summary()}")
+    
     def display_a2a_ecosystem(self):
         """Display the discovered A2A ecosystem."""
         if not self.discovered_agents:
@@ -155,6 +242,12 @@ class A2ADiscoveryClient:
             print(f"  📋 **Description:** {card.description}")
             print(f"  🔗 **Protocol Version:** {getattr(card, 'protocol_version', 'N/A')}")
             print(f"  ⚙️ **Discovery Method:** {agent_info['discovered_via']}")
+            if 'latency_ms' in agent_info:
+                print(f"  ⏱️ **Resolution Latency:** {agent_info['latency_ms']:.1f}ms")
+            replicas = agent_info['client'].endpoints
+            if len(replicas) > 1:
+                healthy = sum(endpoint.healthy for endpoint in replicas)
+                print(f"  🔀 **Replicas:** {healthy}/{len(replicas)} healthy")
             
             # Show A2A capabilities
             print(f"  🔧 **A2A Capabilities:**")
@@ -172,6 +265,8 @@ class A2ADiscoveryClient:
                 print(f"    • ... and {len(card.skills) - 2} more skills")
             
             print()
+        
+        print(f"🔌 **HTTP pool:** {self.httpx_client.pool_metrics.summary()}")
     
     async def run_a2a_demonstration(self):
         """Run a demonstration of A2A protocol features."""
@@ -218,7 +313,7 @@ class A2ADiscoveryClient:
             print(f"💬 A2A Message: '{test_case['message']}'")
             
             # Send A2A message
-            response = await self.send_a2a_message(test_case['agent'], test_case['message'])
+            response = await self.send_a2a_message(test_case['agent'], test_case['message'], self._print_event)
             print(f"🤖 **A2A Response:**")
             
             # Format response nicely
@@ -228,6 +323,7 @@ class A2ADiscoveryClient:
             
             if len(response_lines) > 5:
                 print(f"   ... (truncated, full response has {len(response_lines)} lines)")
+            self._print_timing()
             
             print("\n" + "─" * 60 + "\n")
             
@@ -274,8 +370,9 @@ class A2ADiscoveryClient:
                     
                     if matching_agent:
                         print(f"📤 Sending A2A message to {matching_agent}...")
-                        response = await self.send_a2a_message(matching_agent, message)
+                        response = await self.send_a2a_message(matching_agent, message, self._print_event)
                         print(f"\n🤖 **{matching_agent} Response:**\n{response}")
+                        self._print_timing()
                     else:
                         print(f"❌ Agent '{agent_name}' not found. Available agents:")
                         for name in self.discovered_agents.keys():
@@ -291,14 +388,15 @@ class A2ADiscoveryClient:
     
     async def close(self):
         """Clean up resources."""
+        await self.registry_feed.close()
         await self.httpx_client.aclose()
 
 
-async def main():
+async def main(streaming: bool = False):
     """Main function to run the A2A discovery client."""
     logging.basicConfig(level=logging.INFO)
     
-    client = A2ADiscoveryClient()
+    client = A2ADiscoveryClient(streaming=streaming)
     
     try:
         # Discover A2A ecosystem
@@ -317,5 +415,13 @@ async def main():
         await client.close()
 
 
+@click.command()
+@click.option('--stream', 'streaming', is_flag=True,
+              help='Stream responses over SSE, showing partial updates as they arrive.')
+def cli(streaming):
+    """Runs the A2A discovery client."""
+    asyncio.run(main(streaming))
+
+
 if __name__ == '__main__':
-    asyncio.run(main())
\ No newline at end of file
+    cli()
\ No newline at end of file
@@ -0,0 +1,64 @@
+"""Executor helpers - Shared plumbing for wrapping existing A2A agent executors."""
+
+from typing import List, Optional
+
+from a2a.server.events import EventQueue
+from a2a.types import (
+    Message,
+    Role,
+    TaskArtifactUpdateEvent,
+    TaskState,
+    TaskStatusUpdateEvent,
+)
+from a2a.utils.artifact import get_artifact_text
+from a2a.utils.message import get_message_text
+
+
+class RecordingEventQueue:
+    """Forwards events to a real EventQueue while keeping a copy of each one.
+
+    Lets a wrapping executor see what the wrapped executor produced without
+    changing how the events reach the client.
+    """
+
+    def __init__(self, event_queue: EventQueue):
+        self._event_queue = event_queue
+        self.events: List[object] = []
+
+    async def enqueue_event(self, event) -> None:
+        self.events.append(event)
+        await self._event_queue.enqueue_event(event)
+
+    def __getattr__(self, name):
+        return getattr(self._event_queue, name)
+
+
+def final_text(events: List[object]) -> Optional[str]:
+    """The last text the executor produced, error replies included; None when there was none."""
+    texts = []
+    for event in events:
+        if isinstance(event, Message) and event.role == Role.agent:
+            texts.append(get_message_text(event))
+        elif isinstance(event, TaskStatusUpdateEvent) and event.status.message:
+            texts.append(get_message_text(event.status.message))
+        elif isinstance(event, TaskArtifactUpdateEvent):
+            texts.append(get_artifact_text(event.artifact))
+    texts = [text for text in texts if text]
+    return texts[-1] if texts else None
+
+
+def response_text(events: List[object]) -> Optional[str]:
+    """Extract the agent's final text answer from recorded executor events.
+
+    Returns None when the executor reported a failed task or produced no
+    text, so callers can avoid caching such responses.
+    """
+    for event in events:
+        if isinstance(event, TaskStatusUpdateEvent) and event.status.state in (
+            TaskState.failed, TaskState.rejected, TaskState.canceled
+        ):
+            return None
+    text = final_text(events)
+    if text is None or text.startswith("❌"):
+        return None
+    return text
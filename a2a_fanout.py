@@ -0,0 +1,192 @@
+"""Coordinator fan-out - Runs the parts of a compound query on their agents concurrently."""
+
+import asyncio
+import logging
+import re
+import time
+from dataclasses import dataclass
+from typing import List, Tuple
+
+from a2a.server.agent_execution import AgentExecutor, RequestContext
+from a2a.server.events import EventQueue
+from a2a.server.tasks import TaskUpdater
+from a2a.types import Message, Part, TaskState, TextPart
+from a2a.utils import new_agent_text_message, new_task
+
+from a2a_agent_pool import AgentClientPool
+from a2a_routing import RoutingIndex
+
+
+# Seed keywords for routing sub-tasks to the coordinator's downstream agents.
+SUBTASK_KEYWORDS = {
+    # Substring matches, so no short words like 'pi' or 'math' that hide inside others
+    'calculator': ['calculate', 'compute', 'evaluate', '+', '*', '/', 'sqrt', 'sin(', 'cos(', 'log('],
+    'websearch': ['search', 'what is', 'who is', 'how to', 'latest', 'news', 'lookup', 'look up'],
+    'registry': ['agents', 'registry', 'discover', 'list agents'],
+}
+# "search for calculator agents" is a registry question, not a web search
+SUBTASK_WEIGHTS = {'registry': 1.5}
+DEFAULT_SUBTASK_TIMEOUT = 10.0
+
+# "X and Y", "X; Y", "X, then Y"
+_CONJUNCTION = re.compile(r"\s*(?:;|,?\s+and\s+then\s+|,?\s+and\s+|,?\s+then\s+)\s*", re.IGNORECASE)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SubTask:
+    """One part of a compound query and the agent it goes to."""
+
+    index: int
+    agent: str
+    query: str
+    answer: str = ''
+    status: str = 'pending'
+    elapsed: float = 0.0
+
+
+def build_subtask_index() -> RoutingIndex:
+    index = RoutingIndex()
+    for agent, keywords in SUBTASK_KEYWORDS.items():
+        index.add_keywords(agent, keywords, SUBTASK_WEIGHTS.get(agent, 1.0))
+    index.compile()
+    return index
+
+
+def split_query(query: str, index: RoutingIndex) -> List[Tuple[str, str]]:
+    """Split ``query`` into (agent, sub-query) parts at conjunctions.
+
+    A fragment that no agent matches stays attached to the previous one
+    (or to the next one when it leads the query), as do neighbouring
+    fragments for the same agent, so "sin and cos of pi/4" remains a
+    single calculator request.
+    """
+    parts: List[Tuple[str, str]] = []
+    leading = ''
+    for fragment in _CONJUNCTION.split(query.strip()):
+        if not fragment:
+            continue
+        agent = index.suggest(fragment)
+        if not parts and agent is None:
+            leading = f"{leading} and {fragment}" if leading else fragment
+        elif not parts:
+            parts.append((agent, f"{leading} and {fragment}" if leading else fragment))
+        elif agent is None or agent == parts[-1][0]:
+            previous_agent, previous = parts[-1]
+            parts[-1] = (previous_agent, f"{previous} and {fragment}")
+        else:
+            parts.append((agent, fragment))
+    return parts
+
+
+class FanOutCoordinatorExecutor(AgentExecutor):
+    """Coordinator executor sending the parts of compound queries out in parallel.
+
+    "Calculate 15 + 25 and search for mathematics" becomes one request to
+    the calculator and one to the web search agent, sent concurrently.
+    Each answer is published as an artifact as soon as it arrives, and a
+    sub-task that misses ``subtask_timeout`` is reported as such instead of
+    failing the whole request, so a compound query takes as long as its
+    slowest part. A query routed to a single pooled agent is sent to it
+    directly, so no coordinator hop pays for a card fetch; anything else
+    that does not split into at least two parts for agents in the pool
+    goes to the wrapped executor unchanged. Parts for agents missing from
+    the pool are reported as not run. Agents are reached through the
+    coordinator's long-lived AgentClientPool, and sub-tasks still running
+    when the request ends are cancelled.
+    """
+
+    def __init__(
+        self,
+        executor: AgentExecutor,
+        pool: AgentClientPool,
+        subtask_timeout: float = DEFAULT_SUBTASK_TIMEOUT,
+    ):
+        self.executor = executor
+        self.pool = pool
+        self.subtask_timeout = subtask_timeout
+        self.index = build_subtask_index()
+
+    def plan(self, query: str) -> List[SubTask]:
+        subtasks = [SubTask(i, agent, text) for i, (agent, text) in enumerate(split_query(query, self.index))]
+        for subtask in subtasks:
+            if subtask.agent not in self.pool.agents:
+                subtask.status = 'unavailable'
+                subtask.answer = f"⚠️ No {subtask.agent} agent is available to the coordinator; this part was not run"
+        return subtasks
+
+    async def _run(self, subtask: SubTask) -> SubTask:
+        start = time.perf_counter()
+        try:
+            subtask.answer = await asyncio.wait_for(self.pool.ask(subtask.agent, subtask.query), self.subtask_timeout)
+            subtask.status = 'ok'
+        except asyncio.TimeoutError:
+            subtask.status = 'timeout'
+            subtask.answer = f"⏱️ No answer from the {subtask.agent} agent within {self.subtask_timeout:g}s"
+        except Exception as e:
+            logger.warning(f"Sub-task '{subtask.query}' on {subtask.agent} failed: {e}")
+            subtask.status = 'error'
+            subtask.answer = f"❌ The {subtask.agent} agent failed: {e}"
+        subtask.elapsed = time.perf_counter() - start
+        return subtask
+
+    async def execute(self, context: RequestContext, event_queue: EventQueue) -> None:
+        subtasks = self.plan(context.get_user_input())
+        runnable = [subtask for subtask in subtasks if subtask.status == 'pending']
+        if len(subtasks) == 1 and runnable:
+            subtask = await self._run(runnable[0])
+            await event_queue.enqueue_event(
+                new_agent_text_message(subtask.answer, context.context_id, context.task_id)
+            )
+            return
+        if len(runnable) < 2:
+            await self.executor.execute(context, event_queue)
+            return
+
+        task = context.current_task
+        if task is None:
+            task = new_task(context.message)
+            await event_queue.enqueue_event(task)
+        updater = TaskUpdater(event_queue, task.id, task.context_id)
+
+        def text_message(text: str) -> Message:
+            return updater.new_agent_message([Part(root=TextPart(text=text))])
+
+        async def publish(subtask: SubTask) -> None:
+            await updater.add_artifact(
+                [Part(root=TextPart(text=subtask.answer))],
+                artifact_id=f"subtask-{subtask.index}",
+                name=f"{subtask.agent}: {subtask.query}",
+                metadata={'agent': subtask.agent, 'status': subtask.status, 'elapsed_ms': subtask.elapsed * 1000},
+            )
+
+        agents = ', '.join(subtask.agent for subtask in runnable)
+        await updater.start_work(text_message(f"🔀 Running {len(runnable)} sub-tasks in parallel: {agents}"))
+        for subtask in subtasks:
+            if subtask.status == 'unavailable':
+                await publish(subtask)
+
+        done = 0
+        running = [asyncio.create_task(self._run(subtask)) for subtask in runnable]
+        try:
+            for finished in asyncio.as_completed(running):
+                subtask = await finished
+                done += 1
+                await publish(subtask)
+                await updater.update_status(
+                    TaskState.working,
+                    text_message(f"{'✅' if subtask.status == 'ok' else '⚠️'} {subtask.agent} "
+                                 f"({subtask.elapsed * 1000:.0f}ms) - {done}/{len(runnable)} done"),
+                )
+        finally:
+            # Cancelled or failed requests do not leave sub-tasks running
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+
+        summary = "\n\n".join(f"**{subtask.agent}** - {subtask.query}\n{subtask.answer}" for subtask in subtasks)
+        await updater.complete(text_message(f"🤝 Coordinated {len(runnable)} agents:\n\n{summary}"))
+
+    async def cancel(self, context: RequestContext, event_queue: EventQueue) -> None:
+        await self.executor.cancel(context, event_queue)
@@ -0,0 +1,129 @@
+"""Single-process A2A host - Runs every agent of the ecosystem on one event loop."""
+
+import asyncio
+import importlib
+import logging
+import os
+import sys
+from contextlib import AsyncExitStack, asynccontextmanager
+
+import click
+import uvicorn
+from starlette.applications import Starlette
+from starlette.routing import Mount
+
+from a2a_agent_pool import DOWNSTREAM_AGENTS
+from a2a_task_stores import TASK_STORE_HELP, parse_task_store_spec
+
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+# (agent id, server module, default port) for every agent in the ecosystem.
+HOSTED_AGENTS = [
+    ('registry', 'a2a_registry_server', 8000),
+    ('echo', 'a2a_server', 9999),
+    ('websearch', 'a2a_websearch_server', 8001),
+    ('calculator', 'a2a_calculator_server', 8002),
+    ('coordinator', 'a2a_coordinator_server', 8003),
+]
+
+
+def agent_task_store_spec(spec: str, agent_id: str) -> str:
+    """Give each hosted agent its own task store, e.g. tasks.db -> tasks-echo.db."""
+    kind, target, _ = parse_task_store_spec(spec)
+    if kind != 'sqlite':
+        return spec
+    root, ext = os.path.splitext(target)
+    return spec.replace(target, f"{root}-{agent_id}{ext or '.db'}", 1)
+
+
+def build_agent_apps(host: str, task_store_spec: str, base_url=None) -> list:
+    """Build an isolated app (own card, executor and stores) for every agent.
+
+    Returns (agent id, port, app) tuples. With ``base_url`` every card
+    advertises ``<base_url>/<agent id>/`` for path-prefix mounting. Every
+    agent but the registry registers itself with the hosted registry, and
+    the coordinator's fan-out pool reaches the hosted agents at the same
+    URLs. Queries the coordinator hands to its wrapped app executor still
+    use that executor's own agent URLs.
+    """
+    agent_urls = {
+        agent_id: f"{base_url.rstrip('/')}/{agent_id}" if base_url else f"http://{host}:{port}"
+        for agent_id, _, port in HOSTED_AGENTS
+    }
+    apps = []
+    for agent_id, module_name, port in HOSTED_AGENTS:
+        module = importlib.import_module(module_name)
+        public_url = f"{agent_urls[agent_id]}/" if base_url else None
+        options = {} if agent_id == 'registry' else {'registry_url': agent_urls['registry']}
+        if agent_id == 'coordinator':
+            options['downstream_agents'] = {name: agent_urls[name] for name in DOWNSTREAM_AGENTS}
+        app = module.build_app(
+            host,
+            port,
+            task_store_spec=agent_task_store_spec(task_store_spec, agent_id),
+            public_url=public_url,
+            **options,
+        )
+        apps.append((agent_id, port, app))
+    return apps
+
+
+def build_mounted_app(agent_apps: list) -> Starlette:
+    """Mount every agent app under /<agent id> of a single application."""
+
+    @asynccontextmanager
+    async def lifespan(app):
+        # Mounted apps do not get lifespan events; run theirs from here.
+        async with AsyncExitStack() as stack:
+            for _, _, agent_app in agent_apps:
+                await stack.enter_async_context(agent_app.router.lifespan_context(agent_app))
+            yield
+
+    routes = [Mount(f'/{agent_id}', app=agent_app) for agent_id, _, agent_app in agent_apps]
+    return Starlette(routes=routes, lifespan=lifespan)
+
+
+async def serve_all(servers: list) -> None:
+    """Run several uvicorn servers on the current event loop."""
+    await asyncio.gather(*(server.serve() for server in servers))
+
+
+@click.command()
+@click.option('--host', 'host', default='localhost')
+@click.option('--mount', 'mount', is_flag=True,
+              help='Serve all agents on one port under /<agent> path prefixes instead of one port each.')
+@click.option('--port', 'port', default=8080, help='Port used with --mount.')
+@click.option('--task-store', 'task_store_spec', default='memory', help=TASK_STORE_HELP)
+def main(host, mount, port, task_store_spec):
+    """Hosts the whole A2A ecosystem in one Python process."""
+    try:
+        if mount:
+            base_url = f'http://{host}:{port}'
+            agent_apps = build_agent_apps(host, task_store_spec, base_url=base_url)
+            app = build_mounted_app(agent_apps)
+            logger.info(f"Hosting {len(agent_apps)} agents on {base_url}")
+            for agent_id, _, _ in agent_apps:
+                logger.info(f"  • {agent_id}: {base_url}/{agent_id}/.well-known/agent-card.json")
+            uvicorn.run(app, host=host, port=port)
+            return
+
+        agent_apps = build_agent_apps(host, task_store_spec)
+        servers = [
+            uvicorn.Server(uvicorn.Config(app, host=host, port=agent_port))
+            for _, agent_port, app in agent_apps
+        ]
+        logger.info(f"Hosting {len(agent_apps)} agents in one process")
+        for agent_id, agent_port, _ in agent_apps:
+            logger.info(f"  • {agent_id}: http://{host}:{agent_port}/.well-known/agent-card.json")
+        asyncio.run(serve_all(servers))
+
+    except Exception as e:
+        logger.error(f'An error occurred during host startup: {e}')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
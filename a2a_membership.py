@@ -0,0 +1,523 @@
+"""Registry membership - Lease-based agent registration and a live feed of registry changes."""
+
+import asyncio
+import json
+import logging
+import random
+import re
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, List, Optional, Set
+
+import httpx
+from pydantic import ValidationError
+from sse_starlette.sse import EventSourceResponse, ServerSentEvent
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from a2a.types import AgentCard
+
+from a2a_agent_index import AgentSearchIndex
+
+
+REGISTRY_URL = 'http://localhost:8000'
+REGISTRY_PATH = '/registry'
+DEFAULT_LEASE_TTL = 30.0
+MIN_LEASE_TTL = 5.0
+MAX_LEASE_TTL = 300.0
+SWEEP_INTERVAL = 1.0
+# Changes kept for subscribers that reconnect with Last-Event-ID
+HISTORY_SIZE = 1000
+SUBSCRIBER_QUEUE_SIZE = 256
+KEEPALIVE_INTERVAL = 15.0
+MAX_RECONNECT_DELAY = 30.0
+
+JOIN, LEAVE, UPDATE = 'join', 'leave', 'update'
+
+_KEY_NOISE = frozenset({'a2a', 'agent'})
+
+logger = logging.getLogger(__name__)
+
+
+def agent_key(card: AgentCard) -> str:
+    """Short client-side name of an agent: 'Web Search Agent' -> 'websearch'."""
+    words = [word for word in re.findall(r"[a-z0-9]+", card.name.lower()) if word not in _KEY_NOISE]
+    return ''.join(words) or 'agent'
+
+
+@dataclass
+class RegistryChange:
+    """One entry of the registry's change feed; leaves carry the card that left."""
+
+    seq: int
+    kind: str
+    agent_id: str
+    card: Optional[AgentCard] = None
+    reason: str = ''
+
+    def to_dict(self) -> dict:
+        data = {'seq': self.seq, 'kind': self.kind, 'agent_id': self.agent_id, 'reason': self.reason}
+        if self.card is not None:
+            data['card'] = self.card.model_dump(mode='json', exclude_none=True, by_alias=True)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'RegistryChange':
+        card = AgentCard.model_validate(data['card']) if data.get('card') else None
+        return cls(data['seq'], data['kind'], data['agent_id'], card, data.get('reason', ''))
+
+
+@dataclass
+class Lease:
+    """One agent instance's registration; ``expires_at`` is None for agents that never expire."""
+
+    lease_id: str
+    agent_id: str
+    card: AgentCard
+    ttl: Optional[float]
+    expires_at: Optional[float]
+    instance_id: str = ''
+    registered_at: float = field(default_factory=time.time)
+    renewals: int = 0
+
+
+class AgentMembership:
+    """The registry's set of live agents, kept under leases and published as a change feed.
+
+    Agents register their card with a TTL and renew the lease with
+    heartbeats; a lease that is not renewed in time expires. Replicas of
+    an agent each hold their own lease, under the agent's URL and their
+    instance ID: the agent joins with its first lease and leaves when its
+    last one is gone. Every join, leave and card update updates ``index`` and is
+    published to the subscribers of the SSE feed. A subscriber that
+    reconnects with ``Last-Event-ID`` gets the changes it missed from a
+    bounded history, or a fresh snapshot when it fell too far behind or
+    the ID is from an earlier run of the registry.
+    """
+
+    def __init__(
+        self,
+        index: AgentSearchIndex,
+        default_ttl: float = DEFAULT_LEASE_TTL,
+        sweep_interval: float = SWEEP_INTERVAL,
+        history_size: int = HISTORY_SIZE,
+    ):
+        self.index = index
+        self.default_ttl = default_ttl
+        self.sweep_interval = sweep_interval
+        self.seq = 0
+        # Event IDs are '<epoch>-<seq>', so IDs from before a registry restart are not resumed
+        self.epoch = uuid.uuid4().hex[:8]
+        self._leases: Dict[str, Lease] = {}
+        # agent_id -> instance_id -> lease_id
+        self._by_agent: Dict[str, Dict[str, str]] = {}
+        self._cards: Dict[str, AgentCard] = {}
+        self._history: Deque[RegistryChange] = deque(maxlen=history_size)
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._sweeper: Optional[asyncio.Task] = None
+        self.changes = {JOIN: 0, LEAVE: 0, UPDATE: 0}
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._leases)
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscribers)
+
+    def _publish(self, kind: str, agent_id: str, card: AgentCard, reason: str = '') -> RegistryChange:
+        self.seq += 1
+        change = RegistryChange(self.seq, kind, agent_id, card, reason)
+        self._history.append(change)
+        self.changes[kind] += 1
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(change)
+            except asyncio.QueueFull:
+                # A subscriber this far behind reconnects and catches up from the history
+                self._drop_subscriber(queue)
+        return change
+
+    def _drop_subscriber(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(None)
+
+    def register(
+        self, card: AgentCard, ttl: Optional[float] = None, static: bool = False, instance_id: str = ''
+    ) -> Lease:
+        """Register ``card`` or renew the lease ``instance_id`` already holds under the card's URL.
+
+        Static registrations (the registry's own card) never expire.
+        """
+        agent_id = self.index.agent_id(card)
+        ttl = None if static else min(max(ttl or self.default_ttl, MIN_LEASE_TTL), MAX_LEASE_TTL)
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        instances = self._by_agent.setdefault(agent_id, {})
+        lease = self._leases.get(instances.get(instance_id, ''))
+        if lease is None:
+            lease = Lease(uuid.uuid4().hex, agent_id, card, ttl, expires_at, instance_id)
+            self._leases[lease.lease_id] = lease
+            instances[instance_id] = lease.lease_id
+            if len(instances) == 1:
+                self._cards[agent_id] = card
+                self.index.add(card)
+                self._publish(JOIN, agent_id, card)
+                logger.info(f"➕ {card.name} joined at {agent_id}")
+                return lease
+        else:
+            lease.ttl, lease.expires_at = ttl, expires_at
+            lease.renewals += 1
+            lease.card = card
+        if card != self._cards[agent_id]:
+            self._cards[agent_id] = card
+            self.index.add(card)
+            self._publish(UPDATE, agent_id, card)
+            logger.info(f"🔄 {card.name} updated its card")
+        return lease
+
+    def renew(self, lease_id: str) -> Optional[Lease]:
+        """Extend a lease by its TTL; None when it is unknown or already expired."""
+        lease = self._leases.get(lease_id)
+        if lease is None:
+            return None
+        if lease.ttl is not None:
+            lease.expires_at = time.monotonic() + lease.ttl
+        lease.renewals += 1
+        return lease
+
+    def deregister(self, lease_id: str, reason: str = 'deregistered') -> Optional[Lease]:
+        """Drop a lease; the agent leaves once none of its instances holds one."""
+        lease = self._leases.pop(lease_id, None)
+        if lease is None:
+            return None
+        instances = self._by_agent[lease.agent_id]
+        del instances[lease.instance_id]
+        if instances:
+            logger.info(f"➖ An instance of {lease.card.name} left ({reason}); {len(instances)} remain")
+            return lease
+        del self._by_agent[lease.agent_id]
+        card = self._cards.pop(lease.agent_id)
+        self.index.remove(lease.agent_id)
+        self._publish(LEAVE, lease.agent_id, card, reason)
+        logger.info(f"➖ {card.name} left ({reason})")
+        return lease
+
+    def expire(self, now: Optional[float] = None) -> List[Lease]:
+        """Drop every lease that lapsed."""
+        now = time.monotonic() if now is None else now
+        lapsed = [lease.lease_id for lease in self._leases.values()
+                  if lease.expires_at is not None and lease.expires_at <= now]
+        self.expirations += len(lapsed)
+        return [self.deregister(lease_id, 'lease expired') for lease_id in lapsed]
+
+    def snapshot(self) -> dict:
+        now = time.monotonic()
+        agents = []
+        for agent_id, instances in self._by_agent.items():
+            leases = [self._leases[lease_id] for lease_id in instances.values()]
+            expiring = [lease.expires_at for lease in leases]
+            agents.append({
+                'agent_id': agent_id,
+                'card': self._cards[agent_id].model_dump(mode='json', exclude_none=True, by_alias=True),
+                'instances': len(leases),
+                'expires_in': None if None in expiring else round(max(expiring) - now, 1),
+            })
+        return {'seq': self.seq, 'agents': agents}
+
+    def changes_since(self, seq: int) -> Optional[List[RegistryChange]]:
+        """The changes after ``seq``, or None when some of them are no longer in the history."""
+        if seq > self.seq:
+            return None
+        if seq == self.seq:
+            return []
+        if not self._history or self._history[0].seq > seq + 1:
+            return None
+        return [change for change in self._history if change.seq > seq]
+
+    async def start(self) -> None:
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.create_task(self._sweep_loop())
+
+    async def _sweep_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            self.expire()
+
+    async def close(self) -> None:
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+        for queue in list(self._subscribers):
+            self._drop_subscriber(queue)
+
+    def _event(self, kind: str, seq: int, data: dict) -> ServerSentEvent:
+        return ServerSentEvent(json.dumps(data, separators=(',', ':')), event=kind, id=f"{self.epoch}-{seq}")
+
+    def _resume_from(self, last_event_id: Optional[str]) -> Optional[int]:
+        epoch, _, seq = (last_event_id or '').partition('-')
+        return int(seq) if epoch == self.epoch and seq.isdigit() else None
+
+    async def _events(self, queue: asyncio.Queue, since: Optional[int]):
+        try:
+            backlog = None if since is None else self.changes_since(since)
+            if backlog is None:
+                snapshot = self.snapshot()
+                sent = snapshot['seq']
+                yield self._event('snapshot', sent, snapshot)
+            else:
+                sent = since
+                for change in backlog:
+                    sent = change.seq
+                    yield self._event(change.kind, change.seq, change.to_dict())
+            while True:
+                change = await queue.get()
+                if change is None:
+                    return
+                # Changes queued while the snapshot or backlog was sent are already covered
+                if change.seq > sent:
+                    sent = change.seq
+                    yield self._event(change.kind, change.seq, change.to_dict())
+        finally:
+            self._subscribers.discard(queue)
+
+    def subscribe(self, last_event_id: Optional[str] = None) -> EventSourceResponse:
+        """SSE response streaming the change feed from a snapshot, or resuming after ``last_event_id``."""
+        # Subscribe before reading the snapshot so no change falls in between
+        queue: asyncio.Queue = asyncio.Queue(SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.add(queue)
+        # EventSourceResponse sends keep-alive pings and ends the stream when the server shuts down
+        return EventSourceResponse(
+            self._events(queue, self._resume_from(last_event_id)), ping=KEEPALIVE_INTERVAL, headers={'X-Accel-Buffering': 'no'}
+        )
+
+    def routes(self, prefix: str = REGISTRY_PATH) -> List[Route]:
+        """HTTP API: register, heartbeat, deregister, list and subscribe to changes."""
+
+        async def register(request: Request) -> Response:
+            try:
+                body = await request.json()
+                card = AgentCard.model_validate(body['card'])
+                ttl = float(body['ttl']) if body.get('ttl') is not None else None
+                instance_id = str(body.get('instance_id') or '')
+            except (ValueError, KeyError, TypeError, ValidationError) as e:
+                return JSONResponse({'error': f"Invalid registration: {e}"}, status_code=400)
+            lease = self.register(card, ttl, instance_id=instance_id)
+            return JSONResponse(
+                {'lease_id': lease.lease_id, 'agent_id': lease.agent_id, 'ttl': lease.ttl},
+                status_code=201 if lease.renewals == 0 else 200,
+            )
+
+        async def heartbeat(request: Request) -> Response:
+            lease = self.renew(request.path_params['lease_id'])
+            if lease is None:
+                # The agent registers again on 404
+                return JSONResponse({'error': 'Unknown or expired lease'}, status_code=404)
+            return JSONResponse({'lease_id': lease.lease_id, 'agent_id': lease.agent_id, 'ttl': lease.ttl})
+
+        async def deregister(request: Request) -> Response:
+            if self.deregister(request.path_params['lease_id']) is None:
+                return JSONResponse({'error': 'Unknown or expired lease'}, status_code=404)
+            return Response(status_code=204)
+
+        async def agents(request: Request) -> Response:
+            return JSONResponse(self.snapshot())
+
+        async def events(request: Request) -> Response:
+            return self.subscribe(request.headers.get('last-event-id'))
+
+        return [
+            Route(f'{prefix}/leases', register, methods=['POST']),
+            Route(f'{prefix}/leases/{{lease_id}}', heartbeat, methods=['PUT']),
+            Route(f'{prefix}/leases/{{lease_id}}', deregister, methods=['DELETE']),
+            Route(f'{prefix}/agents', agents, methods=['GET']),
+            Route(f'{prefix}/events', events, methods=['GET']),
+        ]
+
+
+class RegistryLease:
+    """Keeps an agent registered with the Agent Registry for as long as it runs.
+
+    ``start`` registers ``card`` in the background, retrying until the
+    registry is reachable, then renews the lease every third of its TTL.
+    A lease the registry no longer knows (it restarted, or the lease
+    lapsed) is registered again. Each RegistryLease registers under its
+    own instance ID, so replicas serving the same card hold separate
+    leases. ``close`` deregisters, so the instance leaves the registry
+    right away instead of when its lease expires.
+    """
+
+    def __init__(
+        self,
+        httpx_client: httpx.AsyncClient,
+        registry_url: str,
+        card: AgentCard,
+        ttl: float = DEFAULT_LEASE_TTL,
+    ):
+        self.httpx_client = httpx_client
+        self.base_url = f"{registry_url.rstrip('/')}{REGISTRY_PATH}"
+        self.card = card
+        self.ttl = ttl
+        self.instance_id = uuid.uuid4().hex
+        self.lease_id: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _register(self) -> None:
+        response = await self.httpx_client.post(
+            f"{self.base_url}/leases",
+            json={
+                'card': self.card.model_dump(mode='json', exclude_none=True, by_alias=True),
+                'ttl': self.ttl,
+                'instance_id': self.instance_id,
+            },
+        )
+        response.raise_for_status()
+        lease = response.json()
+        self.lease_id = lease['lease_id']
+        self.ttl = lease['ttl'] or self.ttl
+        logger.info(f"📇 Registered {self.card.name} with the registry (lease {self.ttl:g}s)")
+
+    async def _heartbeat(self) -> bool:
+        response = await self.httpx_client.put(f"{self.base_url}/leases/{self.lease_id}")
+        if response.status_code == 404:
+            logger.info(f"Lease of {self.card.name} is gone; registering again")
+            self.lease_id = None
+            return False
+        response.raise_for_status()
+        return True
+
+    async def _run(self) -> None:
+        failures = 0
+        while True:
+            try:
+                if self.lease_id is None or not await self._heartbeat():
+                    await self._register()
+                failures = 0
+                await asyncio.sleep(self.ttl / 3)
+            except (httpx.HTTPError, ValueError, KeyError) as e:
+                failures += 1
+                if failures == 1:
+                    logger.info(f"Agent Registry not reachable for {self.card.name}, retrying: {e}")
+                # Retry well within the TTL while a lease is held
+                await asyncio.sleep(min(2 ** failures * random.random(), self.ttl / 3))
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+        if self.lease_id is None:
+            return
+        try:
+            await self.httpx_client.delete(f"{self.base_url}/leases/{self.lease_id}", timeout=2.0)
+        except httpx.HTTPError as e:
+            logger.debug(f"Could not deregister {self.card.name}: {e}")
+        self.lease_id = None
+
+
+class RegistryFeed:
+    """Client-side view of the registry's agents, kept current by its change feed.
+
+    Listeners are called with every RegistryChange. Snapshots (on first
+    connect, or after falling too far behind) are turned into the joins,
+    leaves and updates against the current view, so listeners only ever
+    see deltas. The connection is re-established with ``Last-Event-ID``
+    after errors.
+    """
+
+    def __init__(self, httpx_client: httpx.AsyncClient, registry_url: str = REGISTRY_URL):
+        self.httpx_client = httpx_client
+        self.url = f"{registry_url.rstrip('/')}{REGISTRY_PATH}/events"
+        self.agents: Dict[str, AgentCard] = {}
+        self.seq: Optional[int] = None
+        self.last_event_id: Optional[str] = None
+        self._listeners: List[Callable[[RegistryChange], None]] = []
+        self._ready = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def add_listener(self, listener: Callable[[RegistryChange], None]) -> None:
+        self._listeners.append(listener)
+
+    async def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def wait_ready(self, timeout: float) -> bool:
+        """Wait until the first snapshot arrived; False when the registry did not answer in time."""
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def _notify(self, change: RegistryChange) -> None:
+        for listener in self._listeners:
+            try:
+                listener(change)
+            except Exception:
+                logger.exception(f"Registry feed listener failed on {change.kind} of {change.agent_id}")
+
+    def apply(self, event: str, data: dict) -> None:
+        if event == 'snapshot':
+            seq = data['seq']
+            cards = {agent['agent_id']: AgentCard.model_validate(agent['card']) for agent in data['agents']}
+            for agent_id in [agent_id for agent_id in self.agents if agent_id not in cards]:
+                self._notify(RegistryChange(seq, LEAVE, agent_id, self.agents.pop(agent_id), 'not in snapshot'))
+            for agent_id, card in cards.items():
+                previous = self.agents.get(agent_id)
+                if previous != card:
+                    self.agents[agent_id] = card
+                    self._notify(RegistryChange(seq, JOIN if previous is None else UPDATE, agent_id, card))
+            self.seq = seq
+            self._ready.set()
+            return
+
+        change = RegistryChange.from_dict(data)
+        if change.kind == LEAVE:
+            self.agents.pop(change.agent_id, None)
+        else:
+            self.agents[change.agent_id] = change.card
+        self.seq = change.seq
+        self._notify(change)
+
+    async def _listen(self) -> None:
+        headers = {'Accept': 'text/event-stream'}
+        if self.last_event_id:
+            headers['Last-Event-ID'] = self.last_event_id
+        timeout = httpx.Timeout(5.0, read=KEEPALIVE_INTERVAL * 3)
+        async with self.httpx_client.stream('GET', self.url, headers=headers, timeout=timeout) as response:
+            response.raise_for_status()
+            event, event_id, data = 'message', None, []
+            async for line in response.aiter_lines():
+                if not line:
+                    if data:
+                        self.apply(event, json.loads('\n'.join(data)))
+                        self.last_event_id = event_id or self.last_event_id
+                    event, event_id, data = 'message', None, []
+                elif line.startswith('event:'):
+                    event = line[6:].strip()
+                elif line.startswith('id:'):
+                    event_id = line[3:].strip()
+                elif line.startswith('data:'):
+                    data.append(line[5:].strip())
+
+    async def _run(self) -> None:
+        failures = 0
+        while True:
+            try:
+                await self._listen()
+                failures = 0
+            except (httpx.HTTPError, ValueError, KeyError) as e:
+                failures += 1
+                if failures == 1:
+                    logger.info(f"Registry change feed at {self.url} unavailable, reconnecting: {e}")
+            await asyncio.sleep(min(2 ** failures * random.random(), MAX_RECONNECT_DELAY))
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
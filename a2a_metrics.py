@@ -0,0 +1,436 @@
+"""Server metrics - Prometheus text-format counters, gauges and histograms for A2A servers."""
+
+import json
+import logging
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+from a2a.server.agent_execution import AgentExecutor, RequestContext
+from a2a.server.events import EventQueue
+
+
+METRICS_PATH = '/metrics'
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# JSON-RPC methods of the A2A protocol; anything else is recorded as 'other'
+# so clients cannot create label series at will.
+A2A_METHODS = frozenset({
+    'message/send',
+    'message/stream',
+    'tasks/get',
+    'tasks/cancel',
+    'tasks/resubscribe',
+    'tasks/pushNotificationConfig/set',
+    'tasks/pushNotificationConfig/get',
+    'tasks/pushNotificationConfig/list',
+    'tasks/pushNotificationConfig/delete',
+    'agent/getAuthenticatedExtendedCard',
+})
+# Bodies are buffered only this far to find the method
+DEFAULT_MAX_BODY = 1024 * 1024
+
+logger = logging.getLogger(__name__)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + '}'
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """A named metric family whose samples are keyed by label values."""
+
+    kind = 'untyped'
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def samples(self) -> Iterable[Tuple[str, Dict[str, str], float]]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        for key, value in self._values.items():
+            yield self.name, dict(zip(self.labelnames, key)), value
+
+
+class Gauge(Counter):
+    kind = 'gauge'
+
+    def set(self, value: float, **labels) -> None:
+        self._values[self._key(labels)] = value
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        # Per-bucket counts followed by the sum; cumulated when rendered
+        series = self._series.setdefault(key, [0] * len(self.buckets) + [0.0])
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[i] += 1
+                break
+        series[-1] += value
+
+    def samples(self):
+        for key, series in self._series.items():
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                yield f"{self.name}_bucket", {**labels, 'le': _format_value(bound)}, cumulative
+            yield f"{self.name}_sum", labels, series[-1]
+            yield f"{self.name}_count", labels, cumulative
+
+
+class CallbackMetric(Metric):
+    """Metric read at scrape time from ``callback``, which returns {label values: value}.
+
+    For numbers another component already keeps, e.g. a store's size or
+    a sender's delivery counters.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        callback: Callable[[], Dict[tuple, float]],
+        labelnames: Sequence[str] = (),
+        kind: str = 'gauge',
+    ):
+        super().__init__(name, help, labelnames)
+        self.callback = callback
+        self.kind = kind
+
+    def samples(self):
+        try:
+            values = self.callback()
+        except Exception:
+            logger.exception(f"Collecting {self.name} failed")
+            return
+        for key, value in values.items():
+            if value is not None:
+                yield self.name, dict(zip(self.labelnames, key)), value
+
+
+class MetricsRegistry:
+    """A set of metrics rendered together; ``const_labels`` are added to every sample."""
+
+    def __init__(self, const_labels: Optional[Dict[str, str]] = None):
+        self.const_labels = const_labels or {}
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help, labelnames, buckets))
+
+    def callback_gauge(self, name: str, help: str, callback, labelnames: Sequence[str] = ()) -> CallbackMetric:
+        return self.register(CallbackMetric(name, help, callback, labelnames))
+
+    def callback_counter(self, name: str, help: str, callback, labelnames: Sequence[str] = ()) -> CallbackMetric:
+        return self.register(CallbackMetric(name, help, callback, labelnames, kind='counter'))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels({**self.const_labels, **labels})} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+
+def task_store_size(task_store) -> Optional[int]:
+    """Entries held by a task store: its count() when it has one, else the SDK in-memory dict."""
+    if hasattr(task_store, 'count'):
+        return task_store.count()
+    tasks = getattr(task_store, 'tasks', None)
+    return len(tasks) if tasks is not None else None
+
+
+class AgentMetrics:
+    """Metrics of one agent server.
+
+    Covers JSON-RPC requests by method, open SSE streams, executor runs,
+    the task store and the push notification pipeline. Each server (and
+    each uvicorn worker) keeps its own registry.
+    """
+
+    def __init__(self, agent: str):
+        self.registry = registry = MetricsRegistry({'agent': agent})
+        self.requests = registry.counter(
+            'a2a_jsonrpc_requests_total', 'JSON-RPC requests by method and HTTP status.', ['method', 'status'])
+        self.request_duration = registry.histogram(
+            'a2a_jsonrpc_request_duration_seconds',
+            'Time from request to the end of the response (the whole stream for SSE).', ['method'])
+        self.requests_in_flight = registry.gauge(
+            'a2a_jsonrpc_requests_in_flight', 'JSON-RPC requests being served.', ['method'])
+        self.sse_subscribers = registry.gauge(
+            'a2a_sse_subscribers', 'Open server-sent event streams.', ['method'])
+        self.executor_duration = registry.histogram(
+            'a2a_executor_duration_seconds', 'Agent executor run time by operation and outcome.',
+            ['operation', 'outcome'])
+        self.tasks_in_flight = registry.gauge(
+            'a2a_executor_tasks_in_flight', 'Tasks the agent executor is working on.')
+        self.tasks_in_flight.set(0)
+
+    def track_task_store(self, task_store) -> None:
+        self.registry.callback_gauge(
+            'a2a_task_store_entries', 'Tasks held by the task store.',
+            lambda: {(): task_store_size(task_store)})
+
+    def track_push_sender(self, push_sender) -> None:
+        """Export the queue depth and outcome counts of a sender with a stats() method."""
+        if not hasattr(push_sender, 'stats'):
+            return
+
+        def outcomes() -> Dict[tuple, float]:
+            stats = push_sender.stats()
+            values = {(outcome, ''): stats[outcome] for outcome in ('delivered', 'retried', 'coalesced')}
+            for reason, count in stats['dead_letters'].items():
+                values[('dead_letter', reason)] = count
+            return values
+
+        self.registry.callback_gauge(
+            'a2a_push_queue_depth', 'Push notifications waiting for delivery.',
+            lambda: {(): push_sender.stats()['queued']})
+        self.registry.callback_counter(
+            'a2a_push_notifications_total', 'Push notification outcomes.', outcomes, ['outcome', 'reason'])
+
+    def track_agent_pool(self, pool) -> None:
+        """Export the size and churn of a coordinator's downstream client pool."""
+        self.registry.callback_gauge(
+            'a2a_downstream_agents', 'Downstream agents with a pooled client.',
+            lambda: {(): len(pool.stats())})
+        self.registry.callback_counter(
+            'a2a_downstream_pool_events_total', 'Card resolutions and evictions in the downstream pool.',
+            lambda: {('resolved',): pool.resolutions, ('evicted',): pool.evictions}, ['event'])
+
+    def track_cache(self, cache_name: str, cache) -> None:
+        """Export the lookups and size of a result cache with a stats() method, for sizing it."""
+        results = {'hits': 'hit', 'misses': 'miss', 'coalesced': 'coalesced'}
+
+        def lookups() -> Dict[tuple, float]:
+            stats = cache.stats()
+            return {(cache_name, label): stats[key] for key, label in results.items() if key in stats}
+
+        def entries() -> Dict[tuple, float]:
+            stats = cache.stats()
+            return {(cache_name,): stats.get('size', stats.get('entries', 0))}
+
+        self.registry.callback_counter(
+            'a2a_cache_lookups_total', 'Result cache lookups by outcome.', lookups, ['cache', 'result'])
+        self.registry.callback_gauge(
+            'a2a_cache_entries', 'Entries held by the result cache.', entries, ['cache'])
+        if 'bytes' in cache.stats():
+            self.registry.callback_gauge(
+                'a2a_cache_bytes', 'Approximate bytes held by the result cache.',
+                lambda: {(cache_name,): cache.stats()['bytes']}, ['cache'])
+
+    def track_agent_index(self, index) -> None:
+        self.registry.callback_gauge(
+            'a2a_registry_indexed_agents', 'Agents in the registry search index.', lambda: {(): len(index)})
+
+    def track_membership(self, membership) -> None:
+        """Export registered agents, change feed subscribers and membership changes of a registry."""
+        self.registry.callback_gauge(
+            'a2a_registry_leases', 'Leases held with the registry, one per agent instance.', lambda: {(): len(membership)})
+        self.registry.callback_gauge(
+            'a2a_registry_feed_subscribers', 'Open connections to the registry change feed.',
+            lambda: {(): membership.subscribers})
+        self.registry.callback_counter(
+            'a2a_registry_changes_total', 'Joins, leaves and card updates published by the registry.',
+            lambda: {(kind,): count for kind, count in membership.changes.items()}, ['kind'])
+        self.registry.callback_counter(
+            'a2a_registry_expired_leases_total', 'Registrations removed because their lease lapsed.',
+            lambda: {(): membership.expirations})
+
+    def instrument_executor(self, executor: AgentExecutor) -> AgentExecutor:
+        return InstrumentedAgentExecutor(executor, self)
+
+    def route(self, path: str = METRICS_PATH) -> Route:
+        async def metrics(request: Request) -> Response:
+            return Response(self.registry.render(), media_type=CONTENT_TYPE)
+
+        return Route(path, metrics, methods=['GET'])
+
+
+class InstrumentedAgentExecutor(AgentExecutor):
+    """Wraps an executor to time its runs and count tasks in progress."""
+
+    def __init__(self, executor: AgentExecutor, metrics: AgentMetrics):
+        self.executor = executor
+        self.metrics = metrics
+
+    async def _timed(self, operation: str, call) -> None:
+        start = time.perf_counter()
+        outcome = 'error'
+        try:
+            await call
+            outcome = 'ok'
+        finally:
+            self.metrics.executor_duration.observe(
+                time.perf_counter() - start, operation=operation, outcome=outcome)
+
+    async def execute(self, context: RequestContext, event_queue: EventQueue) -> None:
+        self.metrics.tasks_in_flight.inc()
+        try:
+            await self._timed('execute', self.executor.execute(context, event_queue))
+        finally:
+            self.metrics.tasks_in_flight.dec()
+
+    async def cancel(self, context: RequestContext, event_queue: EventQueue) -> None:
+        await self._timed('cancel', self.executor.cancel(context, event_queue))
+
+
+def _jsonrpc_method(body: bytes) -> str:
+    try:
+        method = json.loads(body).get('method')
+    except (ValueError, AttributeError):
+        return 'invalid'
+    if not isinstance(method, str):
+        return 'invalid'
+    return method if method in A2A_METHODS else 'other'
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording every JSON-RPC POST by method.
+
+    The request body is read once to find the method and then replayed to
+    the app; bodies over ``max_body`` bytes are streamed on to the app
+    after that many bytes and recorded as 'other'. A response with an ``text/event-stream`` content type counts
+    as an SSE subscriber until it ends. POSTs under ``exclude_paths``
+    (non-JSON-RPC endpoints) are passed through untracked.
+    """
+
+    def __init__(
+        self,
+        app,
+        metrics: AgentMetrics,
+        exclude_paths: Sequence[str] = (),
+        max_body: int = DEFAULT_MAX_BODY,
+    ):
+        self.app = app
+        self.metrics = metrics
+        self.exclude_paths = tuple(exclude_paths)
+        self.max_body = max_body
+
+    def _excluded(self, scope) -> bool:
+        if not self.exclude_paths:
+            return False
+        path, root_path = scope['path'], scope.get('root_path', '')
+        # Under a Mount the path may still carry the mount prefix
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path):]
+        return path.startswith(self.exclude_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['method'] != 'POST' or self._excluded(scope):
+            await self.app(scope, receive, send)
+            return
+
+        chunks = []
+        size = 0
+        complete = False
+        while size <= self.max_body:
+            message = await receive()
+            if message['type'] != 'http.request':
+                # Client went away before sending the whole body
+                await self.app(scope, receive, send)
+                return
+            chunks.append(message.get('body', b''))
+            size += len(chunks[-1])
+            if not message.get('more_body', False):
+                complete = True
+                break
+        body = b''.join(chunks)
+        replayed = False
+
+        async def replay():
+            nonlocal replayed
+            if not replayed:
+                replayed = True
+                return {'type': 'http.request', 'body': body, 'more_body': not complete}
+            return await receive()
+
+        metrics = self.metrics
+        method = _jsonrpc_method(body) if complete else 'other'
+        status = 500
+        streaming = False
+
+        async def record(message):
+            nonlocal status, streaming
+            if message['type'] == 'http.response.start':
+                status = message['status']
+                content_type = dict(message.get('headers') or []).get(b'content-type', b'')
+                if content_type.startswith(b'text/event-stream'):
+                    streaming = True
+                    metrics.sse_subscribers.inc(method=method)
+            await send(message)
+
+        metrics.requests_in_flight.inc(method=method)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, replay, record)
+        finally:
+            metrics.requests_in_flight.dec(method=method)
+            if streaming:
+                metrics.sse_subscribers.dec(method=method)
+            metrics.requests.inc(method=method, status=status)
+            metrics.request_duration.observe(time.perf_counter() - start, method=method)
@@ -2,49 +2,85 @@
 
 import asyncio
 import logging
-from typing import Dict, List, Optional
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional
 
-import httpx
+import click
 
-from a2a.client import A2ACardResolver, ClientFactory, ClientConfig
+from a2a.client import ClientFactory, ClientConfig
 from a2a.client.helpers import create_text_message_object
 from a2a.types import AgentCard, Role
 from a2a.utils.message import get_message_text
 from a2a.utils.constants import AGENT_CARD_WELL_KNOWN_PATH
 
+from a2a_balancer import BalancedClient
+from a2a_card_cache import default_card_cache
+from a2a_discovery import (
+    DEFAULT_AGENT_TIMEOUT,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_OVERALL_TIMEOUT,
+    discover_agents,
+)
+from a2a_membership import JOIN, LEAVE, REGISTRY_URL, RegistryChange, RegistryFeed, agent_key
+from a2a_routing import RoutingIndex
+from a2a_streaming import CallTiming, stream_message
+from a2a_tracing import TracedClient
+from a2a_transport import create_http_client, prewarm
+
+
+# Hand-tuned keywords kept on top of what the agent cards advertise.
+AGENT_KEYWORDS = {
+    'echo': ['echo', 'repeat', 'say back', 'test'],
+    'calculator': ['calculate', 'math', 'compute', '+', '-', '*', '/', 'sqrt', 'sin', 'cos', 'pi', 'equation', 'formula'],
+    'websearch': ['search', 'find', 'what is', 'who is', 'where is', 'how to', 'latest', 'news', 'information', 'lookup']
+}
+# Registered agents that answer about or on behalf of the others, not routing targets.
+UNROUTED_AGENTS = {'registry', 'coordinator'}
+
 
 class MultiAgentClient:
     """A client that can discover and interact with multiple A2A agents."""
     
-    def __init__(self):
+    def __init__(self, streaming: bool = False, registry_url: str = REGISTRY_URL):
         self.agents: Dict[str, dict] = {}
-        self.httpx_client = httpx.AsyncClient()
+        self.streaming = streaming
+        self.timings: Deque[CallTiming] = deque(maxlen=1000)
+        self.httpx_client = create_http_client()
         self.client_config = ClientConfig(
             httpx_client=self.httpx_client,
-            streaming=False,
+            streaming=streaming,
         )
         self.client_factory = ClientFactory(self.client_config)
+        self.routing_index = RoutingIndex()
+        self.registry_feed = RegistryFeed(self.httpx_client, registry_url)
+        self.registry_feed.add_listener(self._on_registry_change)
+        self._closing = set()
+    
+    def _index_agent(self, agent_name: str, agent_card: AgentCard):
+        """Add an agent's card skills and seed keywords to the routing index."""
+        self.routing_index.remove_agent(agent_name)
+        self.routing_index.add_keywords(agent_name, AGENT_KEYWORDS.get(agent_name, []))
+        self.routing_index.add_agent_card(agent_name, agent_card)
     
     async def discover_agent(self, base_url: str, agent_name: str) -> Optional[AgentCard]:
         """Discover an agent by fetching its agent card."""
         try:
-            resolver = A2ACardResolver(
-                httpx_client=self.httpx_client,
-                base_url=base_url,
-            )
-            
             logging.info(f"Discovering {agent_name} at {base_url}")
-            agent_card = await resolver.get_agent_card()
+            agent_card = await default_card_cache().get_agent_card(self.httpx_client, base_url)
             
-            # Create client for this agent
-            client = self.client_factory.create(agent_card)
+            # Create client for this agent, balanced over its replicas
+            client = TracedClient(BalancedClient(self.client_factory, agent_card, self.httpx_client), agent_name)
             
             # Store agent info
+            self._retire(self.agents.get(agent_name))
             self.agents[agent_name] = {
                 'card': agent_card,
                 'client': client,
                 'base_url': base_url
             }
+            self._index_agent(agent_name, agent_card)
+            self.routing_index.compile()
             
             logging.info(f"Successfully discovered {agent_name}: {agent_card.name}")
             return agent_card
@@ -53,19 +89,98 @@ class MultiAgentClient:
             logging.error(f"Failed to discover {agent_name} at {base_url}: {e}")
             return None
     
-    async def discover_all_agents(self):
-        """Discover all known agents."""
+    def _retire(self, entry: Optional[dict]) -> None:
+        """Close the client of a replaced or departed agent; calls already using it still finish."""
+        if entry is None:
+            return
+        closing = asyncio.create_task(entry['client'].close())
+        self._closing.add(closing)
+        closing.add_done_callback(self._closing.discard)
+    
+    def _on_registry_change(self, change: RegistryChange):
+        """Keep the routable agents in step with the registry's change feed."""
+        agent_name = agent_key(change.card)
+        if agent_name in UNROUTED_AGENTS:
+            return
+        if change.kind == LEAVE:
+            entry = self.agents.pop(agent_name, None)
+            if entry is not None:
+                self._retire(entry)
+                self.routing_index.remove_agent(agent_name)
+                self.routing_index.compile()
+                logging.info(f"👋 {agent_name} left ({change.reason})")
+            return
+        self._retire(self.agents.get(agent_name))
+        self.agents[agent_name] = {
+            'card': change.card,
+            'client': TracedClient(
+                BalancedClient(self.client_factory, change.card, self.httpx_client), agent_name
+            ),
+            'base_url': change.agent_id,
+        }
+        self._index_agent(agent_name, change.card)
+        self.routing_index.compile()
+        logging.info(f"{'✅' if change.kind == JOIN else '🔄'} {agent_name}: {change.card.name} at {change.agent_id}")
+    
+    async def discover_all_agents(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        agent_timeout: float = DEFAULT_AGENT_TIMEOUT,
+        overall_timeout: float = DEFAULT_OVERALL_TIMEOUT,
+    ) -> int:
+        """Discover the agents registered with the registry, or the known agents if it is not reachable.
+
+        Registry joins and leaves keep updating ``self.agents`` afterwards.
+        Returns the number of agents discovered.
+        """
+        logging.info("🔍 Discovering available agents...")
+        
+        await self.registry_feed.start()
+        if await self.registry_feed.wait_ready(agent_timeout):
+            logging.info(f"✅ Discovery complete. Found {len(self.agents)} agents registered with the registry.")
+        else:
+            logging.warning("⚠️ Registry change feed not available, discovering the known agents")
+            await self._discover_known_agents(max_concurrency, agent_timeout, overall_timeout)
+        
+        # Open pooled connections now so the first messages skip TCP setup
+        endpoints = [e.url for agent_info in self.agents.values() for e in agent_info['client'].endpoints]
+        warmed = await prewarm(self.httpx_client, endpoints)
+        logging.info(f"🔌 Pre-warmed connections to {warmed}/{len(endpoints)} agent endpoints")
+        return len(self.agents)
+    
+    async def _discover_known_agents(self, max_concurrency: int, agent_timeout: float, overall_timeout: float):
+        """Discover all known agents concurrently."""
         agents_to_discover = [
             ("http://localhost:9999", "echo"),
             ("http://localhost:8001", "websearch"),
             ("http://localhost:8002", "calculator"),
         ]
         
-        logging.info("🔍 Discovering available agents...")
+        results = await discover_agents(
+            self.httpx_client,
+            [(agent_name, base_url) for base_url, agent_name in agents_to_discover],
+            max_concurrency=max_concurrency,
+            agent_timeout=agent_timeout,
+            overall_timeout=overall_timeout,
+        )
         
-        for base_url, agent_name in agents_to_discover:
-            await self.discover_agent(base_url, agent_name)
+        for result in results:
+            if not result.ok:
+                logging.error(f"Failed to discover {result.name} at {result.base_url}: {result.error}")
+                continue
+            logging.info(f"Successfully discovered {result.name}: {result.card.name} ({result.latency_ms:.1f}ms)")
+            self._retire(self.agents.get(result.name))
+            self.agents[result.name] = {
+                'card': result.card,
+                'client': TracedClient(
+                    BalancedClient(self.client_factory, result.card, self.httpx_client), result.name
+                ),
+                'base_url': result.base_url,
+                'latency_ms': result.latency_ms,
+            }
+            self._index_agent(result.name, result.card)
         
+        self.routing_index.compile()
         logging.info(f"✅ Discovery complete. Found {len(self.agents)} agents.")
     
     def display_agents(self):
@@ -80,6 +195,12 @@ class MultiAgentClient:
             card = agent_info['card']
             print(f"**{card.name}** ({agent_name})")
             print(f"  📍 URL: {agent_info['base_url']}")
+            if 'latency_ms' in agent_info:
+                print(f"  ⏱️ Discovery latency: {agent_info['latency_ms']:.1f}ms")
+            replicas = agent_info['client'].endpoints
+            if len(replicas) > 1:
+                healthy = sum(endpoint.healthy for endpoint in replicas)
+                print(f"  🔀 Replicas: {healthy}/{len(replicas)} healthy")
             print(f"  📝 Description: {card.description}")
             print(f"  🎯 Skills:")
             
@@ -90,36 +211,29 @@ class MultiAgentClient:
             
             print(f"  🔧 Capabilities: Streaming={card.capabilities.streaming}, Push Notifications={card.capabilities.push_notifications}")
             print()
+        
+        print(f"🔌 HTTP pool: {self.httpx_client.pool_metrics.summary()}")
     
     def suggest_agent_for_query(self, query: str) -> Optional[str]:
         """Suggest the best agent for a given query based on skills and keywords."""
-        query_lower = query.lower()
-        
-        # Define keywords for each agent type
-        agent_keywords = {
-            'echo': ['echo', 'repeat', 'say back', 'test'],
-            'calculator': ['calculate', 'math', 'compute', '+', '-', '*', '/', 'sqrt', 'sin', 'cos', 'pi', 'equation', 'formula'],
-            'websearch': ['search', 'find', 'what is', 'who is', 'where is', 'how to', 'latest', 'news', 'information', 'lookup']
-        }
-        
-        # Score each agent based on keyword matches
-        scores = {}
-        for agent_name in self.agents.keys():
-            score = 0
-            keywords = agent_keywords.get(agent_name, [])
-            for keyword in keywords:
-                if keyword in query_lower:
-                    score += 1
-            scores[agent_name] = score
-        
-        # Return agent with highest score, or None if no matches
-        if not scores or max(scores.values()) == 0:
-            return None
-        
-        return max(scores, key=scores.get)
+        return self.routing_index.suggest(query)
+    
+    def suggest_many(self, queries: List[str]) -> List[Optional[str]]:
+        """Suggest the best agent for each of a batch of queries."""
+        return self.routing_index.suggest_many(queries)
     
-    async def send_to_agent(self, agent_name: str, message: str) -> str:
-        """Send a message to a specific agent and return the response."""
+    async def send_to_agent(
+        self,
+        agent_name: str,
+        message: str,
+        on_event: Optional[Callable[[str], None]] = None,
+    ) -> str:
+        """Send a message to a specific agent and return the response.
+
+        In streaming mode ``on_event`` is called with each partial status or
+        artifact update as it arrives. Every call's timing is kept in
+        ``self.timings``.
+        """
         if agent_name not in self.agents:
             return f"❌ Agent '{agent_name}' not found. Available agents: {list(self.agents.keys())}"
         
@@ -134,7 +248,14 @@ class MultiAgentClient:
                 content=message
             )
             
+            if self.streaming:
+                response_text, timing = await stream_message(client, message_obj, agent_name, on_event)
+                self.timings.append(timing)
+                return response_text if response_text else "No response received"
+            
             # Send message and get response
+            timing = CallTiming(agent=agent_name, streaming=False)
+            start = time.perf_counter()
             response_text = ""
             async for event in client.send_message(message_obj):
                 if isinstance(event, tuple):  # (Task, UpdateEvent)
@@ -146,12 +267,23 @@ class MultiAgentClient:
                                 break
                 else:  # Direct Message
                     response_text = get_message_text(event)
+            timing.completion = time.perf_counter() - start
+            timing.first_event, timing.events = timing.completion, 1
+            self.timings.append(timing)
             
             return response_text if response_text else "No response received"
             
         except Exception as e:
             return f"❌ Error communicating with {agent_name}: {str(e)}"
     
+    def _print_event(self, line: str):
+        """Show a partial update while a streamed response is still arriving."""
+        print(f"   ⏳ {line}")
+    
+    def _print_timing(self):
+        if self.timings:
+            print(f"⏱️ {self.timings[-1].summary()}")
+    
     async def interactive_chat(self):
         """Run an interactive chat session with agent suggestions."""
         print("\n🎉 **A2A Multi-Agent Chat Interface**")
@@ -183,12 +315,13 @@ class MultiAgentClient:
                     print(f"📝 **Sending to:** {suggested_agent}")
                     
                     # Send to suggested agent
-                    response = await self.send_to_agent(suggested_agent, user_input)
+                    response = await self.send_to_agent(suggested_agent, user_input, self._print_event)
                     print(f"\n🤖 **{agent_card.name}:** {response}")
                 else:
                     print("🤔 **No specific agent suggested.** Trying Echo Agent as default...")
-                    response = await self.send_to_agent('echo', user_input)
+                    response = await self.send_to_agent('echo', user_input, self._print_event)
                     print(f"\n🤖 **Echo Agent:** {response}")
+                self._print_timing()
                 
             except KeyboardInterrupt:
                 print("\n👋 Goodbye!")
@@ -219,8 +352,9 @@ class MultiAgentClient:
                 print(f"🎯 **Suggested Agent:** {agent_name}")
                 
                 # Send query
-                response = await self.send_to_agent(suggested_agent, query)
+                response = await self.send_to_agent(suggested_agent, query, self._print_event)
                 print(f"🤖 **Response:** {response}")
+                self._print_timing()
             else:
                 print("❌ No suitable agent found")
             
@@ -228,14 +362,19 @@ class MultiAgentClient:
     
     async def close(self):
         """Clean up resources."""
+        await self.registry_feed.close()
+        for entry in self.agents.values():
+            self._retire(entry)
+        self.agents.clear()
+        await asyncio.gather(*self._closing, return_exceptions=True)
         await self.httpx_client.aclose()
 
 
-async def main():
+async def main(streaming: bool = False):
     """Main function to run the multi-agent client."""
     logging.basicConfig(level=logging.INFO)
     
-    client = MultiAgentClient()
+    client = MultiAgentClient(streaming=streaming)
     
     try:
         # Discover all agents
@@ -254,5 +393,13 @@ async def main():
         await client.close()
 
 
+@click.command()
+@click.option('--stream', 'streaming', is_flag=True,
+              help='Stream responses over SSE, showing partial updates as they arrive.')
+def cli(streaming):
+    """Runs the multi-agent client."""
+    asyncio.run(main(streaming))
+
+
 if __name__ == '__main__':
-    asyncio.run(main())
\ No newline at end of file
+    cli()
\ No newline at end of file
@@ -0,0 +1,208 @@
+"""Local reverse proxy - Spreads requests for one agent across its replicas."""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional
+
+import httpx
+import uvicorn
+
+from a2a_stats import percentile
+from a2a_transport import TransportSettings, create_http_client
+
+
+LATENCY_WINDOW = 512
+POOL_LATENCY_WINDOW = 4096
+UPSTREAM_CONNECT_TIMEOUT = 2.0
+UPSTREAM_READ_TIMEOUT = 60.0
+
+# Headers that describe a single connection and must not be forwarded.
+HOP_BY_HOP_HEADERS = {
+    'connection', 'keep-alive', 'proxy-authenticate', 'proxy-authorization',
+    'te', 'trailer', 'transfer-encoding', 'upgrade', 'host',
+}
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Replica:
+    """One upstream agent process behind the proxy."""
+
+    url: str
+    in_flight: int = 0
+    requests: int = 0
+    errors: int = 0
+    latencies: Deque[float] = field(default_factory=lambda: deque(maxlen=LATENCY_WINDOW))
+
+
+class ReplicaPool:
+    """Replicas of a single agent; picks the one with the fewest in-flight requests."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.replicas: List[Replica] = []
+        # (finish time, seconds) for recent requests over all replicas
+        self.latencies: Deque = deque(maxlen=POOL_LATENCY_WINDOW)
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def add(self, url: str) -> Replica:
+        with self._lock:
+            for replica in self.replicas:
+                if replica.url == url:
+                    return replica
+            replica = Replica(url)
+            self.replicas = self.replicas + [replica]
+            return replica
+
+    def remove(self, url: str) -> Optional[Replica]:
+        """Stop routing to ``url``; returns its Replica so callers can watch it drain."""
+        with self._lock:
+            removed = [replica for replica in self.replicas if replica.url == url]
+            self.replicas = [replica for replica in self.replicas if replica.url != url]
+        return removed[0] if removed else None
+
+    @property
+    def in_flight(self) -> int:
+        return sum(replica.in_flight for replica in self.replicas)
+
+    def record(self, replica: Replica, seconds: float) -> None:
+        replica.latencies.append(seconds)
+        self.latencies.append((time.monotonic(), seconds))
+
+    def latency_percentiles(self, window: float) -> Dict[str, float]:
+        """p50/p95/p99 in seconds of requests answered in the last ``window`` seconds."""
+        since = time.monotonic() - window
+        recent = [seconds for finished, seconds in list(self.latencies) if finished >= since]
+        return {
+            'count': len(recent),
+            'p50': percentile(recent, 50),
+            'p95': percentile(recent, 95),
+            'p99': percentile(recent, 99),
+        }
+
+    def pick(self, exclude: Optional[Replica] = None) -> Optional[Replica]:
+        """Least in-flight replica; ties rotate so idle replicas share the load."""
+        replicas = [replica for replica in self.replicas if replica is not exclude]
+        if not replicas:
+            return None
+        self._next += 1
+        start = self._next % len(replicas)
+        rotated = replicas[start:] + replicas[:start]
+        return min(rotated, key=lambda replica: replica.in_flight)
+
+
+class ReverseProxy:
+    """ASGI app forwarding every HTTP request to a replica from ``pool``.
+
+    Responses are streamed back chunk by chunk so SSE endpoints keep
+    working. A replica that refuses the connection is skipped and the
+    request is retried once on another replica.
+    """
+
+    def __init__(self, pool: ReplicaPool):
+        self.pool = pool
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return
+        if self._client is None:
+            settings = TransportSettings.from_env()
+            settings.connect_timeout = UPSTREAM_CONNECT_TIMEOUT
+            settings.read_timeout = UPSTREAM_READ_TIMEOUT
+            self._client = create_http_client(settings)
+
+        body = b''
+        while True:
+            message = await receive()
+            body += message.get('body', b'')
+            if not message.get('more_body'):
+                break
+
+        headers = [
+            (name.decode('latin-1'), value.decode('latin-1'))
+            for name, value in scope['headers']
+            if name.decode('latin-1').lower() not in HOP_BY_HOP_HEADERS
+        ]
+        path = scope.get('raw_path') or scope['path'].encode()
+        if scope.get('query_string'):
+            path += b'?' + scope['query_string']
+
+        replica = self.pool.pick()
+        for attempt in range(2):
+            if replica is None:
+                break
+            request = self._client.build_request(
+                scope['method'], replica.url.rstrip('/') + path.decode('latin-1'),
+                headers=headers, content=body,
+            )
+            replica.in_flight += 1
+            replica.requests += 1
+            start = time.perf_counter()
+            try:
+                response = await self._client.send(request, stream=True)
+            except httpx.ConnectError:
+                replica.in_flight -= 1
+                replica.errors += 1
+                replica = self.pool.pick(exclude=replica)
+                continue
+            except httpx.HTTPError as e:
+                replica.in_flight -= 1
+                replica.errors += 1
+                logger.warning(f"{self.pool.name}: upstream {replica.url} failed: {e}")
+                break
+            # Latency is time to response headers, so long-lived SSE streams
+            # do not count as slow requests.
+            self.pool.record(replica, time.perf_counter() - start)
+            try:
+                await self._relay(response, send)
+            finally:
+                await response.aclose()
+                replica.in_flight -= 1
+            return
+
+        await send({
+            'type': 'http.response.start',
+            'status': 503,
+            'headers': [(b'content-type', b'text/plain')],
+        })
+        await send({'type': 'http.response.body', 'body': f"No replica of {self.pool.name} available".encode()})
+
+    async def _relay(self, response: httpx.Response, send) -> None:
+        headers = [
+            (name.encode('latin-1'), value.encode('latin-1'))
+            for name, value in response.headers.multi_items()
+            if name.lower() not in HOP_BY_HOP_HEADERS
+        ]
+        await send({'type': 'http.response.start', 'status': response.status_code, 'headers': headers})
+        async for chunk in response.aiter_raw():
+            await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+        await send({'type': 'http.response.body', 'body': b''})
+
+
+class ProxyServer:
+    """Runs a ReverseProxy with uvicorn on a background thread."""
+
+    def __init__(self, proxy: ReverseProxy, host: str, port: int):
+        self.host = host
+        self.port = port
+        self._server = uvicorn.Server(
+            uvicorn.Config(proxy, host=host, port=port, lifespan='off', log_level='warning')
+        )
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        asyncio.run(self._server.serve())
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._server.should_exit = True
+        self._thread.join(timeout)
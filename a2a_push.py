@@ -0,0 +1,255 @@
+"""Push notification pipeline - Queued, batched webhook delivery off the task path."""
+
+import asyncio
+import contextvars
+import logging
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from a2a.server.tasks import PushNotificationConfigStore, PushNotificationSender
+from a2a.types import PushNotificationConfig, Task
+
+
+DEFAULT_MAX_QUEUE = 10000
+DEFAULT_WORKERS = 16
+DEFAULT_PER_DESTINATION = 8
+DEFAULT_MAX_ATTEMPTS = 5
+BACKOFF_BASE = 0.2
+BACKOFF_MAX = 10.0
+CLOSE_TIMEOUT = 5.0
+FLUSH_POLL_INTERVAL = 0.01
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Delivery:
+    """The latest state of one task waiting to be sent to one webhook."""
+
+    task: Task
+    config: PushNotificationConfig
+    attempts: int = 0
+
+
+class QueuedPushNotificationSender(PushNotificationSender):
+    """Push notification sender that never delivers inline with task updates.
+
+    ``send_notification`` only looks up the task's webhooks and queues one
+    delivery per webhook; a pool of workers posts them in the background,
+    at most ``per_destination`` at a time per webhook host. A newer update
+    for a task that is still queued replaces the older one, since only
+    the latest state matters. Each task and webhook has at most one
+    delivery in flight, so a webhook never sees an older state after a
+    newer one: updates that arrive meanwhile wait for it, and a retry is
+    dropped when a newer update is waiting. Failed deliveries are retried with jittered
+    exponential backoff; deliveries that are rejected, run out of attempts
+    or do not fit in the queue are counted as dead letters.
+    """
+
+    def __init__(
+        self,
+        httpx_client: httpx.AsyncClient,
+        config_store: PushNotificationConfigStore,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+        workers: int = DEFAULT_WORKERS,
+        per_destination: int = DEFAULT_PER_DESTINATION,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    ):
+        self._client = httpx_client
+        self._config_store = config_store
+        self.max_queue = max_queue
+        self.workers = workers
+        self.per_destination = per_destination
+        self.max_attempts = max_attempts
+        self._queue: Optional[asyncio.Queue] = None
+        self._pending: Dict[Tuple[str, str], Delivery] = {}
+        # Keys with a delivery in flight or waiting to be retried
+        self._busy = set()
+        self._limits: Dict[str, asyncio.Semaphore] = {}
+        self._workers = []
+        self._retries = set()
+        self._active = 0
+        self.enqueued = 0
+        self.delivered = 0
+        self.coalesced = 0
+        self.retried = 0
+        self.dead_letters: Counter = Counter()
+
+    async def send_notification(self, task: Task) -> None:
+        push_configs = await self._config_store.get_info(task.id)
+        for push_config in push_configs or []:
+            self._enqueue(Delivery(task, push_config))
+
+    def _enqueue(self, delivery: Delivery) -> None:
+        self._ensure_started()
+        key = (delivery.task.id, delivery.config.id or delivery.config.url)
+        if key in self._pending:
+            self._pending[key] = delivery
+            self.coalesced += 1
+            return
+        if key in self._busy:
+            # Queued once the delivery in flight for this key has finished
+            self._pending[key] = delivery
+            return
+        self._queue_pending(key, delivery)
+
+    def _queue_pending(self, key: Tuple[str, str], delivery: Delivery) -> None:
+        if self._queue.full():
+            self.dead_letters['queue_full'] += 1
+            logger.warning(f"Push queue full, dropping notification for task {delivery.task.id}")
+            return
+        self._pending[key] = delivery
+        self._queue.put_nowait(key)
+        self.enqueued += 1
+
+    def _ensure_started(self) -> None:
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+            # Workers outlive the request that started them, so they get a fresh
+            # context instead of inheriting its trace span
+            self._workers = [
+                contextvars.Context().run(asyncio.create_task, self._worker()) for _ in range(self.workers)
+            ]
+
+    async def _worker(self) -> None:
+        while True:
+            key = await self._queue.get()
+            delivery = self._pending.pop(key, None)
+            if delivery is None:
+                continue
+            self._busy.add(key)
+            self._active += 1
+            retry = False
+            try:
+                retry = await self._deliver(delivery)
+            except Exception:
+                logger.exception("Push notification worker failed")
+            finally:
+                self._active -= 1
+                if retry:
+                    self.retried += 1
+                    task = asyncio.create_task(self._retry_later(key, delivery))
+                    self._retries.add(task)
+                    task.add_done_callback(self._retries.discard)
+                else:
+                    self._release(key)
+
+    def _release(self, key: Tuple[str, str]) -> None:
+        """Let the next update for ``key`` go out once its previous delivery is done."""
+        self._busy.discard(key)
+        delivery = self._pending.pop(key, None)
+        if delivery is not None:
+            self._queue_pending(key, delivery)
+
+    async def _deliver(self, delivery: Delivery) -> bool:
+        """Post ``delivery`` once; True when it failed and should be retried."""
+        url = delivery.config.url
+        limit = self._limits.setdefault(urlsplit(url).netloc, asyncio.Semaphore(self.per_destination))
+        headers = {'X-A2A-Notification-Token': delivery.config.token} if delivery.config.token else None
+        delivery.attempts += 1
+        async with limit:
+            try:
+                response = await self._client.post(
+                    url,
+                    json=delivery.task.model_dump(mode='json', exclude_none=True),
+                    headers=headers,
+                )
+                status = response.status_code
+            except httpx.HTTPError as e:
+                status, error = None, str(e)
+            else:
+                error = f"HTTP {status}"
+
+        if status is not None and status < 300:
+            self.delivered += 1
+            return False
+        retryable = status is None or status == 429 or status >= 500
+        if not retryable:
+            self.dead_letters['rejected'] += 1
+            logger.warning(f"Push notification for task {delivery.task.id} to {url} rejected: {error}")
+        elif delivery.attempts >= self.max_attempts:
+            self.dead_letters['exhausted'] += 1
+            logger.warning(f"Giving up push notification for task {delivery.task.id} to {url}: {error}")
+        return retryable and delivery.attempts < self.max_attempts
+
+    async def _retry_later(self, key: Tuple[str, str], delivery: Delivery) -> None:
+        # Full jitter keeps retries to a recovering webhook from arriving in lockstep
+        await asyncio.sleep(random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** delivery.attempts)))
+        if key in self._pending:
+            # A newer update was queued meanwhile and supersedes this one
+            self.coalesced += 1
+        else:
+            self._pending[key] = delivery
+        self._release(key)
+
+    async def flush(self, timeout: Optional[float] = None) -> None:
+        """Wait until every queued delivery (retries included) has finished."""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while self._pending or self._active or self._retries:
+            if deadline is not None and time.monotonic() >= deadline:
+                return
+            await asyncio.sleep(FLUSH_POLL_INTERVAL)
+
+    async def close(self) -> None:
+        """Give queued deliveries a few seconds to finish, then stop the workers."""
+        await self.flush(CLOSE_TIMEOUT)
+        for task in [*self._workers, *self._retries]:
+            task.cancel()
+        dropped = len(self._pending)
+        if dropped:
+            self.dead_letters['shutdown'] += dropped
+            logger.warning(f"Dropped {dropped} undelivered push notifications at shutdown")
+
+    def stats(self) -> dict:
+        return {
+            'queued': self._queue.qsize() if self._queue is not None else 0,
+            'enqueued': self.enqueued,
+            'delivered': self.delivered,
+            'coalesced': self.coalesced,
+            'retried': self.retried,
+            'dead_letters': dict(self.dead_letters),
+        }
+
+
+def webhook_receiver_app(latency: float = 0.0, failure_rate: float = 0.0) -> Starlette:
+    """Local stand-in for a push notification webhook.
+
+    Answers every POST after ``latency`` seconds, failing a random
+    ``failure_rate`` share of them with a 503. GET /stats reports what
+    it received, including the latest state seen for each task.
+    """
+    received = Counter()
+    latest_state: Dict[str, str] = {}
+
+    async def notify(request: Request) -> Response:
+        if latency:
+            await asyncio.sleep(latency)
+        if failure_rate and random.random() < failure_rate:
+            received['failed'] += 1
+            return Response(status_code=503)
+        task = await request.json()
+        received['accepted'] += 1
+        latest_state[task['id']] = task['status']['state']
+        return Response(status_code=204)
+
+    async def stats(request: Request) -> JSONResponse:
+        return JSONResponse({
+            'received': dict(received),
+            'tasks': len(latest_state),
+            'states': dict(Counter(latest_state.values())),
+        })
+
+    return Starlette(routes=[
+        Route('/notify', notify, methods=['POST']),
+        Route('/stats', stats, methods=['GET']),
+    ])
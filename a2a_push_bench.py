@@ -0,0 +1,100 @@
+"""Push notification benchmark - Inline vs queued delivery against a local webhook."""
+
+import asyncio
+import time
+
+import click
+import uvicorn
+
+from a2a.server.tasks import BasePushNotificationSender, InMemoryPushNotificationConfigStore
+from a2a.types import PushNotificationConfig, Task, TaskState, TaskStatus
+
+from a2a_push import (
+    DEFAULT_PER_DESTINATION,
+    DEFAULT_WORKERS,
+    QueuedPushNotificationSender,
+    webhook_receiver_app,
+)
+from a2a_transport import create_http_client
+
+
+def task_updates(task_id: str, updates: int):
+    """The states a task goes through: submitted, working..., completed."""
+    states = [TaskState.completed]
+    if updates >= 2:
+        states = [TaskState.submitted] + [TaskState.working] * (updates - 2) + states
+    for state in states:
+        yield Task(id=task_id, context_id=task_id, status=TaskStatus(state=state))
+
+
+async def run_agents(sender, tasks: int, updates: int) -> float:
+    """Emulate agents producing task updates; returns how long they were kept busy."""
+    async def agent(task_id: str):
+        for task in task_updates(task_id, updates):
+            await sender.send_notification(task)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(agent(f"task-{i}") for i in range(tasks)))
+    return time.perf_counter() - start
+
+
+async def benchmark(mode, tasks, updates, latency, failure_rate, port, workers, per_destination):
+    receiver = uvicorn.Server(uvicorn.Config(
+        webhook_receiver_app(latency, failure_rate), host='127.0.0.1', port=port, log_level='warning'
+    ))
+    serving = asyncio.create_task(receiver.serve())
+    while not receiver.started:
+        await asyncio.sleep(0.01)
+
+    url = f"http://127.0.0.1:{port}/notify"
+    config_store = InMemoryPushNotificationConfigStore()
+    for i in range(tasks):
+        await config_store.set_info(f"task-{i}", PushNotificationConfig(url=url))
+
+    httpx_client = create_http_client()
+    if mode == 'inline':
+        sender = BasePushNotificationSender(httpx_client, config_store)
+    else:
+        sender = QueuedPushNotificationSender(
+            httpx_client, config_store, workers=workers, per_destination=per_destination
+        )
+
+    start = time.perf_counter()
+    agent_time = await run_agents(sender, tasks, updates)
+    if mode == 'queued':
+        await sender.flush()
+    delivery_time = time.perf_counter() - start
+
+    stats = (await httpx_client.get(f"http://127.0.0.1:{port}/stats")).json()
+    await httpx_client.aclose()
+    receiver.should_exit = True
+    await serving
+
+    accepted = stats['received'].get('accepted', 0)
+    print(f"\n📊 **{mode}** - {tasks} tasks x {updates} updates, webhook latency {latency * 1000:.0f}ms, "
+          f"failure rate {failure_rate:.0%}")
+    print(f"  ⏱️ Agents blocked for: {agent_time * 1000:.1f}ms")
+    print(f"  ⏱️ All delivered after: {delivery_time * 1000:.1f}ms")
+    print(f"  📬 Webhook accepted: {accepted} ({accepted / delivery_time:.0f}/s), final states: {stats['states']}")
+    if mode == 'queued':
+        print(f"  📦 Pipeline: {sender.stats()}")
+
+
+@click.command()
+@click.option('--mode', 'modes', multiple=True, type=click.Choice(['inline', 'queued']),
+              default=['inline', 'queued'], help='Sender(s) to benchmark.')
+@click.option('--tasks', 'tasks', default=200)
+@click.option('--updates', 'updates', default=5, help='Status updates per task.')
+@click.option('--latency', 'latency', default=0.05, help='Webhook response time in seconds.')
+@click.option('--failure-rate', 'failure_rate', default=0.0, help='Share of webhook calls answered with 503.')
+@click.option('--port', 'port', default=9050)
+@click.option('--workers', 'workers', default=DEFAULT_WORKERS)
+@click.option('--per-destination', 'per_destination', default=DEFAULT_PER_DESTINATION)
+def main(modes, tasks, updates, latency, failure_rate, port, workers, per_destination):
+    """Measures push notification throughput against a local webhook stand-in."""
+    for mode in modes:
+        asyncio.run(benchmark(mode, tasks, updates, latency, failure_rate, port, workers, per_destination))
+
+
+if __name__ == '__main__':
+    main()
@@ -3,22 +3,28 @@ import os
 import sys
 
 import click
-import httpx
-import uvicorn
 
 from a2a.server.apps import A2AStarletteApplication
 from a2a.server.request_handlers import DefaultRequestHandler
-from a2a.server.tasks import (
-    BasePushNotificationSender,
-    InMemoryPushNotificationConfigStore,
-    InMemoryTaskStore,
-)
 from a2a.types import (
     AgentCapabilities,
     AgentCard,
     AgentSkill,
 )
 
+from a2a_agent_index import AgentSearchIndex, IndexedRegistryExecutor
+from a2a_card_cache import agent_card_route
+from a2a_membership import REGISTRY_PATH, AgentMembership
+from a2a_metrics import AgentMetrics, MetricsMiddleware
+from a2a_push import QueuedPushNotificationSender
+from a2a_serving import component_lifespan, run_server, server_config_from_env, shared_task_store_spec
+from a2a_task_stores import (
+    TASK_STORE_HELP,
+    build_push_config_store,
+    build_task_store,
+)
+from a2a_tracing import TracingAgentExecutor
+from a2a_transport import shared_http_client
 from app.agent_registry import AgentRegistry
 from app.agent_registry_executor import AgentRegistryExecutor
 
@@ -27,85 +33,131 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def build_app(host, port, task_store_spec='memory', public_url=None):
+    """Builds the A2A Agent Registry application."""
+    capabilities = AgentCapabilities(streaming=True, push_notifications=True)
+
+    # Define skills for the registry
+    registry_skills = [
+        AgentSkill(
+            id='agent_discovery',
+            name='Agent Discovery',
+            description='Discover and search for A2A agents in the ecosystem',
+            tags=['discovery', 'search', 'registry', 'a2a protocol'],
+            examples=[
+                'list all agents',
+                'search for calculator agents',
+                'find agents that can do web search',
+                'show me available agents'
+            ],
+        ),
+        AgentSkill(
+            id='agent_information',
+            name='Agent Information',
+            description='Get detailed information about specific A2A agents',
+            tags=['information', 'details', 'agent cards', 'capabilities'],
+            examples=[
+                'details calculator_agent',
+                'info about echo_agent',
+                'show websearch_agent capabilities'
+            ],
+        ),
+        AgentSkill(
+            id='ecosystem_management',
+            name='A2A Ecosystem Management',
+            description='Manage and coordinate the A2A agent ecosystem',
+            tags=['ecosystem', 'coordination', 'management', 'a2a protocol'],
+            examples=[
+                'help',
+                'what can you do?',
+                'how does A2A work?'
+            ],
+        )
+    ]
+
+    agent_card = AgentCard(
+        name='A2A Agent Registry',
+        description='Central directory service for A2A agent discovery and ecosystem management. I help you find and connect with the right agents in the A2A ecosystem.',
+        url=public_url or f'http://{host}:{port}/',
+        version='1.0.0',
+        default_input_modes=AgentRegistry.SUPPORTED_CONTENT_TYPES,
+        default_output_modes=AgentRegistry.SUPPORTED_CONTENT_TYPES,
+        capabilities=capabilities,
+        skills=registry_skills,
+    )
+
+    # Set up the server components
+    task_store = build_task_store(task_store_spec)
+    httpx_client = shared_http_client()
+    push_config_store = build_push_config_store(task_store_spec)
+    push_sender = QueuedPushNotificationSender(
+        httpx_client=httpx_client,
+        config_store=push_config_store
+    )
+    metrics = AgentMetrics(agent_card.name)
+    metrics.track_task_store(task_store)
+    metrics.track_push_sender(push_sender)
+    # Searches and listings are answered from an inverted index over agent cards
+    index = AgentSearchIndex()
+    metrics.track_agent_index(index)
+    # Agents register under heartbeat leases; joins and leaves update the index
+    membership = AgentMembership(index)
+    membership.register(agent_card, static=True)
+    metrics.track_membership(membership)
+    agent_executor = IndexedRegistryExecutor(AgentRegistryExecutor(), index)
+    request_handler = DefaultRequestHandler(
+        agent_executor=metrics.instrument_executor(
+            TracingAgentExecutor(agent_executor, agent_card.name)
+        ),
+        task_store=task_store,
+        push_config_store=push_config_store,
+        push_sender=push_sender
+    )
+    server = A2AStarletteApplication(
+        agent_card=agent_card, 
+        http_handler=request_handler
+    )
+
+    app = server.build(
+        routes=[agent_card_route(agent_card), metrics.route(), *membership.routes()],
+        lifespan=component_lifespan(membership, push_sender, task_store, push_config_store),
+    )
+    app.add_middleware(MetricsMiddleware, metrics=metrics, exclude_paths=[REGISTRY_PATH])
+    return app
+
+
+def create_app():
+    """Builds the application inside a uvicorn worker process."""
+    return build_app(**server_config_from_env())
+
+
 @click.command()
 @click.option('--host', 'host', default='localhost')
 @click.option('--port', 'port', default=8000)
-def main(host, port):
+@click.option('--task-store', 'task_store_spec', default='memory', help=TASK_STORE_HELP)
+@click.option('--public-url', 'public_url', default=None,
+              help='URL advertised in the agent card, e.g. when served behind a proxy.')
+@click.option('--workers', 'workers', default=1,
+              help='Number of worker processes; must be 1, since registrations and the change '
+                   'feed are kept in the process serving them.')
+def main(host, port, task_store_spec, public_url, workers):
     """Starts the A2A Agent Registry server."""
+    if workers != 1:
+        raise click.BadParameter('the registry keeps its membership in memory and runs as a single process',
+                                 param_hint='--workers')
     try:
-        capabilities = AgentCapabilities(streaming=True, push_notifications=True)
-        
-        # Define skills for the registry
-        registry_skills = [
-            AgentSkill(
-                id='agent_discovery',
-                name='Agent Discovery',
-                description='Discover and search for A2A agents in the ecosystem',
-                tags=['discovery', 'search', 'registry', 'a2a protocol'],
-                examples=[
-                    'list all agents',
-                    'search for calculator agents',
-                    'find agents that can do web search',
-                    'show me available agents'
-                ],
-            ),
-            AgentSkill(
-                id='agent_information',
-                name='Agent Information',
-                description='Get detailed information about specific A2A agents',
-                tags=['information', 'details', 'agent cards', 'capabilities'],
-                examples=[
-                    'details calculator_agent',
-                    'info about echo_agent',
-                    'show websearch_agent capabilities'
-                ],
-            ),
-            AgentSkill(
-                id='ecosystem_management',
-                name='A2A Ecosystem Management',
-                description='Manage and coordinate the A2A agent ecosystem',
-                tags=['ecosystem', 'coordination', 'management', 'a2a protocol'],
-                examples=[
-                    'help',
-                    'what can you do?',
-                    'how does A2A work?'
-                ],
-            )
-        ]
-        
-        agent_card = AgentCard(
-            name='A2A Agent Registry',
-            description='Central directory service for A2A agent discovery and ecosystem management. I help you find and connect with the right agents in the A2A ecosystem.',
-            url=f'http://{host}:{port}/',
-            version='1.0.0',
-            default_input_modes=AgentRegistry.SUPPORTED_CONTENT_TYPES,
-            default_output_modes=AgentRegistry.SUPPORTED_CONTENT_TYPES,
-            capabilities=capabilities,
-            skills=registry_skills,
-        )
-
-        # Set up the server components
-        httpx_client = httpx.AsyncClient()
-        push_config_store = InMemoryPushNotificationConfigStore()
-        push_sender = BasePushNotificationSender(
-            httpx_client=httpx_client,
-            config_store=push_config_store
-        )
-        request_handler = DefaultRequestHandler(
-            agent_executor=AgentRegistryExecutor(),
-            task_store=InMemoryTaskStore(),
-            push_config_store=push_config_store,
-            push_sender=push_sender
-        )
-        server = A2AStarletteApplication(
-            agent_card=agent_card, 
-            http_handler=request_handler
-        )
+        config = {
+            'host': host,
+            'port': port,
+            'task_store_spec': shared_task_store_spec(task_store_spec, 'registry', workers),
+            'public_url': public_url,
+        }
 
         logger.info(f"Starting A2A Agent Registry server on {host}:{port}")
         logger.info("🔍 Registry will coordinate agent discovery and ecosystem management")
         logger.info("🤖 Agents can register and be discovered through A2A protocol")
-        uvicorn.run(server.build(), host=host, port=port)
+        logger.info(f"📡 Registry changes stream from http://{host}:{port}/registry/events")
+        run_server('a2a_registry_server:create_app', build_app, config, workers)
 
     except Exception as e:
         logger.error(f'An error occurred during server startup: {e}')
@@ -0,0 +1,159 @@
+"""Compiled query routing - Aho-Corasick keyword automaton built from agent cards."""
+
+import re
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from a2a.types import AgentCard
+
+
+# Weights for the different places a keyword can come from on an agent card.
+TAG_WEIGHT = 2.0
+SKILL_NAME_WEIGHT = 1.5
+EXAMPLE_WEIGHT = 0.5
+SEED_WEIGHT = 1.0
+
+# Example sentences are split into words; very short or generic ones are noise.
+_EXAMPLE_WORD = re.compile(r"[a-z][a-z0-9_]{3,}")
+_STOPWORDS = frozenset({
+    'this', 'that', 'what', 'with', 'from', 'about', 'find', 'show', 'please',
+    'other', 'agents', 'agent', 'information',
+})
+
+
+class RoutingIndex:
+    """Weighted multi-pattern matcher mapping queries to agent names.
+
+    Keywords for every agent are compiled into a single Aho-Corasick
+    automaton whose transitions are flattened into one dict per state, so
+    scoring a query is a single pass over its characters no matter how many
+    agents or keywords are registered. Call ``compile()`` after adding
+    agents; ``suggest`` compiles lazily if needed.
+    """
+
+    def __init__(self):
+        self._agents: List[str] = []
+        self._keywords: Dict[str, Dict[str, float]] = {}
+        self._delta: List[Dict[str, int]] = [{}]
+        self._outputs: List[Tuple[int, ...]] = [()]
+        self._patterns: List[Tuple[int, float]] = []
+        self._compiled = True
+
+    def add_keywords(self, agent_name: str, keywords: Iterable[str], weight: float = SEED_WEIGHT) -> None:
+        """Register ``keywords`` for ``agent_name``, keeping the highest weight per keyword."""
+        if agent_name not in self._keywords:
+            self._agents.append(agent_name)
+            self._keywords[agent_name] = {}
+        table = self._keywords[agent_name]
+        for keyword in keywords:
+            keyword = keyword.strip().lower()
+            if keyword and weight > table.get(keyword, 0.0):
+                table[keyword] = weight
+        self._compiled = False
+
+    def add_agent_card(self, agent_name: str, card: AgentCard) -> None:
+        """Register the skill tags, skill names and example words of ``card``."""
+        for skill in card.skills:
+            self.add_keywords(agent_name, skill.tags or [], TAG_WEIGHT)
+            self.add_keywords(agent_name, [skill.name], SKILL_NAME_WEIGHT)
+            words = set()
+            for example in skill.examples or []:
+                words.update(_EXAMPLE_WORD.findall(example.lower()))
+            self.add_keywords(agent_name, words - _STOPWORDS, EXAMPLE_WEIGHT)
+
+    def remove_agent(self, agent_name: str) -> None:
+        """Drop every keyword registered for ``agent_name``."""
+        if agent_name in self._keywords:
+            del self._keywords[agent_name]
+            self._agents.remove(agent_name)
+            self._compiled = False
+
+    def compile(self) -> None:
+        """Build the automaton from the registered keywords."""
+        goto: List[Dict[str, int]] = [{}]
+        pattern_ends: List[List[int]] = [[]]
+        patterns: List[Tuple[int, float]] = []
+
+        for agent_index, agent_name in enumerate(self._agents):
+            for keyword, weight in self._keywords[agent_name].items():
+                state = 0
+                for ch in keyword:
+                    next_state = goto[state].get(ch)
+                    if next_state is None:
+                        next_state = len(goto)
+                        goto[state][ch] = next_state
+                        goto.append({})
+                        pattern_ends.append([])
+                    state = next_state
+                pattern_ends[state].append(len(patterns))
+                patterns.append((agent_index, weight))
+
+        # Breadth-first pass computing failure links, merging outputs along
+        # them and flattening goto + failure into a full transition table.
+        fail = [0] * len(goto)
+        delta: List[Dict[str, int]] = [dict(goto[0])]
+        delta.extend({} for _ in range(len(goto) - 1))
+        outputs: List[Tuple[int, ...]] = [tuple(pattern_ends[0])] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            outputs[state] = tuple(pattern_ends[state]) + outputs[fail[state]]
+            transitions = dict(delta[fail[state]])
+            for ch, next_state in goto[state].items():
+                fail[next_state] = delta[fail[state]].get(ch, 0)
+                transitions[ch] = next_state
+                queue.append(next_state)
+            delta[state] = transitions
+
+        self._delta = delta
+        self._outputs = outputs
+        self._patterns = patterns
+        self._compiled = True
+
+    def _match(self, query: str) -> Dict[int, float]:
+        """Run the automaton over ``query`` and sum keyword weights per agent index."""
+        if not self._compiled:
+            self.compile()
+        delta = self._delta
+        outputs = self._outputs
+        state = 0
+        matched = set()
+        for ch in query.lower():
+            state = delta[state].get(ch, 0)
+            if outputs[state]:
+                matched.update(outputs[state])
+
+        scores: Dict[int, float] = {}
+        patterns = self._patterns
+        for pattern in matched:
+            agent_index, weight = patterns[pattern]
+            scores[agent_index] = scores.get(agent_index, 0.0) + weight
+        return scores
+
+    def score(self, query: str) -> Dict[str, float]:
+        """Return the weighted score of every agent for ``query``.
+
+        Each keyword counts once per query, however often it occurs.
+        """
+        scores = self._match(query)
+        return {
+            agent_name: scores.get(agent_index, 0.0)
+            for agent_index, agent_name in enumerate(self._agents)
+        }
+
+    def suggest(self, query: str) -> Optional[str]:
+        """Return the best-scoring agent for ``query``, or None if nothing matched.
+
+        Ties go to the agent that was registered first.
+        """
+        scores = self._match(query)
+        if not scores:
+            return None
+        best = max(scores, key=lambda agent_index: (scores[agent_index], -agent_index))
+        return self._agents[best]
+
+    def suggest_many(self, queries: Iterable[str]) -> List[Optional[str]]:
+        """Route a batch of queries, returning one suggestion per query."""
+        if not self._compiled:
+            self.compile()
+        return [self.suggest(query) for query in queries]
@@ -0,0 +1,244 @@
+"""Web search caching - TTL result cache, request coalescing and pluggable backends."""
+
+import asyncio
+import logging
+import re
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import aiohttp
+
+from a2a.server.agent_execution import AgentExecutor, RequestContext
+from a2a.server.events import EventQueue
+from a2a.utils import new_agent_text_message
+
+from a2a_executor_utils import RecordingEventQueue, final_text, response_text
+
+
+DEFAULT_TTL = 300.0
+DEFAULT_MAX_ENTRIES = 2048
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+
+DUCKDUCKGO_API_URL = 'https://api.duckduckgo.com/'
+NO_ANSWER = "❌ Web search returned no answer."
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a search query so trivially different spellings share a cache entry."""
+    query = re.sub(r"\s+", " ", query.strip().lower())
+    return query.strip(" ?!.")
+
+
+class SearchBackend(ABC):
+    """Source of web search answers used by the caching executor."""
+
+    @abstractmethod
+    async def search(self, query: str) -> str:
+        """Return the formatted search answer for ``query``."""
+
+    async def aclose(self) -> None:
+        """Release any resources held by the backend."""
+
+
+class DuckDuckGoBackend(SearchBackend):
+    """Queries the DuckDuckGo Instant Answer API."""
+
+    def __init__(self, timeout: float = 10.0):
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def search(self, query: str) -> str:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=self.timeout)
+        params = {'q': query, 'format': 'json', 'no_html': '1', 'skip_disambig': '1'}
+        async with self._session.get(DUCKDUCKGO_API_URL, params=params) as response:
+            response.raise_for_status()
+            data = await response.json(content_type=None)
+
+        lines = [f"🔍 Web Search Results for: {query}"]
+        if data.get('Answer'):
+            lines.append(f"**Answer:** {data['Answer']}")
+        if data.get('AbstractText'):
+            lines.append(f"**Summary:** {data['AbstractText']}")
+            if data.get('AbstractURL'):
+                lines.append(f"**Source:** {data['AbstractURL']}")
+        topics = [topic for topic in data.get('RelatedTopics', []) if topic.get('Text')]
+        if topics:
+            lines.append("**Related:**")
+            lines.extend(f"• {topic['Text']}" for topic in topics[:3])
+        if len(lines) == 1:
+            lines.append("No instant answer found.")
+        return "\n".join(lines)
+
+    async def aclose(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+
+
+class StubSearchBackend(SearchBackend):
+    """Offline stand-in for DuckDuckGo returning canned answers."""
+
+    def __init__(self, latency: float = 0.0, answers: Optional[Dict[str, str]] = None):
+        self.latency = latency
+        self.answers = {normalize_query(q): a for q, a in (answers or {}).items()}
+        self.calls = 0
+
+    async def search(self, query: str) -> str:
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        answer = self.answers.get(normalize_query(query), f"Stub result for '{query}'.")
+        return f"🔍 Web Search Results for: {query}\n**Answer:** {answer}"
+
+
+class SearchResultCache:
+    """LRU of search answers bounded by entry count and total bytes, with a TTL."""
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[float, str, int]]" = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+        if entry is not None:
+            self._remove(key)
+        self.misses += 1
+        return None
+
+    def put(self, key: str, text: str) -> None:
+        size = len(text.encode('utf-8'))
+        if self.ttl <= 0 or size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (time.monotonic() + self.ttl, text, size)
+        self.bytes += size
+        while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: str) -> None:
+        _, _, size = self._entries.pop(key)
+        self.bytes -= size
+
+    def stats(self) -> dict:
+        return {
+            'entries': len(self._entries),
+            'bytes': self.bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'coalesced': self.coalesced,
+        }
+
+
+class CachingWebSearchExecutor(AgentExecutor):
+    """Wraps the web search executor with a TTL cache and singleflight coalescing.
+
+    Concurrent requests for the same normalized query share one upstream
+    search: the first becomes the leader and the others get its answer,
+    error replies included, without asking upstream again. Without a ``backend`` the leader runs the wrapped executor;
+    with one (e.g. ``StubSearchBackend``) the backend answers instead.
+    """
+
+    def __init__(
+        self,
+        executor: AgentExecutor,
+        backend: Optional[SearchBackend] = None,
+        cache: Optional[SearchResultCache] = None,
+    ):
+        self.executor = executor
+        self.backend = backend
+        self.cache = cache or SearchResultCache()
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    async def _reply(self, context: RequestContext, event_queue: EventQueue, text: str) -> None:
+        await event_queue.enqueue_event(
+            new_agent_text_message(text, context.context_id, context.task_id)
+        )
+
+    async def execute(self, context: RequestContext, event_queue: EventQueue) -> None:
+        query = context.get_user_input()
+        key = normalize_query(query)
+
+        text = self.cache.get(key)
+        if text is not None:
+            await self._reply(context, event_queue, text)
+            return
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.cache.coalesced += 1
+            try:
+                reply = await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+                # The leader's request went away before answering; search on our own
+                await self.executor.execute(context, event_queue)
+                return
+            except Exception as e:
+                reply = f"❌ Web search failed: {e}"
+            # Error replies are shared too, so a struggling upstream is not asked again
+            await self._reply(context, event_queue, reply or NO_ANSWER)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            reply, text = await self._lead(query, context, event_queue)
+        except Exception as e:
+            # Waiting followers fail with the leader instead of each searching again
+            future.set_exception(e)
+            future.exception()
+            if self.backend is None:
+                raise
+            logger.warning(f"⚠️ Web search for '{query}' failed: {e}")
+            await self._reply(context, event_queue, f"❌ Web search failed: {e}")
+            return
+        except BaseException:
+            future.cancel()
+            raise
+        else:
+            if text is not None:
+                self.cache.put(key, text)
+            future.set_result(reply)
+        finally:
+            del self._inflight[key]
+        logger.debug(f"Web search cache stats: {self.cache.stats()}")
+
+    async def _lead(
+        self, query: str, context: RequestContext, event_queue: EventQueue
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """Answer as the leader: (reply for the followers, answer to cache or None)."""
+        if self.backend is not None:
+            text = await self.backend.search(query)
+            await self._reply(context, event_queue, text)
+            return text, text
+        recorder = RecordingEventQueue(event_queue)
+        await self.executor.execute(context, recorder)
+        return final_text(recorder.events), response_text(recorder.events)
+
+    async def close(self) -> None:
+        if self.backend is not None:
+            await self.backend.aclose()
+
+    async def cancel(self, context: RequestContext, event_queue: EventQueue) -> None:
+        await self.executor.cancel(context, event_queue)
@@ -3,22 +3,27 @@ import os
 import sys
 
 import click
-import httpx
-import uvicorn
 
 from a2a.server.apps import A2AStarletteApplication
 from a2a.server.request_handlers import DefaultRequestHandler
-from a2a.server.tasks import (
-    BasePushNotificationSender,
-    InMemoryPushNotificationConfigStore,
-    InMemoryTaskStore,
-)
 from a2a.types import (
     AgentCapabilities,
     AgentCard,
     AgentSkill,
 )
 
+from a2a_card_cache import agent_card_route
+from a2a_membership import REGISTRY_URL, RegistryLease
+from a2a_metrics import AgentMetrics, MetricsMiddleware
+from a2a_push import QueuedPushNotificationSender
+from a2a_serving import component_lifespan, run_server, server_config_from_env, shared_task_store_spec
+from a2a_task_stores import (
+    TASK_STORE_HELP,
+    build_push_config_store,
+    build_task_store,
+)
+from a2a_tracing import TracingAgentExecutor
+from a2a_transport import shared_http_client
 from app.agent import EchoAgent
 from app.agent_executor import EchoAgentExecutor
 
@@ -27,69 +32,108 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def build_app(host, port, task_store_spec='memory', public_url=None, registry_url=None):
+    """Builds the Echo Agent application."""
+    capabilities = AgentCapabilities(streaming=True, push_notifications=True)
+    # Enhanced skills with detailed A2A protocol information
+    skills = [
+        AgentSkill(
+            id='echo_skill',
+            name='Echo Skill',
+            description='Echoes back any text with a prefix for testing A2A communication and message flow',
+            tags=['echo', 'text processing', 'testing', 'a2a protocol', 'communication'],
+            examples=[
+                'Hello World -> Echo: Hello World',
+                'Test A2A message -> Echo: Test A2A message',
+                'Echo this please -> Echo: Echo this please'
+            ],
+        ),
+        AgentSkill(
+            id='a2a_testing',
+            name='A2A Protocol Testing',
+            description='Provides a simple endpoint for testing A2A protocol communication, message structure, and response handling',
+            tags=['testing', 'a2a protocol', 'debugging', 'validation'],
+            examples=[
+                'test a2a connection',
+                'validate message format',
+                'check protocol compliance'
+            ],
+        )
+    ]
+    agent_card = AgentCard(
+        name='Echo Agent',
+        description='A foundational A2A agent that echoes back messages with a prefix. Perfect for testing A2A protocol communication, message flow, and agent connectivity in the ecosystem.',
+        url=public_url or f'http://{host}:{port}/',
+        version='1.0.0',
+        default_input_modes=EchoAgent.SUPPORTED_CONTENT_TYPES,
+        default_output_modes=EchoAgent.SUPPORTED_CONTENT_TYPES,
+        capabilities=capabilities,
+        skills=skills,
+    )
+
+    # Set up the server components
+    task_store = build_task_store(task_store_spec)
+    httpx_client = shared_http_client()
+    push_config_store = build_push_config_store(task_store_spec)
+    push_sender = QueuedPushNotificationSender(
+        httpx_client=httpx_client,
+        config_store=push_config_store
+    )
+    metrics = AgentMetrics(agent_card.name)
+    metrics.track_task_store(task_store)
+    metrics.track_push_sender(push_sender)
+    # Registered with the Agent Registry for as long as the server runs
+    lease = RegistryLease(httpx_client, registry_url, agent_card) if registry_url else None
+    request_handler = DefaultRequestHandler(
+        agent_executor=metrics.instrument_executor(
+            TracingAgentExecutor(EchoAgentExecutor(), agent_card.name)
+        ),
+        task_store=task_store,
+        push_config_store=push_config_store,
+        push_sender=push_sender
+    )
+    server = A2AStarletteApplication(
+        agent_card=agent_card, 
+        http_handler=request_handler
+    )
+
+    app = server.build(
+        routes=[agent_card_route(agent_card), metrics.route()],
+        lifespan=component_lifespan(lease, push_sender, task_store, push_config_store),
+    )
+    app.add_middleware(MetricsMiddleware, metrics=metrics)
+    return app
+
+
+def create_app():
+    """Builds the application inside a uvicorn worker process."""
+    return build_app(**server_config_from_env())
+
+
 @click.command()
 @click.option('--host', 'host', default='localhost')
 @click.option('--port', 'port', default=9999)
-def main(host, port):
+@click.option('--task-store', 'task_store_spec', default='memory', help=TASK_STORE_HELP)
+@click.option('--public-url', 'public_url', default=None,
+              help='URL advertised in the agent card, e.g. when served behind a proxy.')
+@click.option('--registry-url', 'registry_url', default=REGISTRY_URL,
+              help="Agent Registry to register with under a heartbeat lease; '' to run unregistered.")
+@click.option('--workers', 'workers', default=1,
+              help='Number of worker processes; workers share task state through SQLite, '
+                   'but resubscribe and cancel only reach the worker running the task.')
+def main(host, port, task_store_spec, public_url, registry_url, workers):
     """Starts the Echo Agent server."""
     try:
-        capabilities = AgentCapabilities(streaming=True, push_notifications=True)
-        # Enhanced skills with detailed A2A protocol information
-        skills = [
-            AgentSkill(
-                id='echo_skill',
-                name='Echo Skill',
-                description='Echoes back any text with a prefix for testing A2A communication and message flow',
-                tags=['echo', 'text processing', 'testing', 'a2a protocol', 'communication'],
-                examples=[
-                    'Hello World -> Echo: Hello World',
-                    'Test A2A message -> Echo: Test A2A message',
-                    'Echo this please -> Echo: Echo this please'
-                ],
-            ),
-            AgentSkill(
-                id='a2a_testing',
-                name='A2A Protocol Testing',
-                description='Provides a simple endpoint for testing A2A protocol communication, message structure, and response handling',
-                tags=['testing', 'a2a protocol', 'debugging', 'validation'],
-                examples=[
-                    'test a2a connection',
-                    'validate message format',
-                    'check protocol compliance'
-                ],
-            )
-        ]
-        agent_card = AgentCard(
-            name='Echo Agent',
-            description='A foundational A2A agent that echoes back messages with a prefix. Perfect for testing A2A protocol communication, message flow, and agent connectivity in the ecosystem.',
-            url=f'http://{host}:{port}/',
-            version='1.0.0',
-            default_input_modes=EchoAgent.SUPPORTED_CONTENT_TYPES,
-            default_output_modes=EchoAgent.SUPPORTED_CONTENT_TYPES,
-            capabilities=capabilities,
-            skills=skills,
-        )
-
-        # Set up the server components
-        httpx_client = httpx.AsyncClient()
-        push_config_store = InMemoryPushNotificationConfigStore()
-        push_sender = BasePushNotificationSender(
-            httpx_client=httpx_client,
-            config_store=push_config_store
-        )
-        request_handler = DefaultRequestHandler(
-            agent_executor=EchoAgentExecutor(),
-            task_store=InMemoryTaskStore(),
-            push_config_store=push_config_store,
-            push_sender=push_sender
-        )
-        server = A2AStarletteApplication(
-            agent_card=agent_card, 
-            http_handler=request_handler
-        )
+        config = {
+            'host': host,
+            'port': port,
+            'task_store_spec': shared_task_store_spec(task_store_spec, 'echo', workers),
+            'public_url': public_url,
+            'registry_url': registry_url or None,
+        }
 
         logger.info(f"Starting Echo Agent server on {host}:{port}")
-        uvicorn.run(server.build(), host=host, port=port)
+        run_server('a2a_server:create_app', build_app, config, workers)
 
     except Exception as e:
         logger.error(f'An error occurred during server startup: {e}')
@@ -0,0 +1,99 @@
+"""Server runner - Starts an agent app in one process or across uvicorn workers."""
+
+import json
+import logging
+import os
+from contextlib import asynccontextmanager
+from typing import Callable
+
+import uvicorn
+
+from a2a_task_stores import parse_task_store_spec
+
+
+CONFIG_ENV = 'A2A_SERVER_CONFIG'
+STATE_DIR = '.a2a'
+
+logger = logging.getLogger(__name__)
+
+
+def server_config_from_env() -> dict:
+    """Read the app configuration handed to worker processes by ``run_server``."""
+    return json.loads(os.environ[CONFIG_ENV])
+
+
+def shared_task_store_spec(spec: str, agent_id: str, workers: int) -> str:
+    """Return a task store spec every worker process can share.
+
+    A single worker keeps ``spec`` as is. With several workers per-process
+    memory stores would give each worker its own view of tasks, so they are
+    replaced by a write-through SQLite database under ``.a2a/``.
+
+    Only the task records are shared. The event queues behind streaming
+    stay in the worker that runs the task, so tasks/resubscribe and
+    tasks/cancel only work when they reach that same worker; on any other
+    worker resubscribe fails and cancel cannot stop the running executor.
+    Use a single worker for clients that resubscribe or cancel.
+    """
+    if workers <= 1:
+        return spec
+    kind, _, options = parse_task_store_spec(spec)
+    if kind == 'sqlite':
+        if float(options.get('flush_interval', 0.05)) > 0:
+            logger.warning("Buffered SQLite writes are only visible to other workers after a flush; "
+                           "use ?flush_interval=0 for read-your-writes across workers")
+        return spec
+    os.makedirs(STATE_DIR, exist_ok=True)
+    shared = f"sqlite:{os.path.join(STATE_DIR, f'{agent_id}-tasks.db')}?flush_interval=0"
+    logger.info(f"Using shared task store {shared} for {workers} workers")
+    return shared
+
+
+def run_server(app_factory: str, build_app: Callable, config: dict, workers: int = 1) -> None:
+    """Serve the app built by ``build_app(**config)``.
+
+    With more than one worker uvicorn imports ``app_factory``
+    ('module:create_app') in each worker process, which rebuilds the app
+    from the configuration passed through the environment. See
+    ``shared_task_store_spec`` for what workers do and do not share.
+    """
+    host, port = config['host'], config['port']
+    if workers <= 1:
+        uvicorn.run(build_app(**config), host=host, port=port)
+        return
+    logger.warning(f"⚠️ {workers} workers share task records but not event queues: "
+                   "tasks/resubscribe and tasks/cancel only reach the worker running the task")
+    os.environ[CONFIG_ENV] = json.dumps(config)
+    uvicorn.run(app_factory, factory=True, host=host, port=port, workers=workers)
+
+
+def component_lifespan(*components):
+    """Starlette lifespan that starts and stops an app's long-lived components.
+
+    Components with an async start() (leases, feeds, pools, ...) are started
+    in order before the app serves; on shutdown everything with an async
+    close() (push senders, task stores, ...) is closed, each one even when
+    closing another failed. None entries (optional components that are
+    switched off) are skipped.
+    """
+    components = [component for component in components if component is not None]
+
+    @asynccontextmanager
+    async def lifespan(app):
+        try:
+            for component in components:
+                start = getattr(component, 'start', None)
+                if start is not None:
+                    await start()
+            yield
+        finally:
+            for component in components:
+                close = getattr(component, 'close', None)
+                if close is None:
+                    continue
+                try:
+                    await close()
+                except Exception:
+                    logger.exception(f"Closing {type(component).__name__} failed")
+
+    return lifespan
@@ -0,0 +1,100 @@
+"""Streaming helpers - Consume A2A event streams incrementally and time each call."""
+
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple
+
+from a2a.client import Client
+from a2a.types import (
+    Message,
+    Role,
+    Task,
+    TaskArtifactUpdateEvent,
+    TaskStatusUpdateEvent,
+)
+from a2a.utils.artifact import get_artifact_text
+from a2a.utils.message import get_message_text
+
+
+@dataclass
+class CallTiming:
+    """Time to first event and to completion of one call to an agent."""
+
+    agent: str
+    streaming: bool
+    first_event: Optional[float] = None
+    completion: float = 0.0
+    events: int = 0
+
+    @property
+    def first_event_ms(self) -> Optional[float]:
+        return self.first_event * 1000 if self.first_event is not None else None
+
+    @property
+    def completion_ms(self) -> float:
+        return self.completion * 1000
+
+    def summary(self) -> str:
+        first = f"{self.first_event_ms:.0f}ms" if self.first_event is not None else "n/a"
+        return f"first event {first}, complete {self.completion_ms:.0f}ms, {self.events} event(s)"
+
+
+def render_event(event) -> Optional[str]:
+    """A display line for one streamed event: a status change, an artifact chunk or a message."""
+    if isinstance(event, Message):
+        return get_message_text(event)
+    task, update = event
+    if isinstance(update, TaskStatusUpdateEvent):
+        text = get_message_text(update.status.message) if update.status.message else ''
+        return f"[{update.status.state.value}] {text}".rstrip()
+    if isinstance(update, TaskArtifactUpdateEvent):
+        return get_artifact_text(update.artifact) or None
+    return f"[{task.status.state.value}]"
+
+
+def task_text(task: Task) -> str:
+    """The answer carried by a task: its artifacts, else its status message, else the last agent message."""
+    if task.artifacts:
+        text = "\n".join(filter(None, (get_artifact_text(artifact) for artifact in task.artifacts)))
+        if text:
+            return text
+    if task.status.message:
+        text = get_message_text(task.status.message)
+        if text:
+            return text
+    for message in reversed(task.history or []):
+        if message.role == Role.agent:
+            return get_message_text(message)
+    return ""
+
+
+async def stream_message(
+    client: Client,
+    message: Message,
+    agent: str = '',
+    on_event: Optional[Callable[[str], None]] = None,
+) -> Tuple[str, CallTiming]:
+    """Send ``message`` and consume the agent's events as they arrive.
+
+    ``on_event`` receives a rendered line for every task status or
+    artifact update, so callers can show partial results while the agent
+    works. Returns the final answer text and the call's timing.
+    """
+    timing = CallTiming(agent=agent, streaming=True)
+    text = ""
+    start = time.perf_counter()
+    async for event in client.send_message(message):
+        if timing.first_event is None:
+            timing.first_event = time.perf_counter() - start
+        timing.events += 1
+        if isinstance(event, Message):
+            # A message is the complete answer, not a partial update
+            text = get_message_text(event)
+            continue
+        if on_event is not None:
+            line = render_event(event)
+            if line:
+                on_event(line)
+        text = task_text(event[0]) or text
+    timing.completion = time.perf_counter() - start
+    return text, timing
@@ -0,0 +1,416 @@
+"""Task store backends - Durable and bounded alternatives to InMemoryTaskStore."""
+
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qsl
+
+from a2a.server.context import ServerCallContext
+from a2a.server.tasks import (
+    InMemoryPushNotificationConfigStore,
+    InMemoryTaskStore,
+    PushNotificationConfigStore,
+    TaskStore,
+)
+from a2a.types import PushNotificationConfig, Task, TaskState
+
+
+TASK_STORE_HELP = (
+    "Task store backend: 'memory' (default), "
+    "'bounded[?max_tasks=<n>&max_bytes=<n>&terminal_ttl=<seconds>&history_limit=<n>]' "
+    "or 'sqlite:<path>[?flush_interval=<seconds>&batch_size=<n>]'."
+)
+
+TERMINAL_STATES = frozenset({
+    TaskState.completed,
+    TaskState.canceled,
+    TaskState.failed,
+    TaskState.rejected,
+})
+
+# Minimum seconds between two SELECT COUNT(*) refreshes of SqliteTaskStore.count()
+COUNT_REFRESH_INTERVAL = 1.0
+
+logger = logging.getLogger(__name__)
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    # Several worker processes may share one database file.
+    conn.execute('PRAGMA busy_timeout=5000')
+    return conn
+
+
+class SqliteTaskStore(TaskStore):
+    """Durable task store backed by SQLite in WAL mode.
+
+    Saves are buffered and written in batches, one transaction per flush,
+    either every ``flush_interval`` seconds or once ``batch_size`` tasks
+    are pending. Reads see buffered tasks immediately. A ``flush_interval``
+    of 0 writes every save through synchronously.
+    """
+
+    def __init__(self, path: str, flush_interval: float = 0.05, batch_size: int = 256):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._conn = _connect(path)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS tasks ('
+            ' id TEXT PRIMARY KEY,'
+            ' context_id TEXT NOT NULL,'
+            ' state TEXT NOT NULL,'
+            ' updated_at REAL NOT NULL,'
+            ' data TEXT NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS tasks_context_id ON tasks (context_id)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS tasks_updated_at ON tasks (updated_at)')
+        self._db_lock = threading.Lock()
+        self._pending: Dict[str, Task] = {}
+        self._flushing: Dict[str, Task] = {}
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_requested: Optional[asyncio.Event] = None
+        self._has_pending: Optional[asyncio.Event] = None
+        self._stored = self._count_stored()
+        self._counted_at = time.monotonic()
+        self._recount: Optional[asyncio.Task] = None
+
+    def _write(self, tasks) -> None:
+        rows = [
+            (task.id, task.context_id, task.status.state.value, time.time(),
+             task.model_dump_json(exclude_none=True))
+            for task in tasks
+        ]
+        with self._db_lock:
+            self._conn.execute('BEGIN')
+            try:
+                self._conn.executemany(
+                    'INSERT INTO tasks (id, context_id, state, updated_at, data) '
+                    'VALUES (?, ?, ?, ?, ?) '
+                    'ON CONFLICT(id) DO UPDATE SET context_id=excluded.context_id, '
+                    'state=excluded.state, updated_at=excluded.updated_at, data=excluded.data',
+                    rows,
+                )
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+
+    def _read(self, task_id: str) -> Optional[str]:
+        with self._db_lock:
+            row = self._conn.execute('SELECT data FROM tasks WHERE id = ?', (task_id,)).fetchone()
+        return row[0] if row else None
+
+    def _remove(self, task_id: str) -> None:
+        with self._db_lock:
+            self._conn.execute('DELETE FROM tasks WHERE id = ?', (task_id,))
+
+    def _count_stored(self) -> int:
+        with self._db_lock:
+            return self._conn.execute('SELECT COUNT(*) FROM tasks').fetchone()[0]
+
+    async def flush(self) -> None:
+        """Write all buffered tasks to the database."""
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            self._flushing, self._pending = self._pending, {}
+            try:
+                await asyncio.to_thread(self._write, list(self._flushing.values()))
+            except Exception:
+                # Keep the batch so the next flush retries it.
+                self._pending = {**self._flushing, **self._pending}
+                raise
+            finally:
+                self._flushing = {}
+
+    async def _flush_loop(self) -> None:
+        while True:
+            # Sleep until something is buffered, then let the batch fill up
+            await self._has_pending.wait()
+            try:
+                await asyncio.wait_for(self._flush_requested.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+            self._has_pending.clear()
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception(f"Failed to flush tasks to {self.path}")
+                self._has_pending.set()
+
+    def _ensure_flusher(self) -> None:
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_requested = asyncio.Event()
+            self._has_pending = asyncio.Event()
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def save(self, task: Task, context: Optional[ServerCallContext] = None) -> None:
+        if self.flush_interval <= 0:
+            await asyncio.to_thread(self._write, [task])
+            return
+        self._pending[task.id] = task.model_copy(deep=True)
+        self._ensure_flusher()
+        self._has_pending.set()
+        if len(self._pending) >= self.batch_size:
+            self._flush_requested.set()
+
+    async def get(self, task_id: str, context: Optional[ServerCallContext] = None) -> Optional[Task]:
+        task = self._pending.get(task_id) or self._flushing.get(task_id)
+        if task is not None:
+            return task.model_copy(deep=True)
+        data = await asyncio.to_thread(self._read, task_id)
+        return Task.model_validate_json(data) if data else None
+
+    async def delete(self, task_id: str, context: Optional[ServerCallContext] = None) -> None:
+        async with self._flush_lock:
+            self._pending.pop(task_id, None)
+            await asyncio.to_thread(self._remove, task_id)
+
+    def count(self) -> int:
+        """Number of tasks in the database as of the last refresh.
+
+        Never queries on the calling thread: a stale count starts a
+        refresh in a worker thread, at most every COUNT_REFRESH_INTERVAL
+        seconds, and the next call sees its result. Tasks still buffered
+        show up once they are flushed.
+        """
+        if time.monotonic() - self._counted_at >= COUNT_REFRESH_INTERVAL and (
+            self._recount is None or self._recount.done()
+        ):
+            try:
+                self._recount = asyncio.get_running_loop().create_task(self._refresh_count())
+            except RuntimeError:
+                pass
+        return self._stored
+
+    async def _refresh_count(self) -> None:
+        self._counted_at = time.monotonic()
+        try:
+            self._stored = await asyncio.to_thread(self._count_stored)
+        except Exception:
+            logger.exception(f"Failed to count tasks in {self.path}")
+
+    async def close(self) -> None:
+        """Flush buffered tasks and close the database."""
+        for task in (self._flush_task, self._recount):
+            if task is not None:
+                task.cancel()
+        await self.flush()
+        self._conn.close()
+
+
+class SqlitePushNotificationConfigStore(PushNotificationConfigStore):
+    """Push notification configs kept in SQLite so every worker process sees them."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = _connect(path)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS push_configs ('
+            ' task_id TEXT NOT NULL,'
+            ' config_id TEXT NOT NULL,'
+            ' data TEXT NOT NULL,'
+            ' PRIMARY KEY (task_id, config_id))'
+        )
+        self._db_lock = threading.Lock()
+
+    def _execute(self, sql: str, params=()) -> list:
+        with self._db_lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    async def set_info(self, task_id: str, notification_config: PushNotificationConfig) -> None:
+        if notification_config.id is None:
+            notification_config.id = task_id
+        await asyncio.to_thread(
+            self._execute,
+            'INSERT OR REPLACE INTO push_configs (task_id, config_id, data) VALUES (?, ?, ?)',
+            (task_id, notification_config.id, notification_config.model_dump_json(exclude_none=True)),
+        )
+
+    async def get_info(self, task_id: str) -> list:
+        rows = await asyncio.to_thread(
+            self._execute,
+            'SELECT data FROM push_configs WHERE task_id = ? ORDER BY rowid',
+            (task_id,),
+        )
+        return [PushNotificationConfig.model_validate_json(row[0]) for row in rows]
+
+    async def delete_info(self, task_id: str, config_id: Optional[str] = None) -> None:
+        await asyncio.to_thread(
+            self._execute,
+            'DELETE FROM push_configs WHERE task_id = ? AND config_id = ?',
+            (task_id, config_id if config_id is not None else task_id),
+        )
+
+    async def close(self) -> None:
+        self._conn.close()
+
+
+class BoundedInMemoryTaskStore(TaskStore):
+    """In-memory task store with a task count limit and a byte budget.
+
+    Tasks that reach a terminal state expire after ``terminal_ttl``
+    seconds. When the store is over ``max_tasks`` or ``max_bytes``, the
+    least recently used terminal tasks are evicted; tasks that are still
+    running are never evicted, so a store full of them stays over budget
+    (and logs a warning) until they finish. With ``history_limit`` set,
+    only the last N history messages of each task are kept. Sizes are
+    approximated by the serialized JSON length of each task.
+    """
+
+    def __init__(
+        self,
+        max_tasks: int = 10000,
+        max_bytes: int = 64 * 1024 * 1024,
+        terminal_ttl: float = 3600.0,
+        history_limit: Optional[int] = None,
+    ):
+        self.max_tasks = max_tasks
+        self.max_bytes = max_bytes
+        self.terminal_ttl = terminal_ttl
+        self.history_limit = history_limit
+        # task_id -> (task, approximate size)
+        self._tasks: Dict[str, Tuple[Task, int]] = {}
+        # task_id -> time the task reached a terminal state; ordered by that time.
+        self._terminal: "OrderedDict[str, float]" = OrderedDict()
+        # Terminal task ids ordered by last access, for eviction.
+        self._terminal_lru: "OrderedDict[str, None]" = OrderedDict()
+        self.bytes = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._over_budget = False
+        self.lock = asyncio.Lock()
+
+    def _remove(self, task_id: str) -> None:
+        _, size = self._tasks.pop(task_id)
+        self.bytes -= size
+        self._terminal.pop(task_id, None)
+        self._terminal_lru.pop(task_id, None)
+
+    def _expire(self, now: float) -> None:
+        while self._terminal:
+            task_id, finished_at = next(iter(self._terminal.items()))
+            if now - finished_at < self.terminal_ttl:
+                break
+            self._remove(task_id)
+            self.expirations += 1
+
+    def _over(self) -> bool:
+        return len(self._tasks) > self.max_tasks or self.bytes > self.max_bytes
+
+    def _evict(self) -> None:
+        while self._over() and self._terminal_lru:
+            self._remove(next(iter(self._terminal_lru)))
+            self.evictions += 1
+        over = self._over()
+        if over and not self._over_budget:
+            logger.warning(
+                f"⚠️ Task store over budget with only running tasks: "
+                f"{len(self._tasks)} tasks, {self.bytes} bytes"
+            )
+        self._over_budget = over
+
+    async def save(self, task: Task, context: Optional[ServerCallContext] = None) -> None:
+        if self.history_limit is not None and task.history and len(task.history) > self.history_limit:
+            history = task.history[-self.history_limit:] if self.history_limit > 0 else []
+            task = task.model_copy(update={'history': history})
+        size = len(task.model_dump_json(exclude_none=True))
+        now = time.monotonic()
+        async with self.lock:
+            if task.id in self._tasks:
+                _, old_size = self._tasks[task.id]
+                self.bytes -= old_size
+            self._tasks[task.id] = (task, size)
+            self.bytes += size
+            if task.status.state in TERMINAL_STATES:
+                self._terminal.setdefault(task.id, now)
+                self._terminal_lru[task.id] = None
+                self._terminal_lru.move_to_end(task.id)
+            else:
+                self._terminal.pop(task.id, None)
+                self._terminal_lru.pop(task.id, None)
+            self._expire(now)
+            self._evict()
+
+    async def get(self, task_id: str, context: Optional[ServerCallContext] = None) -> Optional[Task]:
+        async with self.lock:
+            self._expire(time.monotonic())
+            entry = self._tasks.get(task_id)
+            if entry is None:
+                return None
+            if task_id in self._terminal_lru:
+                self._terminal_lru.move_to_end(task_id)
+            return entry[0]
+
+    async def delete(self, task_id: str, context: Optional[ServerCallContext] = None) -> None:
+        async with self.lock:
+            if task_id in self._tasks:
+                self._remove(task_id)
+
+    def count(self) -> int:
+        """Number of tasks currently held."""
+        return len(self._tasks)
+
+    def stats(self) -> dict:
+        """Live task counts and approximate memory use."""
+        return {
+            'tasks': len(self._tasks),
+            'terminal_tasks': len(self._terminal),
+            'bytes': self.bytes,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'over_budget': self._over_budget,
+        }
+
+
+def parse_task_store_spec(spec: str):
+    kind, _, rest = spec.partition(':')
+    target, _, query = rest.partition('?')
+    if not query and '?' in kind:
+        kind, _, query = kind.partition('?')
+    return kind.strip().lower(), target, dict(parse_qsl(query))
+
+
+def build_task_store(spec: str = 'memory') -> TaskStore:
+    """Create a task store from a ``--task-store`` specification."""
+    kind, target, options = parse_task_store_spec(spec)
+    if kind == 'memory':
+        return InMemoryTaskStore()
+    if kind == 'bounded':
+        history_limit = options.get('history_limit')
+        return BoundedInMemoryTaskStore(
+            max_tasks=int(options.get('max_tasks', 10000)),
+            max_bytes=int(options.get('max_bytes', 64 * 1024 * 1024)),
+            terminal_ttl=float(options.get('terminal_ttl', 3600.0)),
+            history_limit=int(history_limit) if history_limit is not None else None,
+        )
+    if kind == 'sqlite':
+        if not target:
+            raise ValueError("sqlite task store needs a path, e.g. 'sqlite:tasks.db'")
+        return SqliteTaskStore(
+            target,
+            flush_interval=float(options.get('flush_interval', 0.05)),
+            batch_size=int(options.get('batch_size', 256)),
+        )
+    raise ValueError(f"Unknown task store '{spec}'. {TASK_STORE_HELP}")
+
+
+def build_push_config_store(spec: str = 'memory') -> PushNotificationConfigStore:
+    """Create the push config store matching a ``--task-store`` specification.
+
+    SQLite task stores keep push configs in the same database file, so all
+    worker processes share them; every other backend keeps them in memory.
+    """
+    kind, target, _ = parse_task_store_spec(spec)
+    if kind == 'sqlite' and target:
+        return SqlitePushNotificationConfigStore(target)
+    return InMemoryPushNotificationConfigStore()
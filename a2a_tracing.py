@@ -0,0 +1,456 @@
+"""Cross-agent tracing - Trace/span IDs in A2A message metadata and per-hop timing."""
+
+import atexit
+import contextvars
+import json
+import logging
+import math
+import os
+import re
+import secrets
+import threading
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass, field, fields
+from typing import Deque, Dict, List, Optional, Tuple
+
+import click
+import httpx
+
+from a2a.client import Client, ClientCallContext
+from a2a.server.agent_execution import AgentExecutor, RequestContext
+from a2a.server.events import EventQueue
+from a2a.types import Message
+
+try:
+    import fcntl
+except ImportError:  # Windows: rotation is not coordinated across processes
+    fcntl = None
+
+
+TRACE_FILE_ENV = 'A2A_TRACE_FILE'
+DEFAULT_TRACE_FILE = os.path.join('.a2a', 'traces.jsonl')
+TRACE_FILE_MAX_BYTES = 10 * 1024 * 1024
+TRACE_FLUSH_INTERVAL = 0.5
+TRACEPARENT = 'traceparent'
+SENT_AT = 'trace_sent_at'
+SENT_AT_HEADER = 'a2a-trace-sent-at'
+IN_MEMORY_SPANS = 10000
+
+logger = logging.getLogger(__name__)
+
+_TRACEPARENT = re.compile(r"^[0-9a-f]{2}-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+
+_current_span: contextvars.ContextVar[Optional['Span']] = contextvars.ContextVar('a2a_span', default=None)
+
+
+@dataclass
+class Span:
+    """One hop of a traced request: a client call to an agent or an agent's execution.
+
+    Server spans split their time into ``queue_ms`` (from the caller
+    sending the request until the executor started), ``downstream_ms``
+    (wall time spent waiting on calls to other agents, overlapping calls
+    counted once) and ``execution_ms`` (the rest).
+    """
+
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    name: str
+    kind: str
+    agent: str = ''
+    start: float = field(default_factory=time.time)
+    duration_ms: float = 0.0
+    queue_ms: Optional[float] = None
+    downstream_ms: Optional[float] = None
+    execution_ms: Optional[float] = None
+    status: str = 'ok'
+    _started: float = field(default_factory=time.perf_counter, repr=False)
+    _parent: Optional['Span'] = field(default=None, repr=False)
+    _downstream: List[Tuple[float, float]] = field(default_factory=list, repr=False)
+
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def to_dict(self) -> dict:
+        return {f.name: getattr(self, f.name) for f in fields(self) if not f.name.startswith('_')}
+
+
+def _new_id(nbytes: int) -> str:
+    return secrets.token_hex(nbytes)
+
+
+def parse_traceparent(value) -> Optional[Tuple[str, str]]:
+    """(trace id, parent span id) from a W3C ``traceparent`` value; None when it is not one."""
+    match = _TRACEPARENT.match(value.strip()) if isinstance(value, str) else None
+    return match.groups() if match else None
+
+
+def parse_sent_at(value) -> Optional[float]:
+    """The caller's send time in epoch seconds; None when ``value`` is not a finite number."""
+    try:
+        sent_at = float(value)
+    except (TypeError, ValueError):
+        return None
+    return sent_at if math.isfinite(sent_at) else None
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def start_span(
+    name: str,
+    kind: str,
+    agent: str = '',
+    parent: Optional[Span] = None,
+    remote_parent: Optional[Tuple[str, str]] = None,
+) -> Span:
+    """Start a span under ``parent`` (default: the current span), a remote parent, or as a new trace."""
+    parent = parent or (None if remote_parent else current_span())
+    if parent is not None:
+        trace_id, parent_id = parent.trace_id, parent.span_id
+    elif remote_parent is not None:
+        trace_id, parent_id = remote_parent
+    else:
+        trace_id, parent_id = _new_id(16), None
+    return Span(trace_id, _new_id(8), parent_id, name, kind, agent, _parent=parent)
+
+
+def _covered(intervals: List[Tuple[float, float]]) -> float:
+    """Total length of the union of ``intervals``."""
+    total, end = 0.0, float('-inf')
+    for start, stop in sorted(intervals):
+        if stop > end:
+            total += stop - max(start, end)
+            end = stop
+    return total
+
+
+def finish_span(span: Span, status: str = 'ok') -> None:
+    finished = time.perf_counter()
+    span.status = status
+    span.duration_ms = (finished - span._started) * 1000
+    if span.kind == 'server':
+        span.downstream_ms = _covered(span._downstream) * 1000
+        span.execution_ms = span.duration_ms - span.downstream_ms
+    if span._parent is not None:
+        span._parent._downstream.append((span._started, finished))
+    try:
+        get_exporter().export(span)
+    except Exception:
+        logger.exception("Exporting span failed")
+
+
+class InMemorySpanExporter:
+    """Keeps the most recent spans in memory."""
+
+    def __init__(self, max_spans: int = IN_MEMORY_SPANS):
+        self.spans: Deque[dict] = deque(maxlen=max_spans)
+
+    def export(self, span: Span) -> None:
+        self.spans.append(span.to_dict())
+
+    def load(self) -> List[dict]:
+        return list(self.spans)
+
+
+class JsonlSpanExporter:
+    """Appends spans to a JSONL file shared by every agent process on the host.
+
+    ``export`` only buffers the span; a background thread appends the
+    buffer every ``flush_interval`` seconds, so the event loop never
+    waits on the disk. When more than ``max_buffered`` spans are waiting
+    the oldest are dropped. Writers hold a lock on ``<path>.lock`` while
+    appending, and the file is rotated to ``<path>.1`` once it grows past
+    ``max_bytes``.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = TRACE_FILE_MAX_BYTES,
+        flush_interval: float = TRACE_FLUSH_INTERVAL,
+        max_buffered: int = IN_MEMORY_SPANS,
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.flush_interval = flush_interval
+        self._buffer: Deque[dict] = deque(maxlen=max_buffered)
+        self._write_lock = threading.Lock()
+        self._writer: Optional[threading.Thread] = None
+
+    def export(self, span: Span) -> None:
+        self._buffer.append(span.to_dict())
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._write_loop, name='a2a-span-writer', daemon=True)
+            self._writer.start()
+            atexit.register(self.flush)
+
+    def _write_loop(self) -> None:
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except Exception:
+                logger.exception(f"Writing spans to {self.path} failed")
+
+    def flush(self) -> None:
+        """Append every buffered span to the file."""
+        with self._write_lock:
+            spans = []
+            while self._buffer:
+                spans.append(self._buffer.popleft())
+            if not spans:
+                return
+            lines = ''.join(json.dumps(span, separators=(',', ':')) + '\n' for span in spans)
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            # Other processes append to and rotate the same file
+            with open(f"{self.path}.lock", 'a') as lock:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_EX)
+                with open(self.path, 'a') as f:
+                    f.write(lines)
+                    size = f.tell()
+                if size > self.max_bytes:
+                    os.replace(self.path, f"{self.path}.1")
+
+    def load(self) -> List[dict]:
+        spans = []
+        for path in (f"{self.path}.1", self.path):
+            try:
+                with open(path) as f:
+                    spans.extend(json.loads(line) for line in f if line.strip())
+            except (OSError, ValueError):
+                continue
+        return spans
+
+
+_exporter = None
+
+
+def trace_file() -> str:
+    return os.environ.get(TRACE_FILE_ENV) or DEFAULT_TRACE_FILE
+
+
+def get_exporter():
+    """The process-wide exporter: in memory, or JSONL at $A2A_TRACE_FILE when that is set
+    (e.g. A2A_TRACE_FILE=.a2a/traces.jsonl for ``python a2a_tracing.py show``)."""
+    global _exporter
+    if _exporter is None:
+        path = os.environ.get(TRACE_FILE_ENV)
+        _exporter = JsonlSpanExporter(path) if path else InMemorySpanExporter()
+    return _exporter
+
+
+def set_exporter(exporter) -> None:
+    global _exporter
+    _exporter = exporter
+
+
+def inject_trace(message: Message, span: Span) -> Message:
+    """A copy of ``message`` carrying ``span`` as the parent of the receiving agent's span."""
+    metadata = {**(message.metadata or {}), TRACEPARENT: span.traceparent(), SENT_AT: time.time()}
+    return message.model_copy(update={'metadata': metadata})
+
+
+def _with_trace_header(context: Optional[ClientCallContext], span: Span) -> ClientCallContext:
+    """Call context adding a ``traceparent`` header, so the transport hook leaves the request alone."""
+    state = dict(context.state) if context else {}
+    http_kwargs = dict(state.get('http_kwargs') or {})
+    http_kwargs['headers'] = {**(http_kwargs.get('headers') or {}), TRACEPARENT: span.traceparent()}
+    state['http_kwargs'] = http_kwargs
+    return ClientCallContext(state=state)
+
+
+class TracedClient(Client):
+    """Wraps an A2A client so each message starts a client span and carries its trace context."""
+
+    def __init__(self, client: Client, agent: str):
+        super().__init__()
+        self.client = client
+        self.agent = agent
+
+    async def send_message(self, request, *, context=None, request_metadata=None, extensions=None):
+        span = start_span(f"send {self.agent}", 'client', self.agent)
+        status = 'error'
+        try:
+            async for event in self.client.send_message(
+                inject_trace(request, span), context=_with_trace_header(context, span),
+                request_metadata=request_metadata, extensions=extensions,
+            ):
+                yield event
+            status = 'ok'
+        finally:
+            finish_span(span, status)
+
+    async def get_task(self, request, *, context=None, extensions=None):
+        return await self.client.get_task(request, context=context, extensions=extensions)
+
+    async def cancel_task(self, request, *, context=None, extensions=None):
+        return await self.client.cancel_task(request, context=context, extensions=extensions)
+
+    async def set_task_callback(self, request, *, context=None, extensions=None):
+        return await self.client.set_task_callback(request, context=context, extensions=extensions)
+
+    async def get_task_callback(self, request, *, context=None, extensions=None):
+        return await self.client.get_task_callback(request, context=context, extensions=extensions)
+
+    async def resubscribe(self, request, *, context=None, extensions=None):
+        async for event in self.client.resubscribe(request, context=context, extensions=extensions):
+            yield event
+
+    async def get_card(self, *, context=None, extensions=None, signature_verifier=None):
+        return await self.client.get_card(
+            context=context, extensions=extensions, signature_verifier=signature_verifier
+        )
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+
+class TracingAgentExecutor(AgentExecutor):
+    """Wraps an executor in a server span continuing the caller's trace.
+
+    The parent comes from the message metadata, or from the
+    ``traceparent`` header for callers that only set headers. While the
+    executor runs its span is current, so calls it makes to other agents
+    (through TracedClient or the shared HTTP transport) become its children.
+    """
+
+    def __init__(self, executor: AgentExecutor, agent: str):
+        self.executor = executor
+        self.agent = agent
+
+    def _parent(self, context: RequestContext) -> Tuple[Optional[Tuple[str, str]], Optional[float]]:
+        # Both come from the caller, so anything malformed is ignored
+        metadata = (context.message.metadata if context.message else None) or {}
+        remote_parent = parse_traceparent(metadata.get(TRACEPARENT))
+        if remote_parent is not None:
+            return remote_parent, parse_sent_at(metadata.get(SENT_AT))
+        headers = context.call_context.state.get('headers', {}) if context.call_context else {}
+        remote_parent = parse_traceparent(headers.get(TRACEPARENT))
+        if remote_parent is None:
+            return None, None
+        return remote_parent, parse_sent_at(headers.get(SENT_AT_HEADER))
+
+    async def execute(self, context: RequestContext, event_queue: EventQueue) -> None:
+        remote_parent, sent_at = self._parent(context)
+        span = start_span(f"execute {self.agent}", 'server', self.agent, remote_parent=remote_parent)
+        if sent_at is not None:
+            span.queue_ms = max(0.0, (span.start - sent_at) * 1000)
+        token = _current_span.set(span)
+        status = 'error'
+        try:
+            await self.executor.execute(context, event_queue)
+            status = 'ok'
+        finally:
+            _current_span.reset(token)
+            finish_span(span, status)
+
+    async def cancel(self, context: RequestContext, event_queue: EventQueue) -> None:
+        await self.executor.cancel(context, event_queue)
+
+
+async def inject_trace_headers(request: httpx.Request) -> None:
+    """httpx request hook propagating the current span to outgoing A2A calls.
+
+    Covers executors that call other agents without a TracedClient: the
+    request gets its own client span, finished by ``finish_http_span``
+    when the response headers arrive. Requests that already carry a
+    ``traceparent`` are left alone.
+    """
+    span = current_span()
+    if span is None or request.method != 'POST' or TRACEPARENT in request.headers:
+        return
+    span = start_span(f"POST {request.url.host}:{request.url.port}", 'client', span.agent)
+    request.extensions['a2a_span'] = span
+    request.headers[TRACEPARENT] = span.traceparent()
+    request.headers[SENT_AT_HEADER] = repr(time.time())
+
+
+async def finish_http_span(response: httpx.Response) -> None:
+    span = response.request.extensions.pop('a2a_span', None)
+    if span is not None:
+        finish_span(span, 'ok' if response.status_code < 500 else 'error')
+
+
+def group_traces(spans: List[dict]) -> Dict[str, List[dict]]:
+    traces = defaultdict(list)
+    for span in spans:
+        traces[span['trace_id']].append(span)
+    return traces
+
+
+def _root(spans: List[dict]) -> dict:
+    ids = {span['span_id'] for span in spans}
+    roots = [span for span in spans if span['parent_id'] not in ids]
+    return min(roots or spans, key=lambda span: span['start'])
+
+
+def format_trace(spans: List[dict]) -> List[str]:
+    """One line per hop, children indented under their parent and ordered by start time."""
+    children = defaultdict(list)
+    for span in spans:
+        children[span['parent_id']].append(span)
+    root = _root(spans)
+    trace_start = root['start']
+    lines = []
+
+    def visit(span: dict, depth: int) -> None:
+        offset = (span['start'] - trace_start) * 1000
+        detail = ''
+        if span['kind'] == 'server':
+            parts = [f"exec {span['execution_ms']:.1f}ms", f"downstream {span['downstream_ms']:.1f}ms"]
+            if span.get('queue_ms') is not None:
+                parts.insert(0, f"queue {span['queue_ms']:.1f}ms")
+            detail = f" ({', '.join(parts)})"
+        flag = '' if span['status'] == 'ok' else ' ❌'
+        lines.append(f"{'  ' * depth}{'🖥️' if span['kind'] == 'server' else '📤'} {span['name']} "
+                     f"+{offset:.1f}ms {span['duration_ms']:.1f}ms{detail}{flag}")
+        for child in sorted(children.get(span['span_id'], []), key=lambda s: s['start']):
+            visit(child, depth + 1)
+
+    visit(root, 0)
+    return lines
+
+
+@click.group()
+def cli():
+    """Inspect traces recorded by agents and clients run with $A2A_TRACE_FILE set."""
+
+
+@cli.command()
+@click.argument('trace_id', required=False)
+def show(trace_id):
+    """Break one trace (default: the latest) down hop by hop."""
+    traces = group_traces(JsonlSpanExporter(trace_file()).load())
+    if not traces:
+        print(f"❌ No traces recorded in {trace_file()}")
+        return
+    if trace_id:
+        matches = [tid for tid in traces if tid.startswith(trace_id)]
+        if not matches:
+            print(f"❌ Trace '{trace_id}' not found")
+            return
+        trace_id = matches[0]
+    else:
+        trace_id = max(traces, key=lambda tid: _root(traces[tid])['start'])
+    print(f"🔎 Trace {trace_id}")
+    for line in format_trace(traces[trace_id]):
+        print(f"  {line}")
+
+
+@cli.command()
+@click.option('--limit', 'limit', default=10)
+def slowest(limit):
+    """List the slowest recorded traces."""
+    traces = group_traces(JsonlSpanExporter(trace_file()).load())
+    roots = sorted((_root(spans) for spans in traces.values()), key=lambda s: s['duration_ms'], reverse=True)
+    for root in roots[:limit]:
+        print(f"🐢 {root['duration_ms']:8.1f}ms  {root['trace_id']}  {root['name']}")
+
+
+if __name__ == '__main__':
+    cli()
@@ -0,0 +1,186 @@
+"""Shared HTTP transport - Tuned httpx clients with connection pool metrics."""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+import httpx
+
+from a2a.utils.constants import AGENT_CARD_WELL_KNOWN_PATH
+
+from a2a_tracing import finish_http_span, inject_trace_headers
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TransportSettings:
+    """Pool, keepalive, protocol and timeout settings for A2A HTTP clients."""
+
+    max_connections: int = 100
+    max_keepalive_connections: int = 50
+    keepalive_expiry: float = 60.0
+    http2: bool = False
+    connect_timeout: float = 5.0
+    read_timeout: float = 30.0
+    write_timeout: float = 30.0
+    pool_timeout: float = 10.0
+
+    @classmethod
+    def from_env(cls) -> 'TransportSettings':
+        """Settings overridden by A2A_HTTP_MAX_CONNECTIONS, A2A_HTTP_MAX_KEEPALIVE,
+        A2A_HTTP_KEEPALIVE_EXPIRY, A2A_HTTP2, A2A_HTTP_CONNECT_TIMEOUT,
+        A2A_HTTP_READ_TIMEOUT, A2A_HTTP_WRITE_TIMEOUT and A2A_HTTP_POOL_TIMEOUT."""
+        env = os.environ
+        defaults = cls()
+        return cls(
+            max_connections=int(env.get('A2A_HTTP_MAX_CONNECTIONS', defaults.max_connections)),
+            max_keepalive_connections=int(env.get('A2A_HTTP_MAX_KEEPALIVE', defaults.max_keepalive_connections)),
+            keepalive_expiry=float(env.get('A2A_HTTP_KEEPALIVE_EXPIRY', defaults.keepalive_expiry)),
+            http2=env.get('A2A_HTTP2', '').lower() in ('1', 'true', 'yes'),
+            connect_timeout=float(env.get('A2A_HTTP_CONNECT_TIMEOUT', defaults.connect_timeout)),
+            read_timeout=float(env.get('A2A_HTTP_READ_TIMEOUT', defaults.read_timeout)),
+            write_timeout=float(env.get('A2A_HTTP_WRITE_TIMEOUT', defaults.write_timeout)),
+            pool_timeout=float(env.get('A2A_HTTP_POOL_TIMEOUT', defaults.pool_timeout)),
+        )
+
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def timeout(self) -> httpx.Timeout:
+        return httpx.Timeout(
+            connect=self.connect_timeout,
+            read=self.read_timeout,
+            write=self.write_timeout,
+            pool=self.pool_timeout,
+        )
+
+
+class PoolMetrics:
+    """Counts pooled vs new connections and time spent waiting for a connection.
+
+    Fed by the httpcore ``trace`` extension: a request that opens a TCP
+    connection is a new connection, any other one reused a pooled
+    connection. Queue wait is the time from sending the request until
+    its headers go out, minus the time spent connecting.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.pool_hits = 0
+        self.new_connections = 0
+        self.connect_time = 0.0
+        self.queue_wait_total = 0.0
+        self.queue_wait_max = 0.0
+
+    async def on_request(self, request: httpx.Request) -> None:
+        """httpx request hook attaching a per-request trace callback."""
+        start = time.perf_counter()
+        state = {'connect_started': None, 'connect_time': 0.0, 'sent': False}
+
+        async def trace(event: str, info: dict) -> None:
+            if event == 'connection.connect_tcp.started':
+                state['connect_started'] = time.perf_counter()
+            elif event in ('connection.connect_tcp.complete', 'connection.start_tls.complete'):
+                state['connect_time'] = time.perf_counter() - state['connect_started']
+            elif event.endswith('send_request_headers.started') and not state['sent']:
+                state['sent'] = True
+                self._record(time.perf_counter() - start, state)
+
+        request.extensions['trace'] = trace
+
+    def _record(self, elapsed: float, state: dict) -> None:
+        self.requests += 1
+        if state['connect_started'] is None:
+            self.pool_hits += 1
+        else:
+            self.new_connections += 1
+            self.connect_time += state['connect_time']
+        wait = max(0.0, elapsed - state['connect_time'])
+        self.queue_wait_total += wait
+        self.queue_wait_max = max(self.queue_wait_max, wait)
+
+    def stats(self) -> dict:
+        return {
+            'requests': self.requests,
+            'pool_hits': self.pool_hits,
+            'new_connections': self.new_connections,
+            'hit_rate': self.pool_hits / self.requests if self.requests else 0.0,
+            'avg_connect_ms': self.connect_time / self.new_connections * 1000 if self.new_connections else 0.0,
+            'avg_queue_wait_ms': self.queue_wait_total / self.requests * 1000 if self.requests else 0.0,
+            'max_queue_wait_ms': self.queue_wait_max * 1000,
+        }
+
+    def summary(self) -> str:
+        stats = self.stats()
+        return (f"{stats['requests']} requests, {stats['pool_hits']} pool hits, "
+                f"{stats['new_connections']} new connections, "
+                f"avg queue wait {stats['avg_queue_wait_ms']:.2f}ms (max {stats['max_queue_wait_ms']:.2f}ms)")
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def create_http_client(
+    settings: Optional[TransportSettings] = None,
+    metrics: Optional[PoolMetrics] = None,
+) -> httpx.AsyncClient:
+    """Build a tuned AsyncClient; its PoolMetrics is available as ``client.pool_metrics``."""
+    settings = settings or TransportSettings.from_env()
+    metrics = metrics or PoolMetrics()
+    http2 = settings.http2
+    if http2 and not _http2_available():
+        logger.warning("HTTP/2 requested but the 'h2' package is not installed; using HTTP/1.1")
+        http2 = False
+    client = httpx.AsyncClient(
+        limits=settings.limits(),
+        timeout=settings.timeout(),
+        http2=http2,
+        event_hooks={
+            'request': [metrics.on_request, inject_trace_headers],
+            'response': [finish_http_span],
+        },
+    )
+    client.pool_metrics = metrics
+    return client
+
+
+_shared_client: Optional[httpx.AsyncClient] = None
+
+
+def shared_http_client() -> httpx.AsyncClient:
+    """Process-wide client shared by every agent server in the process."""
+    global _shared_client
+    if _shared_client is None or _shared_client.is_closed:
+        _shared_client = create_http_client()
+    return _shared_client
+
+
+async def prewarm(httpx_client: httpx.AsyncClient, urls: Iterable[str]) -> int:
+    """Open pooled connections to each agent URL ahead of the first real request.
+
+    Fetches each agent card concurrently and ignores failures; returns how
+    many URLs answered.
+    """
+    async def warm(url: str) -> bool:
+        try:
+            response = await httpx_client.get(f"{url.rstrip('/')}{AGENT_CARD_WELL_KNOWN_PATH}")
+        except httpx.HTTPError:
+            return False
+        return response.status_code == 200
+
+    results = await asyncio.gather(*(warm(url) for url in dict.fromkeys(urls)))
+    return sum(results)
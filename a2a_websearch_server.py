@@ -3,22 +3,35 @@ import os
 import sys
 
 import click
-import httpx
-import uvicorn
 
 from a2a.server.apps import A2AStarletteApplication
 from a2a.server.request_handlers import DefaultRequestHandler
-from a2a.server.tasks import (
-    BasePushNotificationSender,
-    InMemoryPushNotificationConfigStore,
-    InMemoryTaskStore,
-)
 from a2a.types import (
     AgentCapabilities,
     AgentCard,
     AgentSkill,
 )
 
+from a2a_card_cache import agent_card_route
+from a2a_membership import REGISTRY_URL, RegistryLease
+from a2a_metrics import AgentMetrics, MetricsMiddleware
+from a2a_push import QueuedPushNotificationSender
+from a2a_serving import component_lifespan, run_server, server_config_from_env, shared_task_store_spec
+from a2a_task_stores import (
+    TASK_STORE_HELP,
+    build_push_config_store,
+    build_task_store,
+)
+from a2a_tracing import TracingAgentExecutor
+from a2a_search_cache import (
+    DEFAULT_MAX_BYTES,
+    DEFAULT_TTL,
+    CachingWebSearchExecutor,
+    DuckDuckGoBackend,
+    SearchResultCache,
+    StubSearchBackend,
+)
+from a2a_transport import shared_http_client
 from app.websearch_agent import WebSearchAgent
 from app.websearch_agent_executor import WebSearchAgentExecutor
 
@@ -27,71 +40,140 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def build_app(
+    host,
+    port,
+    task_store_spec='memory',
+    search_backend='agent',
+    cache_ttl=DEFAULT_TTL,
+    cache_max_bytes=DEFAULT_MAX_BYTES,
+    public_url=None,
+    registry_url=None,
+):
+    """Builds the Web Search Agent application."""
+    capabilities = AgentCapabilities(streaming=True, push_notifications=True)
+    # Enhanced skills with detailed A2A protocol information
+    skills = [
+        AgentSkill(
+            id='web_search',
+            name='Web Search',
+            description='Searches the web for information using DuckDuckGo API and returns formatted results through A2A protocol',
+            tags=['web search', 'information retrieval', 'research', 'lookup', 'a2a protocol'],
+            examples=[
+                'What is artificial intelligence?',
+                'Latest news about climate change',
+                'Python programming tutorial',
+                'Define quantum computing',
+                'How does blockchain work?'
+            ],
+        ),
+        AgentSkill(
+            id='information_retrieval',
+            name='Information Retrieval',
+            description='Retrieves and formats web-based information for other A2A agents and clients',
+            tags=['information', 'research', 'knowledge', 'facts', 'data'],
+            examples=[
+                'Find information about machine learning',
+                'Research renewable energy trends',
+                'Look up current technology news'
+            ],
+        )
+    ]
+    agent_card = AgentCard(
+        name='Web Search Agent',
+        description='A specialized A2A agent that searches the web for information using DuckDuckGo API. Provides real-time information retrieval and research capabilities to the A2A ecosystem.',
+        url=public_url or f'http://{host}:{port}/',
+        version='1.0.0',
+        default_input_modes=WebSearchAgent.SUPPORTED_CONTENT_TYPES,
+        default_output_modes=WebSearchAgent.SUPPORTED_CONTENT_TYPES,
+        capabilities=capabilities,
+        skills=skills,
+    )
+
+    # Set up the server components
+    task_store = build_task_store(task_store_spec)
+    httpx_client = shared_http_client()
+    push_config_store = build_push_config_store(task_store_spec)
+    push_sender = QueuedPushNotificationSender(
+        httpx_client=httpx_client,
+        config_store=push_config_store
+    )
+    metrics = AgentMetrics(agent_card.name)
+    metrics.track_task_store(task_store)
+    metrics.track_push_sender(push_sender)
+    # Registered with the Agent Registry for as long as the server runs
+    lease = RegistryLease(httpx_client, registry_url, agent_card) if registry_url else None
+    backends = {
+        'agent': lambda: None,
+        'duckduckgo': DuckDuckGoBackend,
+        'stub': StubSearchBackend,
+    }
+    agent_executor = CachingWebSearchExecutor(
+        WebSearchAgentExecutor(),
+        backend=backends[search_backend](),
+        cache=SearchResultCache(ttl=cache_ttl, max_bytes=cache_max_bytes),
+    )
+    metrics.track_cache('websearch', agent_executor.cache)
+    request_handler = DefaultRequestHandler(
+        agent_executor=metrics.instrument_executor(
+            TracingAgentExecutor(agent_executor, agent_card.name)
+        ),
+        task_store=task_store,
+        push_config_store=push_config_store,
+        push_sender=push_sender
+    )
+    server = A2AStarletteApplication(
+        agent_card=agent_card, 
+        http_handler=request_handler
+    )
+
+    app = server.build(
+        routes=[agent_card_route(agent_card), metrics.route()],
+        lifespan=component_lifespan(lease, push_sender, task_store, push_config_store, agent_executor),
+    )
+    app.add_middleware(MetricsMiddleware, metrics=metrics)
+    return app
+
+
+def create_app():
+    """Builds the application inside a uvicorn worker process."""
+    return build_app(**server_config_from_env())
+
+
 @click.command()
 @click.option('--host', 'host', default='localhost')
 @click.option('--port', 'port', default=8001)
-def main(host, port):
+@click.option('--task-store', 'task_store_spec', default='memory', help=TASK_STORE_HELP)
+@click.option('--search-backend', 'search_backend', default='agent',
+              type=click.Choice(['agent', 'duckduckgo', 'stub']),
+              help='Where cache misses are answered: the bundled agent, DuckDuckGo directly, or an offline stub.')
+@click.option('--cache-ttl', 'cache_ttl', default=DEFAULT_TTL,
+              help='Seconds a search result stays cached (0 disables the cache).')
+@click.option('--cache-max-bytes', 'cache_max_bytes', default=DEFAULT_MAX_BYTES,
+              help='Memory budget for cached search results.')
+@click.option('--public-url', 'public_url', default=None,
+              help='URL advertised in the agent card, e.g. when served behind a proxy.')
+@click.option('--registry-url', 'registry_url', default=REGISTRY_URL,
+              help="Agent Registry to register with under a heartbeat lease; '' to run unregistered.")
+@click.option('--workers', 'workers', default=1,
+              help='Number of worker processes; workers share task state through SQLite, '
+                   'but resubscribe and cancel only reach the worker running the task.')
+def main(host, port, search_backend, cache_ttl, cache_max_bytes, task_store_spec, public_url, registry_url, workers):
     """Starts the Web Search Agent server."""
     try:
-        capabilities = AgentCapabilities(streaming=True, push_notifications=True)
-        # Enhanced skills with detailed A2A protocol information
-        skills = [
-            AgentSkill(
-                id='web_search',
-                name='Web Search',
-                description='Searches the web for information using DuckDuckGo API and returns formatted results through A2A protocol',
-                tags=['web search', 'information retrieval', 'research', 'lookup', 'a2a protocol'],
-                examples=[
-                    'What is artificial intelligence?',
-                    'Latest news about climate change',
-                    'Python programming tutorial',
-                    'Define quantum computing',
-                    'How does blockchain work?'
-                ],
-            ),
-            AgentSkill(
-                id='information_retrieval',
-                name='Information Retrieval',
-                description='Retrieves and formats web-based information for other A2A agents and clients',
-                tags=['information', 'research', 'knowledge', 'facts', 'data'],
-                examples=[
-                    'Find information about machine learning',
-                    'Research renewable energy trends',
-                    'Look up current technology news'
-                ],
-            )
-        ]
-        agent_card = AgentCard(
-            name='Web Search Agent',
-            description='A specialized A2A agent that searches the web for information using DuckDuckGo API. Provides real-time information retrieval and research capabilities to the A2A ecosystem.',
-            url=f'http://{host}:{port}/',
-            version='1.0.0',
-            default_input_modes=WebSearchAgent.SUPPORTED_CONTENT_TYPES,
-            default_output_modes=WebSearchAgent.SUPPORTED_CONTENT_TYPES,
-            capabilities=capabilities,
-            skills=skills,
-        )
-
-        # Set up the server components
-        httpx_client = httpx.AsyncClient()
-        push_config_store = InMemoryPushNotificationConfigStore()
-        push_sender = BasePushNotificationSender(
-            httpx_client=httpx_client,
-            config_store=push_config_store
-        )
-        request_handler = DefaultRequestHandler(
-            agent_executor=WebSearchAgentExecutor(),
-            task_store=InMemoryTaskStore(),
-            push_config_store=push_config_store,
-            push_sender=push_sender
-        )
-        server = A2AStarletteApplication(
-            agent_card=agent_card, 
-            http_handler=request_handler
-        )
+        config = {
+            'host': host,
+            'port': port,
+            'task_store_spec': shared_task_store_spec(task_store_spec, 'websearch', workers),
+            'public_url': public_url,
+            'registry_url': registry_url or None,
+            'search_backend': search_backend,
+            'cache_ttl': cache_ttl,
+            'cache_max_bytes': cache_max_bytes,
+        }
 
         logger.info(f"Starting Web Search Agent server on {host}:{port}")
-        uvicorn.run(server.build(), host=host, port=port)
+        run_server('a2a_websearch_server:create_app', build_app, config, workers)
 
     except Exception as e:
         logger.error(f'An error occurred during server startup: {e}')
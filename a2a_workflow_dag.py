@@ -0,0 +1,243 @@
+"""DAG Workflow Execution - Runs independent workflow steps concurrently."""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from a2a_agent_pool import ECOSYSTEM_AGENTS, AgentClientPool
+from a2a_transport import create_http_client
+
+
+DEFAULT_MAX_CONCURRENCY = 8
+# How much of a dependency's response is substituted into a dependent query.
+MAX_CONTEXT_CHARS = 200
+
+
+@dataclass(frozen=True)
+class WorkflowStep:
+    """A single workflow step and the steps whose output it needs.
+
+    ``query`` may reference a dependency's response as ``{step_id}``.
+    """
+
+    id: str
+    agent: str
+    query: str
+    depends_on: Tuple[str, ...] = ()
+
+
+DAG_WORKFLOWS: Dict[str, List[WorkflowStep]] = {
+    'research_calculate': [
+        WorkflowStep('research', 'websearch', 'What is the golden ratio?'),
+        WorkflowStep('calculate', 'calculator', 'Calculate (1 + sqrt(5)) / 2'),
+        WorkflowStep(
+            'confirm', 'echo',
+            'Golden ratio research and calculation complete',
+            depends_on=('research', 'calculate'),
+        ),
+    ],
+    'math_research': [
+        WorkflowStep('research', 'websearch', "What is Euler's number?"),
+        WorkflowStep('calculate', 'calculator', 'Calculate e**2'),
+        WorkflowStep('applications', 'websearch', "Applications of Euler's number"),
+        WorkflowStep(
+            'summary', 'coordinator',
+            "Summarize findings about Euler's number: {research} {calculate} {applications}",
+            depends_on=('research', 'calculate', 'applications'),
+        ),
+    ],
+    'discovery_test': [
+        WorkflowStep('list', 'registry', 'list all agents'),
+        WorkflowStep('echo', 'echo', 'Test A2A protocol communication', depends_on=('list',)),
+        WorkflowStep('search', 'websearch', 'What is the A2A protocol?', depends_on=('list',)),
+        WorkflowStep('calculate', 'calculator', 'Calculate 2 + 2', depends_on=('list',)),
+        WorkflowStep(
+            'verify', 'echo',
+            'Agent verification complete',
+            depends_on=('echo', 'search', 'calculate'),
+        ),
+    ],
+    'problem_solving': [
+        WorkflowStep('research', 'websearch', 'What is compound interest?'),
+        WorkflowStep('calculate', 'calculator', 'Calculate 1000 * (1 + 0.05)**10'),
+        WorkflowStep('strategies', 'websearch', 'Investment strategies for compound growth'),
+        WorkflowStep(
+            'analyze', 'coordinator',
+            'Analyze results: investment grows to {calculate} given {research}',
+            depends_on=('research', 'calculate', 'strategies'),
+        ),
+    ],
+}
+
+
+def validate_workflow(steps: List[WorkflowStep]) -> None:
+    """Raise ValueError if ``steps`` has duplicate ids, unknown dependencies or a cycle."""
+    ids = [step.id for step in steps]
+    if len(ids) != len(set(ids)):
+        raise ValueError(f"Duplicate step ids in workflow: {ids}")
+    deps = {step.id: step.depends_on for step in steps}
+    for step in steps:
+        unknown = [dep for dep in step.depends_on if dep not in deps]
+        if unknown:
+            raise ValueError(f"Step '{step.id}' depends on unknown steps: {unknown}")
+
+    visiting, done = set(), set()
+
+    def visit(step_id: str) -> None:
+        if step_id in done:
+            return
+        if step_id in visiting:
+            raise ValueError(f"Workflow has a dependency cycle through step '{step_id}'")
+        visiting.add(step_id)
+        for dep in deps[step_id]:
+            visit(dep)
+        visiting.discard(step_id)
+        done.add(step_id)
+
+    for step_id in ids:
+        visit(step_id)
+
+
+class DAGWorkflowManager:
+    """Executes workflows as dependency graphs on the event loop.
+
+    Every step starts as soon as the steps it depends on have finished, so
+    a workflow takes as long as its critical path, and is sent to the
+    agent it declares through ``pool``. Steps whose dependencies failed
+    are skipped. All steps of all running workflows share one global
+    concurrency limit.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        pool: Optional[AgentClientPool] = None,
+    ):
+        self._owned_client = None
+        if pool is None:
+            self._owned_client = create_http_client()
+            pool = AgentClientPool(self._owned_client, agents=ECOSYSTEM_AGENTS)
+        self.pool = pool
+        self.workflows: Dict[str, List[WorkflowStep]] = dict(DAG_WORKFLOWS)
+        self._limit = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def initialize(self):
+        """Resolve every agent's card up front so the first steps do not wait on it."""
+        await self.pool.refresh()
+
+    def add_workflow(self, name: str, steps: List[WorkflowStep]):
+        """Register a workflow after checking that it is a valid DAG with known agents."""
+        validate_workflow(steps)
+        unknown = sorted({step.agent for step in steps} - set(self.pool.agents))
+        if unknown:
+            raise ValueError(f"Workflow '{name}' uses unknown agents: {unknown}")
+        self.workflows[name] = steps
+
+    def list_workflows(self) -> str:
+        """Describe the available workflows and their dependencies."""
+        lines = ["🔄 **Available DAG Workflows:**"]
+        for name, steps in self.workflows.items():
+            lines.append(f"- {name} ({len(steps)} steps)")
+            for step in steps:
+                after = f" after {', '.join(step.depends_on)}" if step.depends_on else ""
+                lines.append(f"    • {step.id} → {step.agent}{after}")
+        return "\n".join(lines) + "\n"
+
+    async def _run_step(self, step: WorkflowStep, outputs: Dict[str, str]) -> dict:
+        query = step.query
+        for dep in step.depends_on:
+            query = query.replace(f"{{{dep}}}", outputs[dep][:MAX_CONTEXT_CHARS])
+
+        async with self._limit:
+            started = time.perf_counter()
+            try:
+                response = await self.pool.ask(step.agent, query)
+                success = not response.startswith("❌")
+            except Exception as e:
+                response = f"❌ Step failed: {e}"
+                success = False
+        return {
+            'step': step.id,
+            'agent': step.agent,
+            'query': query,
+            'response': response,
+            'success': success,
+            'skipped': False,
+            'elapsed': time.perf_counter() - started,
+        }
+
+    @staticmethod
+    def _skipped_step(step: WorkflowStep, failed: List[str]) -> dict:
+        return {
+            'step': step.id,
+            'agent': step.agent,
+            'query': step.query,
+            'response': f"⏭️ Skipped: depends on failed step(s) {', '.join(failed)}",
+            'success': False,
+            'skipped': True,
+            'elapsed': 0.0,
+        }
+
+    async def execute_workflow(self, workflow_name: str) -> List[dict]:
+        """Execute a workflow, running independent steps concurrently."""
+        if workflow_name not in self.workflows:
+            raise ValueError(f"Unknown workflow: {workflow_name}")
+        steps = self.workflows[workflow_name]
+        validate_workflow(steps)
+
+        print(f"🔄 Executing DAG Workflow: {workflow_name}")
+        started = time.perf_counter()
+        outputs: Dict[str, str] = {}
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def run(step: WorkflowStep) -> dict:
+            dependencies = await asyncio.gather(*(tasks[dep] for dep in step.depends_on))
+            failed = [result['step'] for result in dependencies if not result['success']]
+            if failed:
+                result = self._skipped_step(step, failed)
+            else:
+                result = await self._run_step(step, outputs)
+            outputs[step.id] = result['response']
+            status = "⏭️" if result['skipped'] else "✅" if result['success'] else "❌"
+            print(f"{status} {step.id} ({step.agent}, {result['elapsed']:.2f}s): {result['response'][:100]}")
+            return result
+
+        for step in steps:
+            tasks[step.id] = asyncio.create_task(run(step))
+        try:
+            results = await asyncio.gather(*tasks.values())
+        finally:
+            for task in tasks.values():
+                task.cancel()
+
+        wall_clock = time.perf_counter() - started
+        step_time = sum(result['elapsed'] for result in results)
+        successes = sum(1 for result in results if result['success'])
+        skipped = sum(1 for result in results if result['skipped'])
+        print(f"🎉 Workflow '{workflow_name}' completed in {wall_clock:.2f}s "
+              f"(sequential step time {step_time:.2f}s)")
+        print(f"📈 Success rate: {successes}/{len(results)}" + (f", {skipped} skipped" if skipped else ""))
+        return list(results)
+
+    async def run_all_workflows(self, workflow_names: Optional[List[str]] = None) -> Dict[str, List[dict]]:
+        """Run several workflows in parallel under the shared concurrency limit."""
+        names = workflow_names or list(self.workflows)
+        results = await asyncio.gather(
+            *(self.execute_workflow(name) for name in names),
+            return_exceptions=True,
+        )
+        all_results = {}
+        for name, result in zip(names, results):
+            if isinstance(result, Exception):
+                print(f"❌ Workflow '{name}' failed: {result}")
+                all_results[name] = []
+            else:
+                all_results[name] = result
+        return all_results
+
+    async def cleanup(self):
+        """Release the agent pool if this manager created it."""
+        if self._owned_client is not None:
+            await self.pool.close()
+            await self._owned_client.aclose()
@@ -0,0 +1,2 @@
+# The a2a_* modules live at the repository root; this file makes plain
+# `pytest` put the root on sys.path so tests/ can import them.
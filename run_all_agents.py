@@ -1,62 +1,415 @@
 """Script to start all A2A agents in separate processes for easy testing."""
 
+import logging
 import subprocess
 import sys
+import threading
 import time
 import signal
 import os
-from typing import List
+from collections import deque
+from dataclasses import dataclass
+from logging.handlers import RotatingFileHandler
+from typing import Dict, List, Optional
+
+import click
+import httpx
+
+from a2a_balancer import DEFAULT_REPLICAS_FILE, write_replicas_file
+from a2a_proxy import ProxyServer, ReplicaPool, ReverseProxy
+from a2a_serving import STATE_DIR, shared_task_store_spec
+
+
+LOG_DIR = os.path.join(STATE_DIR, 'logs')
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 3
+STARTUP_TIMEOUT = 30.0
+READINESS_POLL_INTERVAL = 0.1
+READINESS_PROBE_TIMEOUT = 1.0
+
+# Supervisor mode: replicas of the agent at index i listen on
+# REPLICA_PORT_BASE + i * REPLICA_PORT_STRIDE + replica index.
+REPLICA_PORT_BASE = 20000
+REPLICA_PORT_STRIDE = 100
+SUPERVISE_INTERVAL = 0.5
+RESTART_BACKOFF_INITIAL = 1.0
+RESTART_BACKOFF_MAX = 30.0
+# A replica that stays up this long gets its restart backoff reset.
+RESTART_STABLE_AFTER = 60.0
+# Autoscaling: how often each agent is evaluated, and how long a drained
+# replica may take to finish its in-flight requests before it is stopped.
+AUTOSCALE_INTERVAL = 5.0
+DRAIN_TIMEOUT = 30.0
+
+
+@dataclass
+class ScalingPolicy:
+    """When to add or drain replicas of an agent.
+
+    Load is the average number of in-flight requests per replica over the
+    last ``window`` seconds; latency is the p95 time to response of the
+    requests answered in that window.
+    """
+
+    min_replicas: int = 1
+    max_replicas: int = 4
+    scale_up_in_flight: float = 4.0
+    scale_up_p95: float = 1.0
+    scale_down_in_flight: float = 0.5
+    window: float = 15.0
+    scale_up_cooldown: float = 10.0
+    scale_down_cooldown: float = 30.0
+
+    def decide(self, replicas: int, in_flight: float, latency: Dict[str, float]) -> int:
+        """+1 to add a replica, -1 to drain one, 0 to keep the current count."""
+        overloaded = in_flight > self.scale_up_in_flight or latency['p95'] > self.scale_up_p95
+        if overloaded and replicas < self.max_replicas:
+            return 1
+        idle = in_flight < self.scale_down_in_flight and latency['p95'] <= self.scale_up_p95 / 2
+        if idle and replicas > self.min_replicas:
+            return -1
+        return 0
+
+
+class ReplicaProcess:
+    """One supervised process serving a replica of an agent."""
+
+    def __init__(self, agent: dict, index: int, port: int):
+        self.agent = agent
+        self.index = index
+        self.port = port
+        self.process: Optional[subprocess.Popen] = None
+        self.started = 0.0
+        self.ready = False
+        self.restarts = 0
+        self.backoff = RESTART_BACKOFF_INITIAL
+        self.restart_at = 0.0
+
+    @property
+    def url(self) -> str:
+        return f"http://localhost:{self.port}/"
+
+    @property
+    def log_name(self) -> str:
+        return f"{os.path.splitext(self.agent['script'])[0]}-{self.index}"
 
 
 class AgentManager:
     """Manages multiple A2A agent processes."""
     
-    def __init__(self):
+    def __init__(
+        self,
+        log_dir: str = LOG_DIR,
+        startup_timeout: float = STARTUP_TIMEOUT,
+        policy: Optional[ScalingPolicy] = None,
+    ):
         self.processes: List[subprocess.Popen] = []
+        self.policy = policy
+        self.drain_threads: List[threading.Thread] = []
+        self.log_dir = log_dir
+        self.startup_timeout = startup_timeout
+        self.proxies: List[ProxyServer] = []
+        self.groups: List[dict] = []
+        self.replicas_file = DEFAULT_REPLICAS_FILE
         self.agents = [
-            {"name": "A2A Registry", "script": "a2a_registry_server.py", "port": 8000},
-            {"name": "Echo Agent", "script": "a2a_server.py", "port": 9999},
-            {"name": "Web Search Agent", "script": "a2a_websearch_server.py", "port": 8001}, 
-            {"name": "Calculator Agent", "script": "a2a_calculator_server.py", "port": 8002},
-            {"name": "Coordinator Agent", "script": "a2a_coordinator_server.py", "port": 8003},
+            # Registrations and the change feed live in the registry's memory,
+            # so it always runs as a single process.
+            {"id": "registry", "name": "A2A Registry", "script": "a2a_registry_server.py", "port": 8000,
+             "singleton": True},
+            {"id": "echo", "name": "Echo Agent", "script": "a2a_server.py", "port": 9999},
+            {"id": "websearch", "name": "Web Search Agent", "script": "a2a_websearch_server.py", "port": 8001},
+            {"id": "calculator", "name": "Calculator Agent", "script": "a2a_calculator_server.py", "port": 8002},
+            {"id": "coordinator", "name": "Coordinator Agent", "script": "a2a_coordinator_server.py", "port": 8003},
         ]
     
+    def _log_path(self, log_name):
+        return os.path.join(self.log_dir, f"{log_name}.log")
+
+    def _drain_output(self, log_name, process):
+        """Copy a child's output into its rotating log file so the pipe never fills."""
+        log = logging.getLogger(f"run_all_agents.{log_name}.{process.pid}")
+        log.propagate = False
+        log.setLevel(logging.INFO)
+        handler = RotatingFileHandler(
+            self._log_path(log_name),
+            maxBytes=LOG_MAX_BYTES,
+            backupCount=LOG_BACKUP_COUNT,
+        )
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        log.addHandler(handler)
+        try:
+            for line in process.stdout:
+                log.info(line.rstrip('\n'))
+        finally:
+            log.removeHandler(handler)
+            handler.close()
+
+    def _launch(self, script, port, log_name, extra_args=()):
+        """Start an agent process whose output is drained into a log file."""
+        process = subprocess.Popen([
+            sys.executable, script,
+            '--host', 'localhost',
+            '--port', str(port),
+            *extra_args,
+        ], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1)
+
+        self.processes.append(process)
+        drain = threading.Thread(target=self._drain_output, args=(log_name, process), daemon=True)
+        drain.start()
+        self.drain_threads.append(drain)
+        return process
+
+    def _probe(self, client, port):
+        """True once the agent on ``port`` serves its agent card."""
+        try:
+            response = client.get(f"http://localhost:{port}/.well-known/agent-card.json")
+        except httpx.HTTPError:
+            return False
+        return response.status_code == 200
+
+    def _wait_until_ready(self, launched):
+        """Poll every agent card until it answers; returns name -> seconds to ready."""
+        ready = {}
+        pending = list(launched)
+        deadline = time.monotonic() + self.startup_timeout
+        with httpx.Client(timeout=READINESS_PROBE_TIMEOUT) as client:
+            while pending and time.monotonic() < deadline:
+                for agent, process, started in list(pending):
+                    if process.poll() is not None:
+                        log_name = os.path.splitext(agent['script'])[0]
+                        print(f"❌ {agent['name']} exited with code {process.returncode} "
+                              f"(see {self._log_path(log_name)})")
+                        pending.remove((agent, process, started))
+                        continue
+                    if self._probe(client, agent['port']):
+                        ready[agent['name']] = time.monotonic() - started
+                        print(f"✅ {agent['name']} ready in {ready[agent['name']]:.2f}s (PID: {process.pid})")
+                        pending.remove((agent, process, started))
+                if pending:
+                    time.sleep(READINESS_POLL_INTERVAL)
+
+        for agent, _, _ in pending:
+            print(f"⚠️  {agent['name']} not ready after {self.startup_timeout:.0f}s")
+        return ready
+
     def start_agents(self):
-        """Start all agent servers."""
+        """Start all agent servers in parallel and wait until each one answers."""
         print("🚀 Starting A2A Multi-Agent System...")
         print("=" * 50)
-        
+        os.makedirs(self.log_dir, exist_ok=True)
+        start = time.monotonic()
+
+        launched = []
         for agent in self.agents:
             try:
                 print(f"Starting {agent['name']} on port {agent['port']}...")
-                
-                # Start agent process
-                process = subprocess.Popen([
-                    sys.executable, agent['script'],
-                    '--host', 'localhost',
-                    '--port', str(agent['port'])
-                ], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-                
-                self.processes.append(process)
-                print(f"✅ {agent['name']} started (PID: {process.pid})")
-                
-                # Brief pause between starts
-                time.sleep(1)
-                
+                process = self._launch(
+                    agent['script'], agent['port'], os.path.splitext(agent['script'])[0]
+                )
+                launched.append((agent, process, time.monotonic()))
+
             except Exception as e:
                 print(f"❌ Failed to start {agent['name']}: {e}")
-        
-        print("\n🎉 All agents started! Waiting for them to initialize...")
-        time.sleep(3)  # Give agents time to start up
-        
+
+        print("\n⏳ Waiting for agents to become ready...")
+        ready = self._wait_until_ready(launched)
+        print(f"\n🎉 {len(ready)}/{len(self.agents)} agents ready in {time.monotonic() - start:.2f}s")
+
+        self._print_summary()
+
+    def _print_summary(self):
         print("\n📋 **Agent Summary:**")
+        replicas = {group['agent']['id']: group['replicas'] for group in self.groups}
         for agent in self.agents:
             print(f"  • {agent['name']}: http://localhost:{agent['port']}")
-        
+            if agent['id'] in replicas:
+                ports = ', '.join(str(replica.port) for replica in replicas[agent['id']])
+                print(f"    ↳ {len(replicas[agent['id']])} replica(s) on ports {ports}")
+
         print(f"\n🔗 **Agent Cards:**")
         for agent in self.agents:
             print(f"  • {agent['name']}: http://localhost:{agent['port']}/.well-known/agent-card.json")
-    
+
+        print(f"\n📝 Agent logs: {self.log_dir}/")
+
+    def start_supervised(self, replicas=1):
+        """Start ``replicas`` supervised processes per agent behind a local proxy.
+
+        Each agent's usual port is served by a reverse proxy spreading
+        requests over its replicas, which listen on consecutive ports from
+        ``REPLICA_PORT_BASE`` and advertise the proxy URL in their cards.
+        """
+        # Replicas share task state whenever there may ever be more than one
+        max_replicas = replicas
+        if self.policy:
+            replicas = min(max(replicas, self.policy.min_replicas), self.policy.max_replicas)
+            max_replicas = self.policy.max_replicas
+            print(f"🚀 Starting A2A Multi-Agent System ({replicas} replica(s) per agent, "
+                  f"autoscaling {self.policy.min_replicas}-{self.policy.max_replicas})...")
+        else:
+            print(f"🚀 Starting A2A Multi-Agent System ({replicas} replica(s) per agent, supervised)...")
+        print("=" * 50)
+        os.makedirs(self.log_dir, exist_ok=True)
+        start = time.monotonic()
+
+        for agent_index, agent in enumerate(self.agents):
+            agent_replicas, agent_max_replicas = replicas, max_replicas
+            if agent.get('singleton'):
+                if max_replicas > 1:
+                    print(f"⚠️  {agent['name']} keeps its state in memory; running a single replica")
+                agent_replicas = agent_max_replicas = 1
+            pool = ReplicaPool(agent['name'])
+            proxy = ProxyServer(ReverseProxy(pool), 'localhost', agent['port'])
+            proxy.start()
+            self.proxies.append(proxy)
+            base_port = REPLICA_PORT_BASE + agent_index * REPLICA_PORT_STRIDE
+            self.groups.append({
+                'agent': agent,
+                'pool': pool,
+                'base_port': base_port,
+                'task_store': shared_task_store_spec('memory', agent['id'], agent_max_replicas),
+                'replicas': [ReplicaProcess(agent, i, base_port + i) for i in range(agent_replicas)],
+                'draining': [],
+                'in_flight_samples': deque(),
+                'last_scaled': time.monotonic(),
+                'last_evaluated': 0.0,
+            })
+            print(f"Starting {agent['name']} on port {agent['port']} "
+                  f"(replicas on {base_port}-{base_port + agent_replicas - 1})...")
+
+        print("\n⏳ Waiting for replicas to become ready...")
+        deadline = time.monotonic() + self.startup_timeout
+        with httpx.Client(timeout=READINESS_PROBE_TIMEOUT) as client:
+            while time.monotonic() < deadline and not self._all_ready():
+                self.supervise_once(client)
+                time.sleep(READINESS_POLL_INTERVAL)
+
+        ready = sum(replica.ready for group in self.groups for replica in group['replicas'])
+        total = sum(len(group['replicas']) for group in self.groups)
+        print(f"\n🎉 {ready}/{total} replicas ready in {time.monotonic() - start:.2f}s")
+        self._print_summary()
+
+    def _publish_replicas(self):
+        """Write the ready replicas of each agent for replica-aware clients."""
+        write_replicas_file(self.replicas_file, {
+            f"http://localhost:{group['agent']['port']}/": [
+                replica.url for replica in group['replicas'] if replica.ready
+            ]
+            for group in self.groups
+        })
+
+    def _all_ready(self):
+        return all(replica.ready for group in self.groups for replica in group['replicas'])
+
+    def _spawn(self, group, replica):
+        agent = group['agent']
+        replica.process = self._launch(agent['script'], replica.port, replica.log_name, [
+            '--public-url', f"http://localhost:{agent['port']}/",
+            '--task-store', group['task_store'],
+        ])
+        replica.started = time.monotonic()
+        replica.ready = False
+
+    def supervise_once(self, client):
+        """Restart exited replicas with backoff and admit ready ones to their proxy."""
+        now = time.monotonic()
+        changed = False
+        for group in self.groups:
+            pool = group['pool']
+            for replica in group['replicas']:
+                process = replica.process
+                name = f"{replica.agent['name']} replica {replica.index} (port {replica.port})"
+                if process is None:
+                    if now >= replica.restart_at:
+                        self._spawn(group, replica)
+                elif process.poll() is not None:
+                    pool.remove(replica.url)
+                    changed = True
+                    self.processes.remove(process)
+                    replica.process = None
+                    replica.ready = False
+                    replica.restarts += 1
+                    replica.restart_at = now + replica.backoff
+                    print(f"💥 {name} exited with code {process.returncode}; "
+                          f"restarting in {replica.backoff:.0f}s (see {self._log_path(replica.log_name)})")
+                    replica.backoff = min(replica.backoff * 2, RESTART_BACKOFF_MAX)
+                elif not replica.ready:
+                    if self._probe(client, replica.port):
+                        replica.ready = True
+                        pool.add(replica.url)
+                        changed = True
+                        print(f"✅ {name} ready in {now - replica.started:.2f}s (PID: {process.pid})")
+                elif now - replica.started > RESTART_STABLE_AFTER:
+                    replica.backoff = RESTART_BACKOFF_INITIAL
+            self._finish_draining(group, now)
+        if changed:
+            self._publish_replicas()
+
+    def autoscale_once(self):
+        """Compare each agent's load with the scaling policy and add or drain a replica."""
+        now = time.monotonic()
+        policy = self.policy
+        for group in self.groups:
+            if group['agent'].get('singleton'):
+                continue
+            pool = group['pool']
+            samples = group['in_flight_samples']
+            samples.append((now, pool.in_flight))
+            while samples and samples[0][0] < now - policy.window:
+                samples.popleft()
+
+            ready = [replica for replica in group['replicas'] if replica.ready]
+            if not ready or now - group['last_evaluated'] < AUTOSCALE_INTERVAL:
+                continue
+            group['last_evaluated'] = now
+
+            in_flight = sum(count for _, count in samples) / len(samples) / len(ready)
+            latency = pool.latency_percentiles(policy.window)
+            decision = policy.decide(len(group['replicas']), in_flight, latency)
+            starting = len(ready) < len(group['replicas'])
+            reason = f"in-flight/replica {in_flight:.1f}, p95 {latency['p95'] * 1000:.0f}ms"
+
+            if decision > 0 and not starting and now - group['last_scaled'] >= policy.scale_up_cooldown:
+                self._scale_up(group)
+                group['last_scaled'] = now
+                print(f"📈 Scaling {group['agent']['name']} up to {len(group['replicas'])} replicas ({reason})")
+            elif decision < 0 and now - group['last_scaled'] >= policy.scale_down_cooldown:
+                self._scale_down(group, now)
+                self._publish_replicas()
+                group['last_scaled'] = now
+                print(f"📉 Scaling {group['agent']['name']} down to {len(group['replicas'])} replicas ({reason})")
+
+    def _scale_up(self, group):
+        used = {replica.index for replica in group['replicas']}
+        used.update(item['replica'].index for item in group['draining'])
+        index = next(i for i in range(REPLICA_PORT_STRIDE) if i not in used)
+        group['replicas'].append(ReplicaProcess(group['agent'], index, group['base_port'] + index))
+
+    def _scale_down(self, group, now):
+        """Stop routing to the newest replica and stop it once its requests finish."""
+        replica = max(group['replicas'], key=lambda replica: replica.index)
+        group['replicas'].remove(replica)
+        group['draining'].append({
+            'replica': replica,
+            'upstream': group['pool'].remove(replica.url),
+            'deadline': now + DRAIN_TIMEOUT,
+        })
+
+    def _finish_draining(self, group, now):
+        for item in list(group['draining']):
+            process = item['replica'].process
+            if process is None or process.poll() is not None:
+                if process is not None:
+                    self.processes.remove(process)
+                group['draining'].remove(item)
+                continue
+            upstream = item['upstream']
+            if upstream is None or upstream.in_flight == 0 or now >= item['deadline']:
+                if now >= item['deadline'] + 5:
+                    process.kill()
+                else:
+                    process.terminate()
+
     def stop_agents(self):
         """Stop all agent processes."""
         print("\n🛑 Stopping all agents...")
@@ -72,13 +425,27 @@ class AgentManager:
             except Exception as e:
                 print(f"❌ Error stopping agent: {e}")
         
+        for drain in self.drain_threads:
+            drain.join(timeout=1)
+
+        for proxy in self.proxies:
+            proxy.stop()
+        if self.groups and os.path.exists(self.replicas_file):
+            os.remove(self.replicas_file)
+
         self.processes.clear()
+        self.drain_threads.clear()
+        self.proxies.clear()
+        self.groups.clear()
         print("🏁 All agents stopped.")
     
-    def run_interactive(self):
+    def run_interactive(self, supervise=False, replicas=1):
         """Run agents and wait for user input to stop."""
         try:
-            self.start_agents()
+            if supervise:
+                self.start_supervised(replicas)
+            else:
+                self.start_agents()
             
             print("\n" + "=" * 50)
             print("🎮 **Ready for Testing!**")
@@ -98,9 +465,16 @@ class AgentManager:
                 print(f"   • {agent['name']}: http://localhost:{agent['port']}/.well-known/agent-card.json")
             print("=" * 50)
             
-            # Wait for interrupt
-            while True:
-                time.sleep(1)
+            # Wait for interrupt, restarting crashed replicas when supervising
+            with httpx.Client(timeout=READINESS_PROBE_TIMEOUT) as client:
+                while True:
+                    if supervise:
+                        self.supervise_once(client)
+                        if self.policy:
+                            self.autoscale_once()
+                        time.sleep(SUPERVISE_INTERVAL)
+                    else:
+                        time.sleep(1)
                 
         except KeyboardInterrupt:
             print("\n🔄 Received stop signal...")
@@ -108,9 +482,41 @@ class AgentManager:
             self.stop_agents()
 
 
-def main():
+@click.command()
+@click.option('--supervise', 'supervise', is_flag=True,
+              help='Restart crashed agents with backoff; agents are served through a local proxy.')
+@click.option('--replicas', 'replicas', default=1,
+              help='Processes per agent behind the proxy (implies --supervise).')
+@click.option('--autoscale', 'autoscale', is_flag=True,
+              help='Add and drain replicas from in-flight load and latency (implies --supervise).')
+@click.option('--min-replicas', 'min_replicas', default=ScalingPolicy.min_replicas)
+@click.option('--max-replicas', 'max_replicas', default=ScalingPolicy.max_replicas)
+@click.option('--scale-up-in-flight', 'scale_up_in_flight', default=ScalingPolicy.scale_up_in_flight,
+              help='Average in-flight requests per replica above which a replica is added.')
+@click.option('--scale-up-p95-ms', 'scale_up_p95_ms', default=ScalingPolicy.scale_up_p95 * 1000,
+              help='p95 latency above which a replica is added.')
+@click.option('--scale-down-in-flight', 'scale_down_in_flight', default=ScalingPolicy.scale_down_in_flight,
+              help='Average in-flight requests per replica below which a replica is drained.')
+def main(supervise, replicas, autoscale, min_replicas, max_replicas,
+         scale_up_in_flight, scale_up_p95_ms, scale_down_in_flight):
     """Main function."""
-    manager = AgentManager()
+    if not 1 <= replicas <= REPLICA_PORT_STRIDE:
+        raise click.BadParameter(f'must be between 1 and {REPLICA_PORT_STRIDE}', param_hint='--replicas')
+    policy = None
+    if autoscale:
+        if not 1 <= min_replicas <= max_replicas <= REPLICA_PORT_STRIDE:
+            raise click.BadParameter(
+                f'need 1 <= --min-replicas <= --max-replicas <= {REPLICA_PORT_STRIDE}',
+                param_hint='--max-replicas',
+            )
+        policy = ScalingPolicy(
+            min_replicas=min_replicas,
+            max_replicas=max_replicas,
+            scale_up_in_flight=scale_up_in_flight,
+            scale_up_p95=scale_up_p95_ms / 1000,
+            scale_down_in_flight=scale_down_in_flight,
+        )
+    manager = AgentManager(policy=policy)
     
     # Handle signals for clean shutdown
     def signal_handler(signum, frame):
@@ -122,7 +528,7 @@ def main():
     signal.signal(signal.SIGTERM, signal_handler)
     
     # Run the manager
-    manager.run_interactive()
+    manager.run_interactive(supervise=supervise or autoscale or replicas > 1, replicas=replicas)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,80 @@
+import asyncio
+
+import httpx
+
+from a2a.server.tasks import InMemoryPushNotificationConfigStore
+from a2a.types import PushNotificationConfig, Task, TaskState, TaskStatus
+
+from a2a_push import QueuedPushNotificationSender
+
+
+WEBHOOK = 'http://webhook.test/notify'
+
+
+def make_task(state: TaskState) -> Task:
+    return Task(id='t1', context_id='ctx', status=TaskStatus(state=state))
+
+
+async def make_sender(handler) -> QueuedPushNotificationSender:
+    config_store = InMemoryPushNotificationConfigStore()
+    await config_store.set_info('t1', PushNotificationConfig(id='hook', url=WEBHOOK))
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return QueuedPushNotificationSender(client, config_store, workers=4)
+
+
+def test_retry_does_not_overwrite_newer_state():
+    """A 503 for 'working' must not be retried after 'completed' was delivered."""
+    accepted = []
+    first_attempt = asyncio.Event()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        state = Task.model_validate_json(request.content).status.state.value
+        if not first_attempt.is_set():
+            first_attempt.set()
+            return httpx.Response(503)
+        accepted.append(state)
+        return httpx.Response(204)
+
+    async def scenario():
+        sender = await make_sender(handler)
+        await sender.send_notification(make_task(TaskState.working))
+        await first_attempt.wait()
+        await sender.send_notification(make_task(TaskState.completed))
+        await sender.flush(timeout=5)
+        await sender.close()
+        return sender
+
+    sender = asyncio.run(scenario())
+    assert accepted == ['completed']
+    assert sender.stats()['retried'] == 1
+
+
+def test_one_delivery_in_flight_per_task():
+    """An update sent while the previous one is in flight waits for it."""
+    accepted = []
+    in_flight = 0
+    max_in_flight = 0
+    started = asyncio.Event()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        started.set()
+        await asyncio.sleep(0.05)
+        accepted.append(Task.model_validate_json(request.content).status.state.value)
+        in_flight -= 1
+        return httpx.Response(204)
+
+    async def scenario():
+        sender = await make_sender(handler)
+        await sender.send_notification(make_task(TaskState.working))
+        await started.wait()
+        await sender.send_notification(make_task(TaskState.input_required))
+        await sender.send_notification(make_task(TaskState.completed))
+        await sender.flush(timeout=5)
+        await sender.close()
+
+    asyncio.run(scenario())
+    assert accepted == ['working', 'completed']
+    assert max_in_flight == 1
@@ -0,0 +1,69 @@
+import asyncio
+
+from a2a.types import Message, Part, Role, Task, TaskState, TaskStatus, TextPart
+
+from a2a_task_stores import BoundedInMemoryTaskStore
+
+
+def make_task(task_id: str, state: TaskState = TaskState.working, messages: int = 0) -> Task:
+    history = [
+        Message(message_id=f'{task_id}-{i}', role=Role.user, parts=[Part(root=TextPart(text=f'message {i}'))])
+        for i in range(messages)
+    ]
+    return Task(id=task_id, context_id='ctx', status=TaskStatus(state=state), history=history or None)
+
+
+def test_history_limit_zero_drops_all_history():
+    store = BoundedInMemoryTaskStore(history_limit=0)
+    asyncio.run(store.save(make_task('t1', messages=3)))
+    task = asyncio.run(store.get('t1'))
+    assert not task.history
+
+
+def test_history_limit_keeps_last_messages():
+    store = BoundedInMemoryTaskStore(history_limit=2)
+    asyncio.run(store.save(make_task('t1', messages=5)))
+    task = asyncio.run(store.get('t1'))
+    assert [m.message_id for m in task.history] == ['t1-3', 't1-4']
+
+
+def test_running_tasks_are_never_evicted():
+    store = BoundedInMemoryTaskStore(max_tasks=2)
+
+    async def scenario():
+        for task_id in ('a', 'b', 'c'):
+            await store.save(make_task(task_id))
+        return [await store.get(task_id) for task_id in ('a', 'b', 'c')]
+
+    assert all(task is not None for task in asyncio.run(scenario()))
+    assert store.evictions == 0
+    assert store.stats()['over_budget']
+
+
+def test_terminal_tasks_are_evicted_first():
+    store = BoundedInMemoryTaskStore(max_tasks=2)
+
+    async def scenario():
+        await store.save(make_task('done', TaskState.completed))
+        await store.save(make_task('a'))
+        await store.save(make_task('b'))
+        return [await store.get(task_id) for task_id in ('done', 'a', 'b')]
+
+    done, a, b = asyncio.run(scenario())
+    assert done is None and a is not None and b is not None
+    assert store.evictions == 1
+    assert not store.stats()['over_budget']
+
+
+def test_recently_read_terminal_tasks_are_evicted_last():
+    store = BoundedInMemoryTaskStore(max_tasks=2)
+
+    async def scenario():
+        await store.save(make_task('old', TaskState.completed))
+        await store.save(make_task('new', TaskState.completed))
+        await store.get('old')
+        await store.save(make_task('running'))
+        return [await store.get(task_id) for task_id in ('old', 'new', 'running')]
+
+    old, new, running = asyncio.run(scenario())
+    assert old is not None and new is None and running is not None